@@ -0,0 +1,140 @@
+"""Benchmark del entrenamiento completo (KMeans) contra el modo por bloques (MiniBatchKMeans).
+
+Genera un corpus sintético combinando textos de entrenamiento y entrena cada
+modo en un proceso aparte para medir tiempo, memoria máxima (RSS), inercia y
+silhouette sobre una muestra. Nada se guarda en models/.
+
+Uso: python benchmarks/bench_entrenamiento.py [--filas 100000] [--clusters 30] [--vectorizador hashing]
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ejecutar desde la raíz del proyecto
+project_root = Path(__file__).parent.parent
+os.chdir(project_root)
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+SILHOUETTE_SAMPLE = 5000
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_corpus(path, rows, seed=42):
+    """Corpus sintético: cada fila une 1 a 3 textos reales al azar"""
+    with open('data/training/textos_sin_etiquetar.csv', encoding='utf-8') as f:
+        base = [row['texto'] for row in csv.DictReader(f)]
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['texto'])
+        for _ in range(rows):
+            writer.writerow([' '.join(rng.sample(base, rng.randint(1, 3)))])
+
+
+def run_full(data_path, n_clusters, vectorizer_type):
+    """El entrenador actual: todo el corpus en memoria y KMeans sobre la matriz completa"""
+    from src.ml.evaluation import sampled_silhouette
+    from src.ml.unsupervised_trainer import UnsupervisedTrainer
+
+    trainer = UnsupervisedTrainer(n_clusters=n_clusters, mode='completo', data_path=data_path,
+                                  vectorizer_type=vectorizer_type)
+    start = time.perf_counter()
+    X = trainer._vectorize_corpus()
+    trainer.kmeans.fit(X)
+    clusters = trainer.kmeans.predict(X)
+    elapsed = time.perf_counter() - start
+
+    # Silhouette sobre una muestra estratificada: la versión exacta es O(n²)
+    silhouette, _ = sampled_silhouette(X, clusters, SILHOUETTE_SAMPLE)
+    return {
+        'tiempo_s': elapsed,
+        'inercia': float(trainer.kmeans.inertia_),
+        'silhouette': float(silhouette),
+        'n_samples': X.shape[0]
+    }
+
+
+def run_minibatch(data_path, n_clusters, vectorizer_type):
+    from src.ml.unsupervised_trainer import UnsupervisedTrainer
+
+    trainer = UnsupervisedTrainer(n_clusters=n_clusters, mode='minibatch', data_path=data_path,
+                                  vectorizer_type=vectorizer_type)
+    trainer.minibatch_params['muestra_evaluacion'] = SILHOUETTE_SAMPLE
+    trainer.evaluator.sample_size = SILHOUETTE_SAMPLE
+    start = time.perf_counter()
+    _, evaluation = trainer.fit()
+    elapsed = time.perf_counter() - start
+    return {
+        'tiempo_s': elapsed,
+        'inercia': evaluation['inertia'],
+        'silhouette': evaluation['silhouette_score'],
+        'n_samples': evaluation['n_samples'],
+        'epocas': evaluation.get('epocas')
+    }
+
+
+def run_child(mode, data_path, n_clusters, vectorizer_type):
+    import logging
+    logging.disable(logging.INFO)
+    run = run_full if mode == 'completo' else run_minibatch
+    result = run(data_path, n_clusters, vectorizer_type)
+    result['rss_max_mb'] = peak_rss_mb()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de entrenamiento completo vs por bloques")
+    parser.add_argument('--filas', type=int, default=100000)
+    parser.add_argument('--clusters', type=int, default=30)
+    parser.add_argument('--modos', nargs='+', default=['completo', 'minibatch'], choices=['completo', 'minibatch'])
+    parser.add_argument('--vectorizador', choices=['tfidf', 'hashing'], default='tfidf')
+    parser.add_argument('--ejecutar-modo', choices=['completo', 'minibatch'], help=argparse.SUPPRESS)
+    parser.add_argument('--datos', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ejecutar_modo:
+        run_child(args.ejecutar_modo, args.datos, args.clusters, args.vectorizador)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, 'corpus.csv')
+        build_corpus(data_path, args.filas)
+        size_mb = os.path.getsize(data_path) / (1024 * 1024)
+
+        print("=" * 70)
+        print(f"Corpus sintético: {args.filas} filas ({size_mb:.1f} MB) | Clusters: {args.clusters} "
+              f"| Vectorizador: {args.vectorizador}")
+        print(f"{'Modo':<12}{'Tiempo (s)':>12}{'RSS máx (MB)':>15}{'Inercia':>14}{'Silhouette':>12}")
+        for mode in args.modos:
+            # Un proceso por modo para que la memoria máxima no se mezcle
+            output = subprocess.run(
+                [sys.executable, __file__, '--ejecutar-modo', mode, '--datos', data_path,
+                 '--clusters', str(args.clusters), '--vectorizador', args.vectorizador],
+                capture_output=True, text=True, check=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rss = f"{result['rss_max_mb']:.1f}" if result['rss_max_mb'] is not None else 'n/d'
+            print(f"{mode:<12}{result['tiempo_s']:>12.2f}{rss:>15}{result['inercia']:>14.1f}{result['silhouette']:>12.4f}")
+        print(f"(silhouette sobre una muestra estratificada de {SILHOUETTE_SAMPLE} filas)")
+        print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
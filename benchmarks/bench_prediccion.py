@@ -0,0 +1,117 @@
+"""Microbenchmark de la predicción por mensaje.
+
+Compara el camino anterior (vector denso + model.predict + model.transform
+sobre el KMeans de scikit-learn del pickle) con el cálculo fusionado de
+distancias de EmotionPredictor. El KMeans se carga aparte porque el predictor
+usa por defecto el artefacto compacto y su modelo no es el de scikit-learn.
+
+Uso: python benchmarks/bench_prediccion.py [--repeticiones 5]
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ejecutar desde la raíz del proyecto
+project_root = Path(__file__).parent.parent
+os.chdir(project_root)
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.chat.predictor import EmotionPredictor
+from src.ml.model_loader import ModelLoader
+
+
+def load_messages(limit=None):
+    with open('data/training/textos_sin_etiquetar.csv', encoding='utf-8') as f:
+        messages = [row['texto'] for row in csv.DictReader(f)]
+    return messages[:limit] if limit else messages
+
+
+def load_legacy_model():
+    """KMeans de scikit-learn de la versión actual (modelo_entrenado.pkl)"""
+    loader = ModelLoader()
+    model_path = os.path.join(loader.resolve_model_dir(), 'modelo_entrenado.pkl')
+    return loader.load_trained_model(model_path)['kmeans']
+
+
+def legacy_scoring(predictor, legacy_model, text_vector):
+    """Camino anterior: densificar y calcular distancias dos veces con scikit-learn"""
+    dense = text_vector.toarray()
+    cluster_id = legacy_model.predict(dense)[0]
+    distances = legacy_model.transform(dense)[0]
+    return cluster_id, predictor._confidence_from_distances(distances, cluster_id)
+
+
+def dense_scoring(predictor, text_vector):
+    """Distancias densas directas sobre los centroides ya cargados"""
+    differences = predictor.centers - text_vector.toarray()[0]
+    distances = np.sqrt(np.einsum('ij,ij->i', differences, differences))
+    cluster_id = distances.argmin()
+    return cluster_id, predictor._confidence_from_distances(distances, cluster_id)
+
+
+def fused_scoring(predictor, text_vector):
+    """Camino de predict: una sola pasada sobre las entradas no nulas de la fila"""
+    distances = predictor._compute_row_distances(text_vector)
+    cluster_id = distances.argmin()
+    return cluster_id, predictor._confidence_from_distances(distances, cluster_id)
+
+
+def time_per_message(scoring_fn, predictor, vectors, repetitions):
+    best = float('inf')
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        for vector in vectors:
+            scoring_fn(predictor, vector)
+        best = min(best, time.perf_counter() - start)
+    return best / len(vectors) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark de predicción por mensaje")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--limite', type=int, default=None, help="Número máximo de mensajes")
+    args = parser.parse_args()
+
+    predictor = EmotionPredictor()
+    legacy_model = load_legacy_model()
+    messages = load_messages(args.limite)
+    vectors = [predictor.vectorizer.transform([predictor.preprocessor.clean_text(m)]) for m in messages]
+
+    # Verificar que ambos caminos coinciden antes de medir
+    mismatches = 0
+    for vector in vectors:
+        legacy_cluster, legacy_conf = legacy_scoring(predictor, legacy_model, vector)
+        for scoring_fn in (dense_scoring, fused_scoring):
+            cluster, conf = scoring_fn(predictor, vector)
+            if legacy_cluster != cluster or abs(legacy_conf - conf) > 1e-9:
+                mismatches += 1
+
+    legacy_us = time_per_message(
+        lambda p, vector: legacy_scoring(p, legacy_model, vector), predictor, vectors, args.repeticiones)
+    dense_us = time_per_message(dense_scoring, predictor, vectors, args.repeticiones)
+    fused_us = time_per_message(fused_scoring, predictor, vectors, args.repeticiones)
+
+    start = time.perf_counter()
+    for message in messages:
+        predictor.predict(message)
+    predict_us = (time.perf_counter() - start) / len(messages) * 1e6
+
+    print("=" * 50)
+    print(f"Mensajes: {len(messages)} | Repeticiones: {args.repeticiones}")
+    print(f"Scoring anterior (predict + transform): {legacy_us:8.1f} µs/mensaje")
+    print(f"Distancias densas (centroides):         {dense_us:8.1f} µs/mensaje")
+    print(f"Scoring fusionado (no nulos de la fila): {fused_us:7.1f} µs/mensaje")
+    print(f"Mejora: {legacy_us / fused_us:.1f}x sobre el anterior, {dense_us / fused_us:.1f}x sobre el denso")
+    print(f"predict() completo:                     {predict_us:8.1f} µs/mensaje")
+    print(f"Diferencias entre caminos: {mismatches}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Prueba de carga del servidor HTTP de inferencia.
+
+Envía solicitudes concurrentes con conexiones keep-alive y reporta latencia
+p50/p99 y throughput.
+
+Uso:
+    python -m src.server &                      # o --iniciar-servidor
+    python benchmarks/carga_servidor.py --concurrencia 16 --solicitudes 2000
+"""
+import argparse
+import csv
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ejecutar desde la raíz del proyecto
+project_root = Path(__file__).parent.parent
+os.chdir(project_root)
+
+
+def load_messages():
+    with open('data/training/textos_sin_etiquetar.csv', encoding='utf-8') as f:
+        return [row['texto'] for row in csv.DictReader(f)]
+
+
+def wait_for_server(host, port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=2)
+            connection.request('GET', '/salud')
+            if connection.getresponse().status == 200:
+                connection.close()
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def build_body(route, messages, index, batch_size):
+    if route == '/mensaje':
+        return {'mensaje': messages[index % len(messages)]}
+    texts = [messages[(index + i) % len(messages)] for i in range(batch_size)]
+    return {'mensajes': texts} if route == '/mensajes' else {'textos': texts}
+
+
+def client_worker(host, port, route, messages, counter, lock, total, batch_size, latencies, errors):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    headers = {'Content-Type': 'application/json'}
+    while True:
+        with lock:
+            if counter[0] >= total:
+                break
+            index = counter[0]
+            counter[0] += 1
+
+        body = json.dumps(build_body(route, messages, index, batch_size)).encode('utf-8')
+        start = time.perf_counter()
+        try:
+            connection.request('POST', route, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+    connection.close()
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de inferencia")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8000)
+    parser.add_argument('--ruta', default='/mensaje', choices=['/mensaje', '/mensajes', '/predecir'])
+    parser.add_argument('--concurrencia', type=int, default=16)
+    parser.add_argument('--solicitudes', type=int, default=2000)
+    parser.add_argument('--tamano-lote', type=int, default=16, help="Textos por solicitud en /mensajes y /predecir")
+    parser.add_argument('--iniciar-servidor', action='store_true',
+                        help="Inicia python -m src.server antes de la prueba y lo detiene al final")
+    parser.add_argument('--procesos', type=int, default=2, help="Procesos del servidor con --iniciar-servidor")
+    args = parser.parse_args()
+
+    server_process = None
+    if args.iniciar_servidor:
+        server_process = subprocess.Popen(
+            [sys.executable, '-m', 'src.server', '--host', args.host, '--puerto', str(args.puerto),
+             '--procesos', str(args.procesos)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    try:
+        if not wait_for_server(args.host, args.puerto):
+            print(f"El servidor no responde en {args.host}:{args.puerto}")
+            return
+
+        messages = load_messages()
+        latencies = []
+        errors = []
+        counter = [0]
+        lock = threading.Lock()
+
+        threads = [
+            threading.Thread(target=client_worker, args=(
+                args.host, args.puerto, args.ruta, messages, counter, lock,
+                args.solicitudes, args.tamano_lote, latencies, errors))
+            for _ in range(args.concurrencia)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        items_per_request = 1 if args.ruta == '/mensaje' else args.tamano_lote
+        print("=" * 50)
+        print(f"Ruta: {args.ruta} | Concurrencia: {args.concurrencia} | Solicitudes: {len(latencies)}")
+        print(f"Latencia p50: {percentile(latencies, 50):8.2f} ms")
+        print(f"Latencia p99: {percentile(latencies, 99):8.2f} ms")
+        print(f"Throughput:   {len(latencies) / elapsed:8.1f} solicitudes/s "
+              f"({len(latencies) * items_per_request / elapsed:.1f} mensajes/s)")
+        print(f"Errores: {len(errors)}")
+        print("=" * 50)
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
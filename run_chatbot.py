@@ -1,15 +1,39 @@
-from src.chat.core import EmotionChatbot
-from src.utils.logger import setup_logger
+import argparse
+from src.utils.startup_profiler import StartupProfiler
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Chatbot de Emociones (línea de comandos)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Muestra el tiempo de importación, inicialización y primera respuesta")
+    args = parser.parse_args()
+    
+    profiler = StartupProfiler(enabled=args.profile_startup)
+    
+    # Las importaciones se miden como parte del arranque
+    with profiler.phase('src.utils.logger', 'import'):
+        from src.utils.logger import setup_logger
+    with profiler.phase('src.chat.core', 'import'):
+        from src.chat.core import EmotionChatbot
+    
     logger = setup_logger()
     
     try:
         logger.info("Iniciando Chatbot de Emociones...")
-        chatbot = EmotionChatbot()
+        chatbot = EmotionChatbot(profiler=profiler)
+        
+        if args.profile_startup:
+            # Tiempo hasta la primera respuesta (sin escribir en el historial)
+            with profiler.phase('predicción + respuesta', 'respuesta'):
+                emotion, _, _ = chatbot.predictor.predict("Hola, hoy me siento bien")
+                chatbot.response_gen.get_response(emotion, "Hola, hoy me siento bien")
+            print(profiler.report())
+        
         chatbot.run_chat_interface()
         
     except Exception as e:
         logger.error(f"Error ejecutando chatbot: {e}")
         print(f"Error: {e}")
-        print("Asegúrate de haber entrenado el modelo primero: python train_model.py")
\ No newline at end of file
+        print("Asegúrate de haber entrenado el modelo primero: python train_model.py")
+
+if __name__ == "__main__":
+    main()
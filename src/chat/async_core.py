@@ -0,0 +1,94 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from .batcher import PredictionBatcher
+from .core import EmotionChatbot
+from src.utils.logger import get_logger
+
+class AsyncEmotionChatbot:
+    """Fachada asíncrona de EmotionChatbot para servidores basados en asyncio.
+
+    La predicción se ejecuta en el hilo de un PredictionBatcher para no
+    bloquear el bucle de eventos. Las solicitudes concurrentes se agrupan en
+    microlotes (hasta `max_batch_size` mensajes o `batch_window_ms`
+    milisegundos) que pasan por una sola llamada a `predict_many`. El
+    historial usa el HistoryWriter del chatbot (la misma cola y los mismos
+    lotes que la versión síncrona); `submit` puede bloquear con la política
+    'block', así que se llama desde un executor y no desde el bucle.
+    """
+
+    def __init__(self, chatbot=None, predictor=None, batch_window_ms=2, max_batch_size=32,
+                 metrics_hook=None):
+        self.logger = get_logger()
+        self.chatbot = chatbot if chatbot is not None else EmotionChatbot(predictor=predictor)
+        self.batcher = PredictionBatcher(
+            self._predict_many,
+            max_latency_ms=batch_window_ms,
+            max_batch_size=max_batch_size,
+            metrics_hook=metrics_hook
+        )
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='AsyncHistory')
+        self._closed = False
+
+    def _predict_many(self, texts):
+        # Se lee chatbot.predictor en cada lote para seguir los cambios de ModelRegistry
+        return self.chatbot.predictor.predict_many(texts)
+
+    async def process_message(self, user_message, session_id=None):
+        """Versión asíncrona de EmotionChatbot.process_message"""
+        if self._closed:
+            raise RuntimeError("AsyncEmotionChatbot cerrado")
+        try:
+            if not user_message or len(user_message.strip()) == 0:
+                return self.chatbot.empty_message_response()
+
+            emotion, confidence, cluster_info = await self._predict(user_message)
+
+            bot_response = self.chatbot.response_gen.get_response(emotion, user_message)
+            await self._save_conversation(user_message, emotion, bot_response, cluster_info, session_id)
+
+            return self.chatbot.build_result(bot_response, emotion, confidence, cluster_info)
+
+        except Exception as e:
+            self.logger.error(f"Error procesando mensaje (async): {e}")
+            return self.chatbot.error_response()
+
+    async def process_messages(self, user_messages, session_id=None):
+        """Procesa varios mensajes de forma concurrente (comparten microlotes)"""
+        return await asyncio.gather(*(self.process_message(message, session_id) for message in user_messages))
+
+    async def _predict(self, text):
+        return await asyncio.wrap_future(self.batcher.submit(text))
+
+    async def _save_conversation(self, user_msg, emotion, bot_response, cluster_info, session_id=None):
+        conversation_entry = self.chatbot.build_conversation_entry(
+            user_msg, emotion, bot_response, cluster_info, session_id
+        )
+        self.chatbot.sessions.add(session_id, conversation_entry)
+        # La cola acotada del HistoryWriter aplica contrapresión si el disco no da abasto
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._io_executor, self.chatbot.history_writer.submit, conversation_entry)
+
+        self.logger.info(f"Emoción detectada: {emotion} (Cluster: {cluster_info.get('cluster_id')})")
+
+    async def flush(self):
+        """Espera a que el historial pendiente quede escrito en disco"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._io_executor, self.chatbot.flush)
+
+    async def close(self):
+        """Escribe el historial pendiente y detiene el batcher y el executor de E/S"""
+        if self._closed:
+            return
+        self._closed = True
+        await self.flush()
+        # Los cierres esperan a otros hilos: se ejecutan fuera del event loop
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._io_executor.shutdown, True)
+        await loop.run_in_executor(None, self.batcher.close)
+        await loop.run_in_executor(None, self.chatbot.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import Future
+from src.utils.logger import get_logger
+
+class PredictionBatcher:
+    """Agrupa solicitudes concurrentes en lotes antes de llamar al predictor.
+
+    Cada `submit` devuelve un `concurrent.futures.Future`. Un hilo junta los
+    textos que llegan durante `max_latency_ms` (o hasta `max_batch_size`),
+    llama una sola vez a `predict_fn(lista_de_textos)` y resuelve los futures
+    en orden. `predict_fn` se consulta en cada lote, así se puede reemplazar
+    en caliente asignando `batcher.predict_fn`.
+
+    `metrics_hook(batch_size, wait_ms, predict_ms)` se llama después de cada
+    lote; los mismos datos se acumulan en `stats()`.
+    """
+
+    def __init__(self, predict_fn, max_latency_ms=2, max_batch_size=32, metrics_hook=None):
+        self.logger = get_logger()
+        self.predict_fn = predict_fn
+        self.max_latency = max(0, max_latency_ms) / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.metrics_hook = metrics_hook
+
+        self._pending = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._errors = 0
+        self._total_wait_ms = 0.0
+        self._total_predict_ms = 0.0
+
+        self._thread = threading.Thread(target=self._run, name='PredictionBatcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        """Encola un texto; el resultado llega en el Future devuelto"""
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("PredictionBatcher cerrado")
+            self._pending.append((text, future, time.perf_counter()))
+            self._condition.notify()
+        return future
+
+    def predict(self, text, timeout=None):
+        """Versión bloqueante de submit"""
+        return self.submit(text).result(timeout)
+
+    def close(self):
+        """Procesa lo pendiente y detiene el hilo"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def stats(self):
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                'pending': len(self._pending),
+                'batches': batches,
+                'items': self._items,
+                'errors': self._errors,
+                'avg_batch_size': round(self._items / batches, 2) if batches else 0.0,
+                'max_batch_size': self._max_batch,
+                'avg_wait_ms': round(self._total_wait_ms / batches, 3) if batches else 0.0,
+                'avg_predict_ms': round(self._total_predict_ms / batches, 3) if batches else 0.0
+            }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                # Esperar más textos hasta completar el lote o vencer la latencia máxima
+                deadline = self._pending[0][2] + self.max_latency
+                while len(self._pending) < self.max_batch_size and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+
+            self._process(batch)
+
+    def _process(self, batch):
+        start = time.perf_counter()
+        wait_ms = (start - batch[0][2]) * 1000
+        try:
+            results = self.predict_fn([text for text, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"predict_fn devolvió {len(results)} resultados para {len(batch)} textos")
+        except Exception as e:
+            self.logger.error(f"Error prediciendo lote: {e}")
+            with self._stats_lock:
+                self._errors += 1
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+        predict_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self._batches += 1
+            self._items += len(batch)
+            self._max_batch = max(self._max_batch, len(batch))
+            self._total_wait_ms += wait_ms
+            self._total_predict_ms += predict_ms
+
+        if self.metrics_hook is not None:
+            try:
+                self.metrics_hook(len(batch), wait_ms, predict_ms)
+            except Exception as e:
+                self.logger.warning(f"Error en metrics_hook del batcher: {e}")
@@ -2,25 +2,75 @@ import json
 from datetime import datetime
 from .predictor import EmotionPredictor
 from .responses import ResponseGenerator
+from .sessions import DEFAULT_SESSION_ID, SessionManager
 from src.data.data_manager import DataManager
+from src.data.history_writer import HistoryWriter
 from src.utils.logger import get_logger
+from src.utils.startup_profiler import StartupProfiler
 
 class EmotionChatbot:
-    def __init__(self):
+    def __init__(self, profiler=None, predictor=None):
         self.logger = get_logger()
-        self.predictor = EmotionPredictor()
-        self.response_gen = ResponseGenerator()
-        self.data_manager = DataManager()
-        self.conversation_history = []
+        profiler = profiler or StartupProfiler(enabled=False)
+        
+        # Se puede pasar un predictor ya cargado (p. ej. compartido entre procesos)
+        self.predictor = predictor if predictor is not None else EmotionPredictor(profiler=profiler)
+        with profiler.phase('respuestas'):
+            self.response_gen = ResponseGenerator()
+        with profiler.phase('historial'):
+            self.data_manager = DataManager()
+            self.history_writer = self._create_history_writer()
+            self.sessions = self._create_session_manager()
         
         self.logger.info("Chatbot de Emociones inicializado (K-means No Supervisado)")
         
-    def process_message(self, user_message):
+    def _create_history_writer(self):
+        """Crea el escritor en segundo plano del historial según parametros.json"""
+        params = self.data_manager.load_json('config/parametros.json').get('historial', {})
+        return HistoryWriter(
+            self.data_manager.conversation_store,
+            max_queue_size=params.get('tamano_cola', 1000),
+            batch_size=params.get('tamano_lote', 20),
+            flush_interval_ms=params.get('intervalo_ms', 200),
+            overflow_policy=params.get('politica_desborde', 'block')
+        )
+    
+    def _create_session_manager(self):
+        """Crea el gestor de sesiones en memoria según parametros.json"""
+        params = self.data_manager.load_json('config/parametros.json').get('sesiones', {})
+        return SessionManager(
+            max_entries_per_session=params.get('max_entradas_por_sesion', 50),
+            idle_ttl_s=params.get('ttl_inactividad_s', 1800),
+            max_sessions=params.get('max_sesiones', 1000),
+            max_memory_bytes=int(params.get('memoria_max_mb', 16) * 1024 * 1024)
+        )
+    
+    @property
+    def conversation_history(self):
+        """Historial en memoria de la sesión por defecto"""
+        return self.sessions.get_history(DEFAULT_SESSION_ID)
+    
+    def get_session_history(self, session_id=None, n=None):
+        return self.sessions.get_history(session_id, n)
+    
+    def flush(self):
+        """Espera a que el historial pendiente quede escrito en disco"""
+        self.history_writer.flush()
+    
+    def close(self):
+        """Escribe el historial pendiente y detiene el hilo de escritura"""
+        self.history_writer.close()
+    
+    def get_history_stats(self):
+        """Profundidad de la cola y latencias de escritura del historial"""
+        return self.history_writer.stats()
+    
+    def process_message(self, user_message, session_id=None):
         """Procesa un mensaje del usuario y genera respuesta usando K-means"""
         try:
             # Validar entrada
             if not user_message or len(user_message.strip()) == 0:
-                return self._get_empty_message_response()
+                return self.empty_message_response()
             
             # Predecir emoción usando K-means (no supervisado)
             emotion, confidence, cluster_info = self.predictor.predict(user_message)
@@ -29,23 +79,72 @@ class EmotionChatbot:
             bot_response = self.response_gen.get_response(emotion, user_message)
             
             # Guardar en historial
-            self._save_conversation(user_message, emotion, bot_response, cluster_info)
+            self._save_conversation(user_message, emotion, bot_response, cluster_info, session_id)
             
-            return {
-                'response': bot_response,
-                'emotion': emotion,
-                'confidence': confidence,
-                'cluster': cluster_info.get('cluster_id', -1),
-                'top_words': cluster_info.get('top_words', [])
-            }
+            return self.build_result(bot_response, emotion, confidence, cluster_info)
             
         except Exception as e:
             self.logger.error(f"Error procesando mensaje: {e}")
-            return self._get_error_response()
+            return self.error_response()
     
-    def _save_conversation(self, user_msg, emotion, bot_response, cluster_info):
+    def process_messages(self, user_messages, session_ids=None):
+        """Procesa varios mensajes en lote (una sola predicción vectorizada)
+        
+        `session_ids` puede ser un solo id para todos los mensajes o una lista
+        con un id por mensaje.
+        """
+        user_messages = list(user_messages)
+        results = [None] * len(user_messages)
+        if session_ids is None or isinstance(session_ids, str):
+            session_ids = [session_ids] * len(user_messages)
+        
+        try:
+            # Separar mensajes vacíos, que no pasan por el modelo
+            valid_indices = []
+            for i, message in enumerate(user_messages):
+                if not message or len(message.strip()) == 0:
+                    results[i] = self.empty_message_response()
+                else:
+                    valid_indices.append(i)
+            
+            predictions = self.predictor.predict_many([user_messages[i] for i in valid_indices])
+            
+            for i, (emotion, confidence, cluster_info) in zip(valid_indices, predictions):
+                user_message = user_messages[i]
+                bot_response = self.response_gen.get_response(emotion, user_message)
+                self._save_conversation(user_message, emotion, bot_response, cluster_info, session_ids[i])
+                results[i] = self.build_result(bot_response, emotion, confidence, cluster_info)
+            
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Error procesando lote de mensajes: {e}")
+            return [result if result is not None else self.error_response() for result in results]
+    
+    def build_result(self, bot_response, emotion, confidence, cluster_info):
+        """Resultado de process_message (también lo usa la fachada asíncrona)"""
+        return {
+            'response': bot_response,
+            'emotion': emotion,
+            'confidence': confidence,
+            'cluster': cluster_info.get('cluster_id', -1),
+            'top_words': cluster_info.get('top_words', [])
+        }
+    
+    def _save_conversation(self, user_msg, emotion, bot_response, cluster_info, session_id=None):
         """Guarda la conversación en JSON"""
-        conversation_entry = {
+        conversation_entry = self.build_conversation_entry(user_msg, emotion, bot_response, cluster_info, session_id)
+        
+        self.sessions.add(session_id, conversation_entry)
+        # La escritura en disco la hace el hilo de fondo
+        self.history_writer.submit(conversation_entry)
+        
+        self.logger.info(f"Emoción detectada: {emotion} (Cluster: {cluster_info.get('cluster_id')})")
+    
+    def build_conversation_entry(self, user_msg, emotion, bot_response, cluster_info, session_id=None):
+        """Entrada del historial para una conversación"""
+        return {
+            'session_id': session_id or DEFAULT_SESSION_ID,
             'user_message': user_msg,
             'detected_emotion': emotion,
             'bot_response': bot_response,
@@ -53,13 +152,9 @@ class EmotionChatbot:
             'cluster_words': cluster_info.get('top_words', []),
             'timestamp': datetime.now().isoformat()
         }
-        
-        self.conversation_history.append(conversation_entry)
-        self.data_manager.save_conversation(conversation_entry)
-        
-        self.logger.info(f"Emoción detectada: {emotion} (Cluster: {cluster_info.get('cluster_id')})")
     
-    def _get_empty_message_response(self):
+    def empty_message_response(self):
+        """Respuesta para un mensaje vacío"""
         return {
             'response': "Por favor escribe un mensaje para poder analizar tus emociones.",
             'emotion': 'neutral',
@@ -68,7 +163,8 @@ class EmotionChatbot:
             'top_words': []
         }
     
-    def _get_error_response(self):
+    def error_response(self):
+        """Respuesta cuando el mensaje no se pudo procesar"""
         return {
             'response': "Lo siento, hubo un error procesando tu mensaje. Intenta de nuevo.",
             'emotion': 'neutral',
@@ -91,30 +187,34 @@ class EmotionChatbot:
         print("Escribe 'salir' para terminar")
         print("="*50)
         
-        while True:
-            try:
-                user_input = input("\nTú: ").strip()
+        try:
+            while True:
+                try:
+                    user_input = input("\nTú: ").strip()
                 
-                if user_input.lower() in ['salir', 'exit', 'quit', 'adios']:
-                    print("\n¡Hasta luego! Gracias por chatear.")
-                    break
+                    if user_input.lower() in ['salir', 'exit', 'quit', 'adios']:
+                        print("\n¡Hasta luego! Gracias por chatear.")
+                        break
                     
-                if not user_input:
-                    print("Por favor escribe un mensaje")
-                    continue
+                    if not user_input:
+                        print("Por favor escribe un mensaje")
+                        continue
                 
-                # Procesar mensaje
-                result = self.process_message(user_input)
+                    # Procesar mensaje
+                    result = self.process_message(user_input)
                 
-                # Mostrar resultado con información del cluster
-                print(f"Bot [{result['emotion'].upper()}]: {result['response']}")
-                print(f"   Cluster: {result['cluster']} | Confianza: {result['confidence']:.2f}")
-                if result['top_words']:
-                    print(f"  Palabras clave: {', '.join(result['top_words'][:3])}")
+                    # Mostrar resultado con información del cluster
+                    print(f"Bot [{result['emotion'].upper()}]: {result['response']}")
+                    print(f"   Cluster: {result['cluster']} | Confianza: {result['confidence']:.2f}")
+                    if result['top_words']:
+                        print(f"  Palabras clave: {', '.join(result['top_words'][:3])}")
                     
-            except KeyboardInterrupt:
-                print("\n\n¡Chat terminado! Hasta pronto.")
-                break
-            except Exception as e:
-                print(f" Error: {e}")
-                self.logger.error(f"Error en interfaz: {e}")
\ No newline at end of file
+                except KeyboardInterrupt:
+                    print("\n\n¡Chat terminado! Hasta pronto.")
+                    break
+                except Exception as e:
+                    print(f" Error: {e}")
+                    self.logger.error(f"Error en interfaz: {e}")
+        finally:
+            # Asegurar que el historial pendiente quede en disco
+            self.close()
@@ -0,0 +1,126 @@
+import re
+from src.data.data_manager import DataManager
+from src.utils.logger import get_logger
+
+# Palabras clave por emoción usadas si config/palabras_clave.json no es válido
+DEFAULT_EMOTION_KEYWORDS = {
+    'alegría': ['alegría', 'feliz', 'contento', 'genial', 'maravilloso', 'increíble',
+               'alegre', 'fantástico', 'perfecto', 'excelente', 'bueno', 'entusiasmado',
+               'satisfecho', 'animado', 'optimista', 'inspirado', 'agradecido', 'paz',
+               'tranquilidad', 'éxito', 'logro', 'afortunado', 'divertido', 'encantado',
+               'espectacular', 'orgulloso', 'amor', 'energía', 'bien', 'gran día', 'gran'],
+    'tristeza': ['triste', 'tristeza', 'desanimado', 'mal', 'terrible', 'horrible',
+                'deprimido', 'fatal', 'desesperanzado', 'frustración', 'decepcionado',
+                'pena', 'exhausto', 'vacío', 'sin motivación', 'dolor', 'miedo', 'culpa',
+                'nostálgico', 'ansioso', 'harto', 'solo', 'fastidio', 'pésimo',
+                'traicionado', 'dolido', 'incomprendido', 'agotado', 'odio', 'error',
+                'falla', 'problema', 'complicado', 'difícil', 'me fue mal', 'fue mal'],
+    'enojo': ['enojado', 'molesto', 'furioso', 'indignado', 'cabreado', 'rabia',
+             'injusticia', 'preocupa', 'asco', 'inaceptable', 'irritado'],
+    'neutral': ['normal', 'regular', 'aceptable', 'estándar', 'tranquilo', 'indiferente',
+               'neutral', 'sin opinión', 'informativo', 'conciso', 'adecuado',
+               'irrelevante', 'usual', 'común', 'sin novedades', 'equilibrado', 'razonable'],
+    'sorpresa': ['sorprendido', 'sorpresa', 'inesperado', 'sorpresa agradable'],
+    'miedo': ['miedo', 'ansioso', 'preocupado', 'nervioso'],
+    'confusión': ['confundido', 'no entiendo', 'no sé'],
+    'satisfacción': ['satisfecho', 'satisfacción', 'lograr', 'terminar'],
+    'motivación': ['motivado', 'ilusionado', 'proyecto', 'nuevo'],
+    'orgullo': ['orgulloso', 'progreso', 'seguir'],
+    'agradecimiento': ['agradecido', 'gracias'],
+    'inspiración': ['inspirado', 'escuché'],
+    'abrumado': ['abrumado', 'tantas', 'tareas'],
+    'vacío': ['vacío', 'siento vacío', 'después']
+}
+
+# Claves que solo se buscan en el texto del usuario y no se usan para nombrar
+# clusters (en las palabras de un centroide coinciden de más)
+DEFAULT_TEXT_ONLY_KEYWORDS = ['gran día', 'gran', 'me fue mal', 'fue mal']
+
+# Pesos del puntaje por coincidencias
+PHRASE_WEIGHT = 20   # Frase completa contenida en el texto
+KEYWORD_WEIGHT = 10  # Palabra clave contenida en el texto
+TOKEN_WEIGHT = 5     # Cada palabra de la clave presente como palabra del texto
+
+
+class KeywordIndex:
+    """Índice de palabras clave por emoción construido una sola vez.
+
+    Todas las claves se buscan con una única expresión regular compilada
+    (alternancia dentro de un lookahead, así se detectan coincidencias
+    superpuestas) y las palabras sueltas con una tabla palabra → pesos.
+    """
+
+    def __init__(self, emotion_keywords, text_only_keywords=()):
+        self.emotions = list(emotion_keywords.keys())
+        self.keywords_by_emotion = {
+            emotion: [keyword.lower() for keyword in keywords if keyword]
+            for emotion, keywords in emotion_keywords.items()
+        }
+        text_only = {keyword.lower() for keyword in text_only_keywords}
+        self.cluster_keywords_by_emotion = {
+            emotion: [keyword for keyword in keywords if keyword not in text_only]
+            for emotion, keywords in self.keywords_by_emotion.items()
+        }
+
+        n_emotions = len(self.emotions)
+        self._keyword_weights = {}  # clave -> puntaje por emoción
+        self._token_weights = {}    # palabra -> puntaje por emoción
+
+        for emotion_idx, keywords in enumerate(self.keywords_by_emotion.values()):
+            for keyword in keywords:
+                weights = self._keyword_weights.setdefault(keyword, [0] * n_emotions)
+                weights[emotion_idx] += PHRASE_WEIGHT if ' ' in keyword else KEYWORD_WEIGHT
+
+                for token in set(keyword.split()):
+                    token_weights = self._token_weights.setdefault(token, [0] * n_emotions)
+                    token_weights[emotion_idx] += TOKEN_WEIGHT
+
+        # Alternativas de mayor a menor longitud: en cada posición se obtiene la
+        # clave más larga; las claves que son prefijo de ella también coinciden ahí
+        ordered_keywords = sorted(self._keyword_weights, key=len, reverse=True)
+        self._pattern = re.compile(
+            '(?=(' + '|'.join(re.escape(keyword) for keyword in ordered_keywords) + '))'
+        ) if ordered_keywords else None
+        self._prefixes = {
+            keyword: [other for other in self._keyword_weights if keyword.startswith(other)]
+            for keyword in self._keyword_weights
+        }
+
+    @classmethod
+    def from_config(cls, file_path='config/palabras_clave.json'):
+        """Construye el índice desde el JSON de palabras clave por emoción"""
+        logger = get_logger()
+        try:
+            config = DataManager().load_json(file_path)
+            emotion_keywords = config.get('emociones') if isinstance(config, dict) else None
+            if not emotion_keywords or not isinstance(emotion_keywords, dict):
+                raise ValueError("'emociones' debe ser un diccionario emoción -> lista")
+            if not all(isinstance(keywords, list) for keywords in emotion_keywords.values()):
+                raise ValueError("Cada emoción debe tener una lista de palabras clave")
+            return cls(emotion_keywords, config.get('solo_texto', []))
+        except Exception as e:
+            logger.warning(f"Error cargando palabras clave: {e}, usando palabras clave por defecto")
+            return cls(DEFAULT_EMOTION_KEYWORDS, DEFAULT_TEXT_ONLY_KEYWORDS)
+
+    def score(self, *texts):
+        """Puntaje por emoción para los textos dados (ya en minúsculas)"""
+        matched_keywords = set()
+        words = set()
+
+        for text in texts:
+            if self._pattern is not None:
+                for longest in set(match.group(1) for match in self._pattern.finditer(text)):
+                    matched_keywords.update(self._prefixes[longest])
+            words.update(text.split())
+
+        totals = [0] * len(self.emotions)
+        for keyword in matched_keywords:
+            for i, weight in enumerate(self._keyword_weights[keyword]):
+                totals[i] += weight
+        for word in words:
+            token_weights = self._token_weights.get(word)
+            if token_weights:
+                for i, weight in enumerate(token_weights):
+                    totals[i] += weight
+
+        return {emotion: total for emotion, total in zip(self.emotions, totals) if total > 0}
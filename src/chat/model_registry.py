@@ -0,0 +1,149 @@
+import threading
+from src.data.data_manager import DataManager
+from src.ml.model_loader import ModelLoader
+from src.utils.logger import get_logger
+
+SMOKE_TEST_TEXT = "Hoy me siento bien"
+
+
+class ModelRegistry:
+    """Recarga el modelo en uso (versión actual del almacén) sin reconstruir el chatbot.
+
+    El artefacto nuevo se carga y se valida con una predicción de prueba fuera
+    del camino de las solicitudes; después se reemplaza `chatbot.predictor` con
+    una sola asignación. Quien ya tomó la referencia al predictor anterior
+    termina con el modelo anterior; las solicitudes siguientes usan el nuevo.
+
+    Los cambios se detectan por la firma del artefacto (ruta, tamaño y mtime;
+    publicar otra versión o revertir cambia la ruta), a pedido (`reload`) o
+    con un hilo que la revisa cada `poll_interval_s`.
+    """
+
+    def __init__(self, chatbot, model_dir=None, poll_interval_s=None,
+                 smoke_text=SMOKE_TEST_TEXT, on_swap=None):
+        self.logger = get_logger()
+        self.chatbot = chatbot
+        self.model_dir = model_dir
+        self.smoke_text = smoke_text
+        self.on_swap = on_swap
+        self.loader = ModelLoader()
+
+        self.swaps = 0
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher = None
+        # Firma del artefacto en uso y de uno que falló la validación (no se reintenta).
+        # Se toma del predictor: volver a leer el disco aquí perdería una versión
+        # publicada entre la carga del predictor y la creación del registro
+        self._loaded_signature = getattr(chatbot.predictor, 'model_signature', None) or self._probe()
+        self._rejected_signature = None
+
+        if poll_interval_s:
+            self.start_watching(poll_interval_s)
+
+    @classmethod
+    def from_config(cls, chatbot, file_path='config/parametros.json', **kwargs):
+        """Crea el registro según la sección 'registro_modelos' de parametros.json"""
+        params = DataManager().load_json(file_path).get('registro_modelos', {})
+        kwargs.setdefault('poll_interval_s', params.get('intervalo_revision_s'))
+        kwargs.setdefault('smoke_text', params.get('texto_prueba', SMOKE_TEST_TEXT))
+        return cls(chatbot, **kwargs)
+
+    def _probe(self, model_dir=None):
+        try:
+            return self.loader.inference_signature(model_dir or self.loader.resolve_model_dir(self.model_dir))
+        except (FileNotFoundError, OSError):
+            return None
+
+    def has_new_model(self):
+        """True si el artefacto en disco cambió desde la última carga"""
+        signature = self._probe()
+        return signature is not None and signature not in (self._loaded_signature, self._rejected_signature)
+
+    def reload(self, force=False):
+        """Carga, valida e intercambia el predictor; devuelve True si hubo intercambio.
+
+        Bloquea al hilo que llama (usar `reload_async` desde la interfaz).
+        Si la carga o la validación fallan, el predictor actual no cambia y
+        la excepción se propaga.
+        """
+        with self._reload_lock:
+            # El puntero de versión se resuelve una vez: firma y carga del mismo directorio
+            model_dir = self.loader.resolve_model_dir(self.model_dir)
+            signature = self._probe(model_dir)
+            if not force and (signature is None or signature == self._loaded_signature):
+                return False
+
+            try:
+                model_data = self.loader.load_inference_model(model_dir)
+                candidate = self.chatbot.predictor.with_model(model_data)
+                cluster_id = candidate.validate(self.smoke_text)
+            except Exception as e:
+                self._rejected_signature = signature
+                self.last_error = str(e)
+                self.logger.error(f"Modelo nuevo rechazado, se mantiene el actual: {e}")
+                raise
+
+            previous = self.chatbot.predictor
+            # Asignación atómica: las solicitudes en curso conservan su referencia
+            self.chatbot.predictor = candidate
+            self._loaded_signature = signature
+            self._rejected_signature = None
+            self.last_error = None
+            self.swaps += 1
+
+        self.logger.info(f"Modelo recargado ({len(candidate.centers)} clusters, prueba -> cluster {cluster_id})")
+        if self.on_swap is not None:
+            try:
+                self.on_swap(candidate, previous)
+            except Exception as e:
+                self.logger.error(f"Error en on_swap tras recargar el modelo: {e}")
+        return True
+
+    def reload_async(self, callback=None, force=False):
+        """Recarga en un hilo aparte; `callback(swapped, error)` se llama desde ese hilo"""
+        def run():
+            try:
+                swapped, error = self.reload(force=force), None
+            except Exception as e:
+                swapped, error = False, e
+            if callback is not None:
+                callback(swapped, error)
+
+        thread = threading.Thread(target=run, name='model-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def start_watching(self, interval_s):
+        """Revisa periódicamente si hay un modelo nuevo y lo carga"""
+        if self._watcher is not None:
+            return
+        self._stop_event.clear()
+        self._watcher = threading.Thread(target=self._watch_loop, args=(interval_s,),
+                                         name='model-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch_loop(self, interval_s):
+        while not self._stop_event.wait(interval_s):
+            if not self.has_new_model():
+                continue
+            try:
+                self.reload()
+            except Exception:
+                # Ya registrado; la firma rechazada no se vuelve a intentar
+                pass
+
+    def stats(self):
+        return {
+            'signature': self._loaded_signature,
+            'swaps': self.swaps,
+            'last_error': self.last_error
+        }
+
+    def close(self):
+        """Detiene la revisión periódica"""
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from src.data.data_manager import DataManager
+from src.utils.logger import get_logger
+
+class PredictionCache:
+    """Caché LRU/TTL de predicciones indexada por el texto ya preprocesado.
+
+    Guarda lo que depende solo del texto limpio y del modelo: cluster,
+    confianza y palabras clave del texto. La detección por palabras clave usa
+    también el texto original, así que el predictor la vuelve a calcular en
+    cada mensaje (es barata frente a TF-IDF y las distancias).
+
+    Cada entrada pertenece a una firma de artefacto; cuando el predictor carga
+    un modelo distinto, la firma cambia y la caché se vacía sola.
+    """
+
+    def __init__(self, max_size=4096, ttl_s=None):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl_s if ttl_s and ttl_s > 0 else None
+        self.signature = None
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_config(cls, file_path='config/parametros.json'):
+        """Crea la caché según parametros.json; devuelve None si está desactivada"""
+        try:
+            params = DataManager().load_json(file_path).get('cache_predicciones', {})
+        except Exception as e:
+            get_logger().warning(f"Error leyendo configuración de la caché de predicciones: {e}")
+            params = {}
+        if not params.get('activa', True):
+            return None
+        return cls(max_size=params.get('tamano', 4096), ttl_s=params.get('ttl_s'))
+
+    def bind(self, signature):
+        """Asocia la caché a un artefacto; si cambió, descarta todas las entradas"""
+        with self._lock:
+            if signature != self.signature:
+                if self._entries:
+                    self._invalidations += 1
+                self._entries.clear()
+                self.signature = signature
+
+    def get(self, cleaned_text, signature):
+        """Devuelve (cluster_id, confianza, palabras) o None"""
+        with self._lock:
+            if signature != self.signature:
+                self._misses += 1
+                return None
+            entry = self._entries.get(cleaned_text)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[cleaned_text]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(cleaned_text)
+            self._hits += 1
+            return value
+
+    def put(self, cleaned_text, signature, cluster_id, confidence, top_words):
+        with self._lock:
+            # Resultado de un modelo que ya no es el actual
+            if signature != self.signature:
+                return
+            expires_at = time.monotonic() + self.ttl if self.ttl else None
+            self._entries[cleaned_text] = ((int(cluster_id), confidence, tuple(top_words)), expires_at)
+            self._entries.move_to_end(cleaned_text)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations
+            }
@@ -1,48 +1,127 @@
-import joblib
-import os
 import numpy as np
+from src.ml.model_loader import ModelLoader
 from src.ml.preprocessor import TextPreprocessor
+from .keyword_index import KeywordIndex
+from .prediction_cache import PredictionCache
 from src.utils.logger import get_logger
+from src.utils.startup_profiler import StartupProfiler
 
 class EmotionPredictor:
-    def __init__(self):
+    def __init__(self, profiler=None, model_data=None, preprocessor=None, keyword_index=None):
         self.logger = get_logger()
-        self.preprocessor = TextPreprocessor()
+        profiler = profiler or StartupProfiler(enabled=False)
+        
         self.model = None
         self.vectorizer = None
         self.pca = None
         self.cluster_emotions = {}
         self.emotion_names_cache = {}  # Cache para nombres de emociones
+        self.centers = None
+        self.centers_sq_norms = None  # Normas al cuadrado de los centroides (precalculadas)
+        self.feature_names = None  # Nombres de features del vectorizador (cacheados al cargar)
+        self.model_signature = None  # Firma del artefacto cargado (invalida la caché)
+        
+        # El preprocesador y el índice no dependen del modelo: se pueden reutilizar al recargarlo
+        with profiler.phase('preprocesador'):
+            self.preprocessor = preprocessor or TextPreprocessor()
+        with profiler.phase('índice de palabras clave'):
+            self.keyword_index = keyword_index or KeywordIndex.from_config()
+        # Caché opcional de predicciones por texto preprocesado (None si está desactivada)
+        self.prediction_cache = PredictionCache.from_config()
         
-        self._load_model()
+        with profiler.phase('carga del modelo'):
+            self._load_model(model_data)
         # Construir nombres de emociones después de cargar el modelo
         if self.model is not None:
-            self._build_emotion_names()
+            with profiler.phase('nombres de emociones'):
+                self._build_emotion_names()
+    
+    def with_model(self, model_data):
+        """Nuevo predictor con otro modelo, reutilizando preprocesador e índice de palabras"""
+        return EmotionPredictor(model_data=model_data, preprocessor=self.preprocessor,
+                                keyword_index=self.keyword_index)
     
-    def _load_model(self):
+    def validate(self, sample_text):
+        """Predicción de prueba que falla con excepción (predict devuelve un valor por defecto)"""
+        text_vector = self.vectorizer.transform([self.preprocessor.clean_text(sample_text)])
+        if self.pca:
+            text_vector = self.pca.transform(text_vector.toarray())
+        distances = self._compute_distances(text_vector)
+        if distances.shape != (1, len(self.centers)) or not np.all(np.isfinite(distances)):
+            raise ValueError(f"Predicción de prueba inválida: distancias {distances.shape}")
+        return int(distances[0].argmin())
+    
+    def _load_model(self, model_data=None):
         """Carga el modelo entrenado y el mapeo de clusters"""
         try:
-            model_path = 'models/current/modelo_entrenado.pkl'
-            if os.path.exists(model_path):
-                model_data = joblib.load(model_path)
-                self.model = model_data['kmeans']
-                self.vectorizer = model_data['vectorizer']
-                self.pca = model_data.get('pca')
-                self.cluster_emotions = model_data['cluster_emotions']
-                self.logger.info("Modelo K-means cargado exitosamente")
-            else:
-                raise FileNotFoundError("Modelo no encontrado. Ejecuta train_model.py primero")
-                
+            # Versión actual del almacén: artefacto compacto (sin pickle ni scikit-learn) o el pickle
+            if model_data is None:
+                model_data = ModelLoader().load_inference_model()
+            self.model = model_data['kmeans']
+            self.vectorizer = model_data['vectorizer']
+            self.pca = model_data.get('pca')
+            self.cluster_emotions = model_data['cluster_emotions']
+            self.model_signature = model_data.get('signature')
+            if self.prediction_cache is not None:
+                self.prediction_cache.bind(self.model_signature)
+            self._prepare_centers()
+            self._prepare_feature_names()
+            self.logger.info("Modelo K-means cargado exitosamente")
+            
         except Exception as e:
             self.logger.error(f"Error cargando modelo: {e}")
             raise
     
+    def _prepare_centers(self):
+        """Precalcula los centroides y sus normas para el cálculo de distancias"""
+        self.centers = np.asarray(self.model.cluster_centers_, dtype=np.float64)
+        self.centers_sq_norms = np.einsum('ij,ij->i', self.centers, self.centers)
+    
+    def _prepare_feature_names(self):
+        """Cachea el arreglo de nombres de features una sola vez"""
+        if hasattr(self.vectorizer, 'get_feature_names_out'):
+            self.feature_names = self.vectorizer.get_feature_names_out()
+        else:
+            self.feature_names = None
+    
+    def _compute_distances(self, text_matrix):
+        """Distancias euclidianas de cada fila a todos los centroides en una sola pasada"""
+        # ||x - c||² = ||x||² - 2·x·c + ||c||², operando directamente sobre la matriz sparse
+        if hasattr(text_matrix, 'multiply'):
+            row_sq_norms = np.asarray(text_matrix.multiply(text_matrix).sum(axis=1)).ravel()
+        else:
+            text_matrix = np.asarray(text_matrix, dtype=np.float64)
+            row_sq_norms = np.einsum('ij,ij->i', text_matrix, text_matrix)
+        
+        dot_products = np.asarray(text_matrix @ self.centers.T)
+        sq_distances = row_sq_norms[:, np.newaxis] - 2.0 * dot_products + self.centers_sq_norms[np.newaxis, :]
+        np.maximum(sq_distances, 0.0, out=sq_distances)
+        return np.sqrt(sq_distances, out=sq_distances)
+
+    def _compute_row_distances(self, text_vector):
+        """Distancias de una sola fila a los centroides (camino de predict)"""
+        if hasattr(text_vector, 'indices'):
+            # Solo las columnas de los centroides donde la fila no es cero: evita
+            # el costo fijo de las operaciones sparse de scipy para una fila
+            values = text_vector.data
+            dot_products = self.centers[:, text_vector.indices] @ values
+            sq_distances = values @ values - 2.0 * dot_products + self.centers_sq_norms
+            np.maximum(sq_distances, 0.0, out=sq_distances)
+            return np.sqrt(sq_distances, out=sq_distances)
+        differences = self.centers - np.asarray(text_vector, dtype=np.float64).ravel()
+        return np.sqrt(np.einsum('ij,ij->i', differences, differences))
+
     def predict(self, text):
         """Predice la emoción usando K-means (no supervisado)"""
         try:
             # Preprocesar texto
             cleaned_text = self.preprocessor.clean_text(text)
             
+            cached = self._cache_get(cleaned_text)
+            if cached is not None:
+                cluster_id, confidence, top_words = cached
+                return self._build_prediction(text, cleaned_text, cluster_id, confidence, list(top_words))
+            
             # Vectorizar con TF-IDF
             text_vector_tfidf = self.vectorizer.transform([cleaned_text])
             
@@ -54,100 +133,130 @@ class EmotionPredictor:
                 # K-means puede trabajar con sparse matrices directamente
                 text_vector_for_prediction = text_vector_tfidf
 
-            # Predecir cluster
-            # Convertir a array denso para predicción si es sparse
-            if hasattr(text_vector_for_prediction, 'toarray'):
-                text_vector_dense = text_vector_for_prediction.toarray()
-            else:
-                text_vector_dense = text_vector_for_prediction
-            
-            cluster_id = self.model.predict(text_vector_dense)[0]
-            
-            # Analizar el texto del usuario directamente para determinar la emoción
-            # Esto es más preciso que solo usar el cluster
-            emotion_name = self._detect_emotion_from_text(text, cleaned_text)
-            
-            # Si no se detectó una emoción clara, usar el nombre del cluster como fallback
-            if not emotion_name or emotion_name.startswith("emoción_"):
-                emotion = self.cluster_emotions.get(cluster_id, f"emoción_{cluster_id}")
-                emotion_name = self._get_emotion_name(cluster_id, emotion)
-            
-            # Calcular confianza (usar el vector denso)
-            confidence = self._calculate_confidence(text_vector_dense, cluster_id)
+            # Una sola pasada de distancias: el cluster es el centroide más cercano
+            # y la confianza sale del mismo vector
+            distances = self._compute_row_distances(text_vector_for_prediction)
+            cluster_id = distances.argmin()
+            confidence = self._confidence_from_distances(distances, cluster_id)
             
             # Obtener palabras características del texto del usuario (no solo del cluster)
-            top_words = self._get_user_text_words(text, text_vector_tfidf)
+            top_words = self._get_user_text_words(text, text_vector_tfidf, cleaned_text=cleaned_text)
+            self._cache_put(cleaned_text, cluster_id, confidence, top_words)
             
-            cluster_info = {
-                'cluster_id': int(cluster_id),
-                'top_words': top_words,
-                'distance_to_center': confidence,
-                'emotion_name': emotion_name
-            }
-            
-            return emotion_name, confidence, cluster_info
+            return self._build_prediction(text, cleaned_text, cluster_id, confidence, top_words)
             
         except Exception as e:
             self.logger.error(f"Error en predicción: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
-            return "neutral", 0.5, {'cluster_id': -1, 'top_words': []}
+            return self._get_default_prediction()
     
-    def _calculate_confidence(self, text_vector, cluster_id):
-        """Calcula confianza basada en distancia al centroide"""
+    def predict_many(self, texts):
+        """Predice la emoción de varios textos en un solo paso vectorizado"""
+        texts = list(texts)
+        if not texts:
+            return []
+        
         try:
-            # Asegurar que sea un array numpy
-            if not isinstance(text_vector, np.ndarray):
-                text_vector = np.array(text_vector)
+            cleaned_texts = self.preprocessor.clean_many(texts)
             
-            # Calcular distancias a todos los centroides
-            distances = self.model.transform(text_vector)[0]
-            distance_to_cluster = distances[cluster_id]
+            # Resultados ya cacheados; solo los demás pasan por el modelo
+            computed = [self._cache_get(cleaned_text) for cleaned_text in cleaned_texts]
+            missing = [i for i, result in enumerate(computed) if result is None]
             
-            # La confianza es inversamente proporcional a la distancia
-            # Normalizar basado en la distancia mínima y máxima
-            min_dist = distances.min()
-            max_dist = distances.max()
+            if missing:
+                # Vectorizar los textos faltantes en una sola matriz sparse
+                text_matrix_tfidf = self.vectorizer.transform([cleaned_texts[i] for i in missing])
+                
+                if self.pca:
+                    matrix_for_prediction = self.pca.transform(text_matrix_tfidf.toarray())
+                else:
+                    matrix_for_prediction = text_matrix_tfidf
+                
+                # Distancias de todos los textos a todos los centroides en una sola llamada
+                distances = self._compute_distances(matrix_for_prediction)
+                cluster_ids = distances.argmin(axis=1)
+                
+                for row, i in enumerate(missing):
+                    cluster_id = cluster_ids[row]
+                    confidence = self._confidence_from_distances(distances[row], cluster_id)
+                    top_words = self._get_user_text_words(texts[i], text_matrix_tfidf[row], cleaned_text=cleaned_texts[i])
+                    self._cache_put(cleaned_texts[i], cluster_id, confidence, top_words)
+                    computed[i] = (cluster_id, confidence, top_words)
             
-            if max_dist > min_dist:
-                # Normalizar distancia (0 = muy cerca, 1 = muy lejos)
-                normalized_dist = (distance_to_cluster - min_dist) / (max_dist - min_dist)
-                confidence = 1.0 - normalized_dist
-            else:
-                confidence = 0.5
+            return [
+                self._build_prediction(text, cleaned_text, cluster_id, confidence, list(top_words))
+                for text, cleaned_text, (cluster_id, confidence, top_words) in zip(texts, cleaned_texts, computed)
+            ]
             
-            # Asegurar que esté en el rango [0, 1]
-            return max(0.0, min(1.0, confidence))
         except Exception as e:
-            self.logger.error(f"Error calculando confianza: {e}")
+            self.logger.error(f"Error en predicción por lotes: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
-            return 0.5
+            # Fallback: procesar uno por uno
+            return [self.predict(text) for text in texts]
+    
+    def _cache_get(self, cleaned_text):
+        if self.prediction_cache is None:
+            return None
+        return self.prediction_cache.get(cleaned_text, self.model_signature)
+    
+    def _cache_put(self, cleaned_text, cluster_id, confidence, top_words):
+        if self.prediction_cache is not None:
+            self.prediction_cache.put(cleaned_text, self.model_signature, cluster_id, confidence, top_words)
+    
+    def get_cache_stats(self):
+        """Aciertos, fallos y expulsiones de la caché de predicciones (None si está desactivada)"""
+        return self.prediction_cache.stats() if self.prediction_cache is not None else None
+    
+    def _build_prediction(self, text, cleaned_text, cluster_id, confidence, top_words):
+        """Arma el resultado de la predicción a partir del cluster y la confianza"""
+        # Analizar el texto del usuario directamente para determinar la emoción
+        # Esto es más preciso que solo usar el cluster
+        emotion_name = self._detect_emotion_from_text(text, cleaned_text)
+        
+        # Si no se detectó una emoción clara, usar el nombre del cluster como fallback
+        if not emotion_name or emotion_name.startswith("emoción_"):
+            emotion = self.cluster_emotions.get(cluster_id, f"emoción_{cluster_id}")
+            emotion_name = self._get_emotion_name(cluster_id, emotion)
+        
+        cluster_info = {
+            'cluster_id': int(cluster_id),
+            'top_words': top_words,
+            'distance_to_center': confidence,
+            'emotion_name': emotion_name
+        }
+        
+        return emotion_name, confidence, cluster_info
+    
+    def _get_default_prediction(self):
+        return "neutral", 0.5, {'cluster_id': -1, 'top_words': []}
+    
+    def _confidence_from_distances(self, distances, cluster_id):
+        """Convierte el vector de distancias a los centroides en una confianza [0, 1]"""
+        distance_to_cluster = distances[cluster_id]
+        
+        # La confianza es inversamente proporcional a la distancia
+        # Normalizar basado en la distancia mínima y máxima
+        min_dist = distances.min()
+        max_dist = distances.max()
+        
+        if max_dist > min_dist:
+            # Normalizar distancia (0 = muy cerca, 1 = muy lejos)
+            normalized_dist = (distance_to_cluster - min_dist) / (max_dist - min_dist)
+            confidence = 1.0 - normalized_dist
+        else:
+            confidence = 0.5
+        
+        # Asegurar que esté en el rango [0, 1]
+        return max(0.0, min(1.0, confidence))
     
     def _build_emotion_names(self):
         """Construye un mapeo de nombres de emociones basado en palabras características"""
         try:
-            # Diccionario de palabras clave a emociones
-            emotion_keywords = {
-                'alegría': ['alegría', 'feliz', 'contento', 'genial', 'maravilloso', 'increíble', 'alegre', 'fantástico', 'perfecto', 'excelente', 'bueno', 'entusiasmado', 'satisfecho', 'animado', 'optimista', 'inspirado', 'agradecido', 'paz', 'tranquilidad', 'éxito', 'logro', 'afortunado', 'divertido', 'encantado', 'espectacular', 'orgulloso', 'amor', 'energía', 'bien'],
-                'tristeza': ['triste', 'tristeza', 'desanimado', 'mal', 'terrible', 'horrible', 'deprimido', 'fatal', 'desesperanzado', 'frustración', 'decepcionado', 'pena', 'exhausto', 'vacío', 'sin motivación', 'dolor', 'miedo', 'culpa', 'nostálgico', 'ansioso', 'harto', 'solo', 'fastidio', 'pésimo', 'traicionado', 'dolido', 'incomprendido', 'agotado', 'odio', 'error', 'falla', 'problema', 'complicado', 'difícil'],
-                'enojo': ['enojado', 'molesto', 'furioso', 'indignado', 'cabreado', 'rabia', 'injusticia', 'preocupa', 'asco', 'inaceptable', 'irritado'],
-                'neutral': ['normal', 'regular', 'aceptable', 'estándar', 'tranquilo', 'indiferente', 'neutral', 'sin opinión', 'informativo', 'conciso', 'adecuado', 'irrelevante', 'usual', 'común', 'sin novedades', 'equilibrado', 'razonable'],
-                'sorpresa': ['sorprendido', 'sorpresa', 'inesperado', 'sorpresa agradable'],
-                'miedo': ['miedo', 'ansioso', 'preocupado', 'nervioso'],
-                'confusión': ['confundido', 'no entiendo', 'no sé'],
-                'satisfacción': ['satisfecho', 'satisfacción', 'lograr', 'terminar'],
-                'motivación': ['motivado', 'ilusionado', 'proyecto', 'nuevo'],
-                'orgullo': ['orgulloso', 'progreso', 'seguir'],
-                'agradecimiento': ['agradecido', 'gracias'],
-                'inspiración': ['inspirado', 'escuché'],
-                'abrumado': ['abrumado', 'tantas', 'tareas'],
-                'vacío': ['vacío', 'siento vacío', 'después']
-            }
-            
             # Para cada cluster, analizar sus palabras características
-            if hasattr(self.vectorizer, 'get_feature_names_out'):
-                features = self.vectorizer.get_feature_names_out()
+            if self.feature_names is not None:
+                features = self.feature_names
                 
                 for cluster_id in range(len(self.model.cluster_centers_)):
                     # Obtener palabras más importantes del cluster
@@ -157,7 +266,7 @@ class EmotionPredictor:
                     
                     # Buscar coincidencias con emociones
                     emotion_scores = {}
-                    for emotion, keywords in emotion_keywords.items():
+                    for emotion, keywords in self.keyword_index.cluster_keywords_by_emotion.items():
                         score = sum(1 for word in cluster_words if any(kw in word or word in kw for kw in keywords))
                         if score > 0:
                             emotion_scores[emotion] = score
@@ -176,67 +285,12 @@ class EmotionPredictor:
     def _detect_emotion_from_text(self, original_text, cleaned_text):
         """Detecta la emoción directamente del texto del usuario"""
         try:
-            # Diccionario de palabras clave a emociones (más completo)
-            emotion_keywords = {
-                'alegría': ['alegría', 'feliz', 'contento', 'genial', 'maravilloso', 'increíble', 
-                           'alegre', 'fantástico', 'perfecto', 'excelente', 'bueno', 'entusiasmado', 
-                           'satisfecho', 'animado', 'optimista', 'inspirado', 'agradecido', 'paz', 
-                           'tranquilidad', 'éxito', 'logro', 'afortunado', 'divertido', 'encantado', 
-                           'espectacular', 'orgulloso', 'amor', 'energía', 'bien', 'gran día', 'gran'],
-                'tristeza': ['triste', 'tristeza', 'desanimado', 'mal', 'terrible', 'horrible', 
-                            'deprimido', 'fatal', 'desesperanzado', 'frustración', 'decepcionado', 
-                            'pena', 'exhausto', 'vacío', 'sin motivación', 'dolor', 'miedo', 'culpa', 
-                            'nostálgico', 'ansioso', 'harto', 'solo', 'fastidio', 'pésimo', 
-                            'traicionado', 'dolido', 'incomprendido', 'agotado', 'odio', 'error', 
-                            'falla', 'problema', 'complicado', 'difícil', 'me fue mal', 'fue mal'],
-                'enojo': ['enojado', 'molesto', 'furioso', 'indignado', 'cabreado', 'rabia', 
-                         'injusticia', 'preocupa', 'asco', 'inaceptable', 'irritado'],
-                'neutral': ['normal', 'regular', 'aceptable', 'estándar', 'tranquilo', 'indiferente', 
-                           'neutral', 'sin opinión', 'informativo', 'conciso', 'adecuado', 
-                           'irrelevante', 'usual', 'común', 'sin novedades', 'equilibrado', 'razonable'],
-                'sorpresa': ['sorprendido', 'sorpresa', 'inesperado', 'sorpresa agradable'],
-                'miedo': ['miedo', 'ansioso', 'preocupado', 'nervioso'],
-                'confusión': ['confundido', 'no entiendo', 'no sé'],
-                'satisfacción': ['satisfecho', 'satisfacción', 'lograr', 'terminar'],
-                'motivación': ['motivado', 'ilusionado', 'proyecto', 'nuevo'],
-                'orgullo': ['orgulloso', 'progreso', 'seguir'],
-                'agradecimiento': ['agradecido', 'gracias'],
-                'inspiración': ['inspirado', 'escuché'],
-                'abrumado': ['abrumado', 'tantas', 'tareas'],
-                'vacío': ['vacío', 'siento vacío', 'después']
-            }
-            
             # Convertir texto a minúsculas para comparación
             text_lower = cleaned_text.lower()
             original_lower = original_text.lower()
             
-            # Dividir en palabras para búsqueda más precisa
-            text_words = set(text_lower.split())
-            original_words = set(original_lower.split())
-            all_words = text_words | original_words
-            
-            # Contar coincidencias para cada emoción
-            emotion_scores = {}
-            for emotion, keywords in emotion_keywords.items():
-                score = 0
-                for keyword in keywords:
-                    keyword_lower = keyword.lower()
-                    # Buscar palabra completa en el texto
-                    if keyword_lower in text_lower or keyword_lower in original_lower:
-                        # Dar más peso a frases completas
-                        if ' ' in keyword:
-                            score += 20
-                        else:
-                            score += 10
-                    
-                    # Buscar palabras individuales
-                    keyword_words = set(keyword_lower.split())
-                    matches = len(keyword_words & all_words)
-                    if matches > 0:
-                        score += matches * 5
-                
-                if score > 0:
-                    emotion_scores[emotion] = score
+            # Puntaje por emoción con el índice precompilado de palabras clave
+            emotion_scores = self.keyword_index.score(text_lower, original_lower)
             
             # Retornar la emoción con mayor score
             if emotion_scores:
@@ -256,25 +310,41 @@ class EmotionPredictor:
         """Obtiene el nombre descriptivo de la emoción para un cluster"""
         return self.emotion_names_cache.get(cluster_id, default_emotion)
     
-    def _get_user_text_words(self, original_text, text_vector_tfidf, top_n=5):
+    def _top_feature_indices(self, text_vector_tfidf, k):
+        """Índices de los k pesos TF-IDF más altos usando solo las entradas no nulas de la fila"""
+        if hasattr(text_vector_tfidf, 'indices'):
+            values = text_vector_tfidf.data
+            indices = text_vector_tfidf.indices
+        else:
+            vector_array = np.asarray(text_vector_tfidf).ravel()
+            indices = np.flatnonzero(vector_array)
+            values = vector_array[indices]
+        
+        if len(values) > k:
+            candidates = np.argpartition(-values, k - 1)[:k]
+        else:
+            candidates = np.arange(len(values))
+        
+        # Mayor peso primero; a igual peso, el índice más alto primero. Es un orden
+        # determinista propio: el argsort (no estable) de la fila densa que se usaba
+        # antes no definía el orden de los empates y rellenaba con columnas en cero
+        order = np.lexsort((-indices[candidates], -values[candidates]))
+        return indices[candidates[order]]
+    
+    def _get_user_text_words(self, original_text, text_vector_tfidf, top_n=5, cleaned_text=None):
         """Obtiene las palabras más relevantes del texto del usuario"""
         try:
-            # Preprocesar texto original
-            cleaned_text = self.preprocessor.clean_text(original_text)
+            # Reusar el texto ya preprocesado en predict
+            if cleaned_text is None:
+                cleaned_text = self.preprocessor.clean_text(original_text)
             words = cleaned_text.split()
             
-            # Obtener índices de palabras con mayor peso TF-IDF en el texto
-            if hasattr(text_vector_tfidf, 'toarray'):
-                vector_array = text_vector_tfidf.toarray()[0]
-            else:
-                vector_array = text_vector_tfidf[0] if hasattr(text_vector_tfidf, '__getitem__') else text_vector_tfidf
-            
-            # Obtener features del vectorizador
-            if hasattr(self.vectorizer, 'get_feature_names_out'):
-                features = self.vectorizer.get_feature_names_out()
+            # Usar los nombres de features cacheados al cargar el modelo
+            if self.feature_names is not None:
+                features = self.feature_names
                 
                 # Obtener top índices con mayor peso
-                top_indices = vector_array.argsort()[-top_n*2:][::-1]  # Obtener más para filtrar
+                top_indices = self._top_feature_indices(text_vector_tfidf, top_n*2)  # Obtener más para filtrar
                 
                 # Filtrar palabras que realmente están en el texto del usuario
                 relevant_words = []
@@ -303,6 +373,6 @@ class EmotionPredictor:
         except Exception as e:
             self.logger.error(f"Error obteniendo palabras del usuario: {e}")
             # Fallback: palabras del texto
-            cleaned = self.preprocessor.clean_text(original_text)
+            cleaned = cleaned_text if cleaned_text is not None else self.preprocessor.clean_text(original_text)
             words = [w for w in cleaned.split() if len(w) > 3]
             return words[:top_n] if words else []
\ No newline at end of file
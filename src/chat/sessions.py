@@ -0,0 +1,202 @@
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Sesión usada cuando no se indica ninguna (CLI, interfaz gráfica)
+DEFAULT_SESSION_ID = 'default'
+
+# Costo aproximado en bytes de un registro y de una sesión sin contar los textos
+_RECORD_OVERHEAD = 120
+_SESSION_OVERHEAD = 400
+
+
+class ConversationRecord:
+    """Entrada compacta del historial en memoria (sin diccionario por instancia)"""
+
+    __slots__ = ('user_message', 'detected_emotion', 'bot_response', 'cluster_id',
+                 'cluster_words', 'timestamp', 'session_id', 'size')
+
+    def __init__(self, user_message, detected_emotion, bot_response, cluster_id,
+                 cluster_words, timestamp, session_id=DEFAULT_SESSION_ID):
+        self.user_message = user_message
+        self.detected_emotion = detected_emotion
+        self.bot_response = bot_response
+        self.cluster_id = cluster_id
+        self.cluster_words = tuple(cluster_words)
+        self.timestamp = timestamp
+        self.session_id = session_id
+        self.size = (_RECORD_OVERHEAD + len(user_message) + len(bot_response) + len(session_id)
+                     + sum(len(word) for word in self.cluster_words))
+
+    @classmethod
+    def from_entry(cls, entry, session_id=None):
+        """Crea el registro a partir de una entrada del historial (dict)"""
+        return cls(
+            entry.get('user_message', ''),
+            sys.intern(entry.get('detected_emotion', 'neutral')),
+            entry.get('bot_response', ''),
+            entry.get('cluster_id'),
+            entry.get('cluster_words', ()),
+            entry.get('timestamp'),
+            session_id or entry.get('session_id') or DEFAULT_SESSION_ID
+        )
+
+    def to_dict(self):
+        return {
+            'user_message': self.user_message,
+            'detected_emotion': self.detected_emotion,
+            'bot_response': self.bot_response,
+            'cluster_id': self.cluster_id,
+            'cluster_words': list(self.cluster_words),
+            'timestamp': self.timestamp,
+            'session_id': self.session_id
+        }
+
+
+class Session:
+    """Historial de una sesión en un buffer circular de tamaño fijo"""
+
+    __slots__ = ('session_id', 'history', 'created_at', 'last_access', 'size')
+
+    def __init__(self, session_id, max_entries):
+        self.session_id = session_id
+        self.history = deque(maxlen=max_entries)
+        self.created_at = time.monotonic()
+        self.last_access = self.created_at
+        self.size = _SESSION_OVERHEAD + len(session_id)
+
+
+class SessionManager:
+    """Estado de conversación por sesión con memoria acotada.
+
+    Cada sesión guarda como máximo `max_entries_per_session` registros. Las
+    sesiones sin actividad durante `idle_ttl_s` segundos se descartan, y si se
+    supera `max_sessions` o `max_memory_bytes` se descartan primero las usadas
+    hace más tiempo (LRU). El historial completo sigue en disco a través de
+    ConversationStore; esto es solo el estado en memoria.
+    """
+
+    def __init__(self, max_entries_per_session=50, idle_ttl_s=1800, max_sessions=1000,
+                 max_memory_bytes=16 * 1024 * 1024):
+        self.max_entries_per_session = max(1, max_entries_per_session)
+        self.idle_ttl = idle_ttl_s
+        self.max_sessions = max(1, max_sessions)
+        self.max_memory_bytes = max_memory_bytes
+
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self._evicted_ttl = 0
+        self._evicted_lru = 0
+        self._trimmed = 0
+
+    def add(self, session_id, entry):
+        """Agrega una entrada (dict) al historial de la sesión"""
+        session_id = session_id or DEFAULT_SESSION_ID
+        record = ConversationRecord.from_entry(entry, session_id)
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired_locked(now)
+            session = self._get_or_create_locked(session_id, now)
+
+            if len(session.history) == session.history.maxlen:
+                # El deque descarta el más antiguo al agregar
+                session.size -= session.history[0].size
+                self._memory_bytes -= session.history[0].size
+            session.history.append(record)
+            session.size += record.size
+            self._memory_bytes += record.size
+
+            self._enforce_limits_locked(session)
+        return record
+
+    def get_history(self, session_id=None, n=None):
+        """Historial de la sesión como lista de dicts (del más antiguo al más reciente)"""
+        session_id = session_id or DEFAULT_SESSION_ID
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return []
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            records = list(session.history)
+        if n is not None:
+            records = records[-n:] if n > 0 else []
+        return [record.to_dict() for record in records]
+
+    def end_session(self, session_id):
+        """Descarta una sesión explícitamente"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is not None:
+                self._memory_bytes -= session.size
+        return session is not None
+
+    def evict_expired(self):
+        """Descarta las sesiones inactivas; devuelve cuántas se eliminaron"""
+        with self._lock:
+            return self._evict_expired_locked(time.monotonic())
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'entries': sum(len(session.history) for session in self._sessions.values()),
+                'memory_bytes': self._memory_bytes,
+                'max_memory_bytes': self.max_memory_bytes,
+                'evicted_ttl': self._evicted_ttl,
+                'evicted_lru': self._evicted_lru,
+                'trimmed_entries': self._trimmed
+            }
+
+    def _get_or_create_locked(self, session_id, now):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = Session(session_id, self.max_entries_per_session)
+            self._sessions[session_id] = session
+            self._memory_bytes += session.size
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_access = now
+        return session
+
+    def _evict_expired_locked(self, now):
+        if not self.idle_ttl or self.idle_ttl <= 0:
+            return 0
+        evicted = 0
+        # El OrderedDict está en orden de uso: las inactivas quedan al principio
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.idle_ttl:
+                break
+            del self._sessions[session_id]
+            self._memory_bytes -= session.size
+            evicted += 1
+        self._evicted_ttl += evicted
+        return evicted
+
+    def _enforce_limits_locked(self, current):
+        # Descartar sesiones LRU distintas de la actual
+        while len(self._sessions) > 1 and (len(self._sessions) > self.max_sessions
+                                          or self._memory_bytes > self.max_memory_bytes):
+            session_id, session = next(iter(self._sessions.items()))
+            if session is current:
+                break
+            del self._sessions[session_id]
+            self._memory_bytes -= session.size
+            self._evicted_lru += 1
+
+        # Si la sesión actual sola excede el límite, recortar sus entradas más antiguas
+        while self._memory_bytes > self.max_memory_bytes and len(current.history) > 1:
+            record = current.history.popleft()
+            current.size -= record.size
+            self._memory_bytes -= record.size
+            self._trimmed += 1
+
@@ -0,0 +1,229 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from src.utils.logger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+class ConversationStore:
+    """Historial de conversaciones en formato JSON Lines (una entrada por línea).
+
+    Agregar una entrada es una sola escritura en modo append (O(1)); el archivo
+    se compacta cuando llega a `compact_threshold` líneas conservando solo las
+    últimas `retention`, y las lecturas recientes se hacen desde el final del
+    archivo. Varios procesos pueden compartir el archivo: la decisión de
+    compactar se toma contando las líneas reales bajo el bloqueo exclusivo.
+
+    Con `watermark_path` (marca del reentrenamiento incremental) la
+    compactación no descarta las entradas posteriores a la marca, hasta
+    `max_pending`, más una anterior que permite detectar huecos.
+    """
+
+    READ_BLOCK_SIZE = 8192
+
+    def __init__(self, file_path='data/history/conversaciones.jsonl', retention=100,
+                 compact_threshold=None, legacy_path='data/history/conversaciones.json',
+                 watermark_path=None, max_pending=10000):
+        self.logger = get_logger()
+        self.file_path = file_path
+        self.lock_path = f"{file_path}.lock"
+        self.retention = retention
+        # Por defecto se compacta cuando el archivo duplica la ventana de retención
+        self.compact_threshold = compact_threshold or retention * 2
+        self.legacy_path = legacy_path
+        self.watermark_path = watermark_path
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Tamaño del archivo a partir del cual vale la pena contar sus líneas
+        self._check_size = 0
+
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Importa el historial del JSON anterior la primera vez que se usa el store"""
+        if os.path.exists(self.file_path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            # Otro proceso puede estar migrando a la vez: se vuelve a revisar con el bloqueo
+            with self._process_lock(exclusive=True):
+                if os.path.exists(self.file_path):
+                    return
+                with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                conversations = legacy.get('conversations', []) if isinstance(legacy, dict) else []
+                if conversations:
+                    self._rewrite(conversations[-self.retention:])
+                    self.logger.info(f"Historial migrado a JSON Lines: {len(conversations[-self.retention:])} conversaciones")
+        except Exception as e:
+            self.logger.error(f"Error migrando historial {self.legacy_path}: {e}")
+
+    @contextmanager
+    def _process_lock(self, exclusive):
+        """Bloqueo entre procesos: las escrituras comparten, la compactación es exclusiva"""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _file_stats(self):
+        """Líneas y bytes del archivo tal como está en disco"""
+        try:
+            with open(self.file_path, 'rb') as f:
+                lines = sum(1 for _ in f)
+                return lines, f.tell()
+        except FileNotFoundError:
+            return 0, 0
+
+    def append(self, entry):
+        """Agrega una conversación al final del historial"""
+        self.append_many([entry])
+
+    def append_many(self, entries):
+        """Agrega varias conversaciones con una sola escritura"""
+        if not entries:
+            return
+        data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8')
+
+        with self._lock:
+            # O_APPEND: cada escritura va al final aunque haya otros escritores
+            with self._process_lock(exclusive=False):
+                fd = os.open(self.file_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    view = memoryview(data)
+                    while view:
+                        written = os.write(fd, view)
+                        view = view[written:]
+                finally:
+                    os.close(fd)
+
+            # El tamaño real (no un contador propio) incluye lo que agregaron otros procesos
+            try:
+                size = os.path.getsize(self.file_path)
+            except OSError:
+                size = 0
+            if size >= self._check_size:
+                self._compact_locked(force=False)
+
+    def compact(self):
+        """Reescribe el archivo conservando solo la ventana de retención"""
+        with self._lock:
+            self._compact_locked(force=True)
+
+    def _compact_locked(self, force):
+        try:
+            # Exclusivo: ningún otro proceso agrega entradas mientras se cuenta y se reescribe
+            with self._process_lock(exclusive=True):
+                lines, size = self._file_stats()
+                keep = self._keep_count()
+                # Se compacta cuando hay al menos (umbral - retención) líneas descartables
+                compacted = force or lines - keep >= self.compact_threshold - self.retention
+                if compacted:
+                    entries = self._read_last(keep)
+                    self._rewrite(entries)
+                    lines, size = self._file_stats()
+            self._schedule_check(lines - keep, size, lines)
+            if compacted:
+                self.logger.info(f"Historial compactado: {lines} conversaciones")
+        except Exception as e:
+            self.logger.error(f"Error compactando historial: {e}")
+
+    def _schedule_check(self, droppable, size, lines):
+        # Próxima revisión cuando el archivo crezca lo que falta para el umbral,
+        # estimado con el tamaño medio de línea (si se queda corto se vuelve a estimar)
+        avg_line = size / lines if lines else 1
+        missing = max(1, self.compact_threshold - self.retention - droppable)
+        self._check_size = size + int(missing * avg_line)
+
+    def _load_watermark(self):
+        if not self.watermark_path:
+            return None
+        try:
+            with open(self.watermark_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('ultimo_timestamp')
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _keep_count(self):
+        """Líneas a conservar: la retención o lo que falta reentrenar, lo que sea mayor"""
+        watermark = self._load_watermark()
+        if watermark is None:
+            # Sin reentrenamiento incremental en uso no hay nada que proteger
+            return self.retention
+        recent = self._read_last(self.max_pending + 1)
+        pending = 0
+        for entry in reversed(recent):
+            if str(entry.get('timestamp', '')) <= watermark:
+                break
+            pending += 1
+        if pending > self.max_pending:
+            self.logger.warning(f"Más de {self.max_pending} conversaciones sin reentrenar: "
+                                "las más antiguas se descartan sin haberse aprendido")
+        # Una entrada anterior a la marca permite al reentrenamiento detectar huecos
+        return max(self.retention, min(pending, self.max_pending) + 1)
+
+    def _rewrite(self, entries):
+        """Escribe el archivo completo en un temporal y lo reemplaza de forma atómica"""
+        # Temporal con nombre único: dos procesos nunca escriben el mismo archivo
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.file_path) or '.',
+                                        prefix=f"{os.path.basename(self.file_path)}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def load_recent(self, n=None):
+        """Devuelve las últimas n conversaciones (por defecto la ventana de retención)"""
+        n = self.retention if n is None else n
+        if n <= 0:
+            return []
+        with self._lock:
+            return self._read_last(n)
+
+    def _read_last(self, n):
+        """Lee las últimas n líneas leyendo bloques desde el final del archivo"""
+        if not os.path.exists(self.file_path):
+            return []
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b''
+            # n + 1 saltos de línea garantizan n líneas completas
+            while position > 0 and buffer.count(b'\n') <= n:
+                read_size = min(self.READ_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                buffer = f.read(read_size) + buffer
+
+        lines = buffer.splitlines()
+        if position > 0:
+            # La primera línea del buffer puede estar incompleta
+            lines = lines[1:]
+
+        entries = []
+        for line in lines[-n:]:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line.decode('utf-8')))
+            except (ValueError, UnicodeDecodeError):
+                self.logger.warning("Línea inválida en el historial, se omite")
+        return entries
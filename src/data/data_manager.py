@@ -1,15 +1,23 @@
-import pandas as pd
 import json
 import os
-from datetime import datetime
 from src.utils.logger import get_logger
+from .conversation_store import ConversationStore
+
+# Marca de agua del reentrenamiento incremental (la compactación la respeta)
+RETRAIN_WATERMARK_PATH = 'data/history/marca_reentrenamiento.json'
 
 class DataManager:
+    # Mantener solo las últimas 100 conversaciones
+    HISTORY_RETENTION = 100
+    
     def __init__(self):
         self.logger = get_logger()
+        self._conversation_store = None
     
     def load_csv(self, file_path):
         """Carga un archivo CSV"""
+        # pandas solo se importa cuando realmente se leen datos CSV
+        import pandas as pd
         try:
             if os.path.exists(file_path):
                 df = pd.read_csv(file_path)
@@ -56,23 +64,34 @@ class DataManager:
         except Exception as e:
             self.logger.error(f"Error guardando JSON {file_path}: {e}")
     
+    @property
+    def conversation_store(self):
+        """Historial de conversaciones (JSON Lines, creado al primer uso)"""
+        if self._conversation_store is None:
+            params = self.load_json('config/parametros.json').get('reentrenamiento', {})
+            # Lo que aún no se reentrenó no se compacta (hasta max_conversaciones)
+            self._conversation_store = ConversationStore(
+                'data/history/conversaciones.jsonl',
+                retention=self.HISTORY_RETENTION,
+                legacy_path='data/history/conversaciones.json',
+                watermark_path=RETRAIN_WATERMARK_PATH,
+                max_pending=params.get('max_conversaciones', 10000)
+            )
+        return self._conversation_store
+    
     def save_conversation(self, conversation_data):
         """Guarda una conversación en el historial"""
         try:
-            history_file = 'data/history/conversaciones.json'
-            history = self.load_json(history_file)
-            
-            if 'conversations' not in history:
-                history['conversations'] = []
-            
-            history['conversations'].append(conversation_data)
-            
-            # Mantener solo las últimas 100 conversaciones
-            if len(history['conversations']) > 100:
-                history['conversations'] = history['conversations'][-100:]
-            
-            self.save_json(history, history_file)
+            self.conversation_store.append(conversation_data)
             self.logger.info("Conversación guardada en historial")
             
         except Exception as e:
-            self.logger.error(f"Error guardando conversación: {e}")
\ No newline at end of file
+            self.logger.error(f"Error guardando conversación: {e}")
+    
+    def load_recent_conversations(self, n=None):
+        """Devuelve las últimas n conversaciones del historial"""
+        try:
+            return self.conversation_store.load_recent(n)
+        except Exception as e:
+            self.logger.error(f"Error cargando historial: {e}")
+            return []
\ No newline at end of file
@@ -0,0 +1,174 @@
+import queue
+import threading
+import time
+from src.utils.logger import get_logger
+
+# Marcadores internos de la cola
+_FLUSH = object()
+_STOP = object()
+
+class HistoryWriter:
+    """Escritura diferida del historial en un hilo de fondo.
+
+    Las entradas se encolan en una cola acotada y un hilo las escribe en lotes
+    cada `batch_size` entradas o cada `flush_interval_ms` milisegundos. Cuando
+    la cola está llena se bloquea al productor ('block') o se descarta la
+    entrada más antigua ('drop_oldest').
+    """
+
+    OVERFLOW_POLICIES = ('block', 'drop_oldest')
+
+    def __init__(self, store, max_queue_size=1000, batch_size=20, flush_interval_ms=200,
+                 overflow_policy='block'):
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desborde inválida: {overflow_policy}")
+
+        self.logger = get_logger()
+        self.store = store
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(1, flush_interval_ms) / 1000.0
+        self.overflow_policy = overflow_policy
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+        # Contadores para saber si el disco no da abasto
+        self._stats_lock = threading.Lock()
+        self._written = 0
+        self._dropped = 0
+        self._errors = 0
+        self._flushes = 0
+        self._total_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._last_flush_ms = 0.0
+
+        self._thread = threading.Thread(target=self._run, name='HistoryWriter', daemon=True)
+        self._thread.start()
+
+    def submit(self, entry):
+        """Encola una entrada del historial sin esperar a que se escriba"""
+        if self._closed:
+            # Después de cerrar se escribe de forma síncrona para no perder entradas
+            self._write_batch([entry])
+            return
+
+        if self.overflow_policy == 'block':
+            self._queue.put(entry)
+            return
+
+        requeue_stop = False
+        while True:
+            try:
+                self._queue.put_nowait(entry)
+                break
+            except queue.Full:
+                try:
+                    oldest = self._queue.get_nowait()
+                    self._queue.task_done()
+                    if oldest is _STOP:
+                        requeue_stop = True
+                    elif oldest is not _FLUSH:
+                        with self._stats_lock:
+                            self._dropped += 1
+                except queue.Empty:
+                    pass
+        if requeue_stop:
+            self._queue.put(_STOP)
+
+    def flush(self):
+        """Espera a que todas las entradas encoladas estén escritas"""
+        if self._closed:
+            return
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self, timeout=5.0):
+        """Escribe lo pendiente y detiene el hilo de fondo"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+        # Entradas encoladas en paralelo con el cierre
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _FLUSH and item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._write_batch(leftovers)
+        stats = self.stats()
+        self.logger.info(
+            f"Historial cerrado: {stats['written']} escritas, {stats['dropped']} descartadas, "
+            f"flush promedio {stats['avg_flush_ms']:.1f} ms"
+        )
+
+    def stats(self):
+        """Profundidad de la cola y latencias de escritura"""
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'max_queue_size': self.max_queue_size,
+                'written': self._written,
+                'dropped': self._dropped,
+                'errors': self._errors,
+                'flushes': self._flushes,
+                'last_flush_ms': round(self._last_flush_ms, 3),
+                'avg_flush_ms': round(self._total_flush_ms / self._flushes, 3) if self._flushes else 0.0,
+                'max_flush_ms': round(self._max_flush_ms, 3)
+            }
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            # Juntar entradas hasta completar el lote o vencer el intervalo
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    self._queue.task_done()
+                    stopping = item is _STOP
+                    break
+                batch.append(item)
+
+            self._write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, batch):
+        start = time.perf_counter()
+        try:
+            self.store.append_many(batch)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self._written += len(batch)
+                self._flushes += 1
+                self._last_flush_ms = elapsed_ms
+                self._total_flush_ms += elapsed_ms
+                self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        except Exception as e:
+            with self._stats_lock:
+                self._errors += 1
+            self.logger.error(f"Error escribiendo historial ({len(batch)} entradas): {e}")
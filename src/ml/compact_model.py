@@ -0,0 +1,245 @@
+"""Artefacto compacto del modelo (sin pickle ni scikit-learn).
+
+El artefacto vive en un directorio con:
+    manifiesto.json  - parámetros del vectorizador, clusters y metadatos
+    centroides.npy   - centroides de K-means (n_clusters x n_features)
+    idf.npy          - pesos IDF del vectorizador
+    vocabulario.txt  - un término por línea; el número de línea es su índice
+
+Los .npy se cargan con mmap_mode='r', así varios procesos comparten las
+páginas de los centroides en lugar de tener cada uno su copia.
+"""
+import json
+import os
+import re
+from collections import Counter
+from datetime import datetime
+import numpy as np
+import scipy.sparse as sp
+
+FORMAT_NAME = 'kmeans_emociones_compacto'
+FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifiesto.json'
+CENTERS_FILE = 'centroides.npy'
+IDF_FILE = 'idf.npy'
+VOCABULARY_FILE = 'vocabulario.txt'
+
+
+class CompactTfidfVectorizer:
+    """Reproduce TfidfVectorizer.transform (analizador de palabras) sin scikit-learn"""
+
+    def __init__(self, vocabulary, idf, lowercase=True, token_pattern=r"(?u)\b\w\w+\b",
+                 ngram_range=(1, 1), sublinear_tf=False, norm='l2', use_idf=True):
+        self.feature_names = np.asarray(vocabulary, dtype=object)
+        self.vocabulary_ = {term: i for i, term in enumerate(vocabulary)}
+        self.idf_ = idf
+        self.lowercase = lowercase
+        self.token_pattern = token_pattern
+        self.ngram_range = tuple(ngram_range)
+        self.sublinear_tf = sublinear_tf
+        self.norm = norm
+        self.use_idf = use_idf
+        self._token_regex = re.compile(token_pattern)
+
+    def _analyze(self, text):
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_regex.findall(text)
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                terms.append(' '.join(tokens[i:i + n]))
+        return terms
+
+    def transform(self, texts):
+        indptr = [0]
+        indices = []
+        values = []
+
+        for text in texts:
+            counts = Counter(
+                self.vocabulary_[term] for term in self._analyze(text) if term in self.vocabulary_
+            )
+            for feature_idx in sorted(counts):
+                indices.append(feature_idx)
+                values.append(counts[feature_idx])
+            indptr.append(len(indices))
+
+        data = np.asarray(values, dtype=np.float64)
+        indices = np.asarray(indices, dtype=np.int32)
+
+        if self.sublinear_tf:
+            np.log(data, out=data)
+            data += 1
+        if self.use_idf:
+            data *= self.idf_[indices]
+
+        matrix = sp.csr_matrix((data, indices, np.asarray(indptr, dtype=np.int32)),
+                               shape=(len(indptr) - 1, len(self.feature_names)))
+
+        if self.norm == 'l2':
+            row_norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            row_norms[row_norms == 0] = 1.0
+            matrix.data /= np.repeat(row_norms, np.diff(matrix.indptr))
+        elif self.norm == 'l1':
+            row_norms = np.asarray(abs(matrix).sum(axis=1)).ravel()
+            row_norms[row_norms == 0] = 1.0
+            matrix.data /= np.repeat(row_norms, np.diff(matrix.indptr))
+
+        return matrix
+
+    def get_feature_names_out(self):
+        return self.feature_names
+
+
+class CompactKMeans:
+    """Centroides de K-means con la interfaz mínima usada en inferencia"""
+
+    def __init__(self, cluster_centers):
+        self.cluster_centers_ = cluster_centers
+        self.n_clusters = cluster_centers.shape[0]
+
+    def transform(self, X):
+        centers = np.asarray(self.cluster_centers_)
+        if sp.issparse(X):
+            row_sq_norms = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            row_sq_norms = np.einsum('ij,ij->i', X, X)
+        sq_distances = (row_sq_norms[:, np.newaxis] - 2.0 * np.asarray(X @ centers.T)
+                        + np.einsum('ij,ij->i', centers, centers)[np.newaxis, :])
+        np.maximum(sq_distances, 0.0, out=sq_distances)
+        return np.sqrt(sq_distances)
+
+    def predict(self, X):
+        return self.transform(X).argmin(axis=1)
+
+
+def _vectorizer_params(vectorizer):
+    """Valida que el vectorizador se pueda reproducir y devuelve sus parámetros"""
+    if not hasattr(vectorizer, 'vocabulary_') or not hasattr(vectorizer, 'get_params'):
+        raise ValueError(f"El artefacto compacto necesita un TfidfVectorizer con vocabulario, no {type(vectorizer).__name__}")
+    params = vectorizer.get_params()
+    unsupported = []
+    if params.get('analyzer') != 'word':
+        unsupported.append('analyzer')
+    for name in ('preprocessor', 'tokenizer', 'stop_words', 'strip_accents'):
+        if params.get(name) is not None:
+            unsupported.append(name)
+    if params.get('binary'):
+        unsupported.append('binary')
+    if params.get('norm') not in ('l2', 'l1', None):
+        unsupported.append('norm')
+    if unsupported:
+        raise ValueError(f"Vectorizador no soportado por el artefacto compacto: {', '.join(unsupported)}")
+
+    return {
+        'tipo': 'tfidf',
+        'lowercase': bool(params['lowercase']),
+        'token_pattern': params['token_pattern'],
+        'ngram_range': list(params['ngram_range']),
+        'sublinear_tf': bool(params['sublinear_tf']),
+        'norm': params['norm'],
+        'use_idf': bool(params['use_idf'])
+    }
+
+
+def export_compact_model(model_data, output_dir):
+    """Escribe el artefacto compacto a partir del diccionario del modelo entrenado"""
+    if model_data.get('pca') is not None:
+        raise ValueError("El artefacto compacto no soporta PCA")
+
+    vectorizer = model_data['vectorizer']
+    kmeans = model_data['kmeans']
+    vectorizer_params = _vectorizer_params(vectorizer)
+    features = vectorizer.get_feature_names_out()
+    centers = np.ascontiguousarray(kmeans.cluster_centers_, dtype=np.float64)
+    idf = np.ascontiguousarray(vectorizer.idf_ if vectorizer_params['use_idf'] else np.ones(len(features)),
+                               dtype=np.float64)
+
+    os.makedirs(output_dir, exist_ok=True)
+    np.save(os.path.join(output_dir, CENTERS_FILE), centers)
+    np.save(os.path.join(output_dir, IDF_FILE), idf)
+    with open(os.path.join(output_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+        for term in features:
+            f.write(f"{term}\n")
+
+    manifest = {
+        'formato': FORMAT_NAME,
+        'version_formato': FORMAT_VERSION,
+        'creado': datetime.now().isoformat(),
+        'n_clusters': int(centers.shape[0]),
+        'n_features': int(centers.shape[1]),
+        'vectorizador': vectorizer_params,
+        'cluster_emotions': {str(k): v for k, v in model_data['cluster_emotions'].items()},
+        'evaluation': model_data.get('evaluation', {}),
+        'archivos': {
+            'centroides': CENTERS_FILE,
+            'idf': IDF_FILE,
+            'vocabulario': VOCABULARY_FILE
+        }
+    }
+    # El manifiesto se escribe al final: sin él el artefacto no se considera válido
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return manifest
+
+
+def has_compact_model(model_dir):
+    return os.path.exists(os.path.join(model_dir, MANIFEST_FILE))
+
+
+def load_compact_model(model_dir, mmap_mode='r'):
+    """Carga el artefacto compacto con el mismo formato de diccionario que el pickle"""
+    with open(os.path.join(model_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    if manifest.get('formato') != FORMAT_NAME or manifest.get('version_formato') != FORMAT_VERSION:
+        raise ValueError(f"Formato de artefacto no soportado: {manifest.get('formato')} v{manifest.get('version_formato')}")
+
+    files = manifest['archivos']
+    centers = np.load(os.path.join(model_dir, files['centroides']), mmap_mode=mmap_mode)
+    idf = np.load(os.path.join(model_dir, files['idf']), mmap_mode=mmap_mode)
+    with open(os.path.join(model_dir, files['vocabulario']), 'r', encoding='utf-8') as f:
+        vocabulary = f.read().splitlines()
+
+    if centers.shape != (manifest['n_clusters'], manifest['n_features']) or len(vocabulary) != manifest['n_features'] \
+            or idf.shape != (manifest['n_features'],):
+        raise ValueError("El artefacto compacto está incompleto o no coincide con el manifiesto")
+
+    params = manifest['vectorizador']
+    vectorizer = CompactTfidfVectorizer(
+        vocabulary, idf,
+        lowercase=params['lowercase'],
+        token_pattern=params['token_pattern'],
+        ngram_range=params['ngram_range'],
+        sublinear_tf=params['sublinear_tf'],
+        norm=params['norm'],
+        use_idf=params['use_idf']
+    )
+
+    return {
+        'kmeans': CompactKMeans(centers),
+        'vectorizer': vectorizer,
+        'pca': None,
+        'cluster_emotions': {int(k): v for k, v in manifest['cluster_emotions'].items()},
+        'evaluation': manifest.get('evaluation', {})
+    }
+
+
+if __name__ == "__main__":
+    # Exporta el artefacto compacto del modelo pickle actual:
+    #   python -m src.ml.compact_model
+    import joblib
+    from .model_store import ModelStore
+
+    model_dir = ModelStore().resolve()
+    model_data = joblib.load(os.path.join(model_dir, 'modelo_entrenado.pkl'))
+    manifest = export_compact_model(model_data, os.path.join(model_dir, 'compacto'))
+    print(f"Artefacto compacto exportado: {manifest['n_clusters']} clusters, {manifest['n_features']} features")
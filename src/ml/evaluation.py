@@ -0,0 +1,207 @@
+import time
+import numpy as np
+from scipy import sparse
+from src.utils.logger import get_logger
+
+# Estrategias de evaluación disponibles (parametros.json -> evaluacion.estrategia)
+EVALUATION_STRATEGIES = ('silhouette_muestra', 'silhouette_exacta', 'davies_bouldin', 'calinski_harabasz')
+
+
+def _encode_labels(labels):
+    """Etiquetas como enteros consecutivos 0..k-1 y tamaño de cada cluster"""
+    unique_labels, encoded = np.unique(np.asarray(labels), return_inverse=True)
+    return encoded, np.bincount(encoded, minlength=len(unique_labels))
+
+
+def _row_sq_norms(X):
+    if sparse.issparse(X):
+        return np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    X = np.asarray(X, dtype=np.float64)
+    return np.einsum('ij,ij->i', X, X)
+
+
+def _cluster_means(X, encoded, counts):
+    """Media de cada cluster (k × d, densa) sin densificar X"""
+    n_clusters = len(counts)
+    membership = sparse.csr_matrix(
+        (np.ones(len(encoded)), (encoded, np.arange(len(encoded)))),
+        shape=(n_clusters, len(encoded))
+    )
+    sums = membership @ X
+    sums = sums.toarray() if sparse.issparse(sums) else np.asarray(sums)
+    return sums / counts[:, np.newaxis]
+
+
+def stratified_sample(labels, sample_size, seed=42):
+    """Índices de una muestra estratificada por cluster (proporcional al tamaño)"""
+    labels = np.asarray(labels)
+    n_samples = len(labels)
+    if sample_size >= n_samples:
+        return np.arange(n_samples)
+
+    rng = np.random.default_rng(seed)
+    encoded, counts = _encode_labels(labels)
+    selected = []
+    for cluster, count in enumerate(counts):
+        members = np.flatnonzero(encoded == cluster)
+        # Al menos 2 por cluster para que la silhouette del cluster tenga sentido
+        take = min(count, max(2, int(round(sample_size * count / n_samples))))
+        selected.append(rng.choice(members, size=take, replace=False))
+    return np.sort(np.concatenate(selected))
+
+
+def chunked_silhouette(X, labels, block_size=500):
+    """Silhouette exacta procesando `block_size` filas a la vez.
+
+    La memoria es O(block_size × n) en lugar de O(n²): para cada bloque se
+    calculan sus distancias a todas las filas y se suman por cluster.
+    """
+    encoded, counts = _encode_labels(labels)
+    n_samples, n_clusters = len(encoded), len(counts)
+    if not 2 <= n_clusters <= n_samples - 1:
+        raise ValueError(f"La silhouette necesita entre 2 y n-1 clusters, hay {n_clusters}")
+
+    # Filas ordenadas por cluster: cada cluster queda en columnas contiguas de las
+    # distancias y las sumas por cluster salen de np.add.reduceat (el promedio no
+    # depende del orden)
+    order = np.argsort(encoded, kind='stable')
+    encoded = encoded[order]
+    X = X[order] if sparse.issparse(X) else np.asarray(X, dtype=np.float64)[order]
+    cluster_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sq_norms = _row_sq_norms(X)
+    X_t = X.T.tocsr() if sparse.issparse(X) else X.T
+
+    total = 0.0
+    for start in range(0, n_samples, block_size):
+        end = min(start + block_size, n_samples)
+        dot = X[start:end] @ X_t
+        # ||a||² - 2a·b + ||b||² en el mismo arreglo (sin temporales de b × n)
+        distances = dot.toarray() if sparse.issparse(dot) else np.array(dot)
+        distances *= -2.0
+        distances += sq_norms[start:end, np.newaxis]
+        distances += sq_norms[np.newaxis, :]
+        np.maximum(distances, 0.0, out=distances)
+        np.sqrt(distances, out=distances)
+        # La distancia de cada fila a sí misma es 0 exacto
+        distances[np.arange(end - start), np.arange(start, end)] = 0.0
+
+        cluster_sums = np.add.reduceat(distances, cluster_starts, axis=1)
+        own = encoded[start:end]
+        rows = np.arange(end - start)
+
+        own_counts = counts[own] - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            intra = cluster_sums[rows, own] / own_counts
+            mean_to_others = cluster_sums / counts[np.newaxis, :]
+        mean_to_others[rows, own] = np.inf
+        inter = mean_to_others.min(axis=1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (inter - intra) / np.maximum(intra, inter)
+        # Convención de scikit-learn: 0 para clusters de un solo elemento
+        scores[own_counts == 0] = 0.0
+        total += float(np.nan_to_num(scores).sum())
+
+    return total / n_samples
+
+
+def sampled_silhouette(X, labels, sample_size=5000, seed=42, block_size=500):
+    """Silhouette sobre una muestra estratificada con semilla fija"""
+    indices = stratified_sample(labels, sample_size, seed)
+    return chunked_silhouette(X[indices], np.asarray(labels)[indices], block_size), len(indices)
+
+
+def davies_bouldin(X, labels, block_size=10000):
+    """Índice Davies–Bouldin (menor es mejor) sin densificar X"""
+    encoded, counts = _encode_labels(labels)
+    means = _cluster_means(X, encoded, counts)
+    mean_sq_norms = np.einsum('ij,ij->i', means, means)
+    sq_norms = _row_sq_norms(X)
+
+    # Distancia media de cada cluster a su centroide, por bloques de filas
+    scatter = np.zeros(len(counts))
+    for start in range(0, X.shape[0], block_size):
+        end = min(start + block_size, X.shape[0])
+        own = encoded[start:end]
+        dot = np.asarray(X[start:end].multiply(means[own]).sum(axis=1)).ravel() if sparse.issparse(X) \
+            else np.einsum('ij,ij->i', X[start:end], means[own])
+        distances = np.sqrt(np.maximum(sq_norms[start:end] - 2.0 * dot + mean_sq_norms[own], 0.0))
+        scatter += np.bincount(own, weights=distances, minlength=len(counts))
+    scatter /= counts
+
+    centroid_distances = np.sqrt(np.maximum(
+        mean_sq_norms[:, np.newaxis] - 2.0 * means @ means.T + mean_sq_norms[np.newaxis, :], 0.0
+    ))
+    # La expansión deja residuos de redondeo en la diagonal; debe ser 0 exacto
+    np.fill_diagonal(centroid_distances, 0.0)
+    if np.allclose(scatter, 0) or np.allclose(centroid_distances, 0):
+        return 0.0
+    centroid_distances[centroid_distances == 0] = np.inf
+    combined = (scatter[:, np.newaxis] + scatter[np.newaxis, :]) / centroid_distances
+    return float(np.mean(np.max(combined, axis=1)))
+
+
+def calinski_harabasz(X, labels):
+    """Índice Calinski–Harabasz (mayor es mejor) sin densificar X"""
+    encoded, counts = _encode_labels(labels)
+    n_samples, n_clusters = len(encoded), len(counts)
+    means = _cluster_means(X, encoded, counts)
+    overall_mean = (counts @ means) / n_samples
+
+    # Dispersión entre clusters y dentro de cada cluster a partir de normas
+    between = float(np.sum(counts * np.sum((means - overall_mean) ** 2, axis=1)))
+    within = float(_row_sq_norms(X).sum() - np.sum(counts * np.einsum('ij,ij->i', means, means)))
+    if within <= 0:
+        return 1.0
+    return between * (n_samples - n_clusters) / (within * (n_clusters - 1))
+
+
+class ClusteringEvaluator:
+    """Evalúa un clustering con la estrategia configurada y mide cuánto tarda"""
+
+    def __init__(self, strategy='silhouette_muestra', sample_size=5000, seed=42, block_size=500,
+                 extra_metrics=()):
+        if strategy not in EVALUATION_STRATEGIES:
+            raise ValueError(f"Estrategia de evaluación inválida: {strategy}")
+        self.logger = get_logger()
+        self.strategy = strategy
+        self.sample_size = sample_size
+        self.seed = seed
+        self.block_size = block_size
+        self.extra_metrics = [metric for metric in extra_metrics if metric != strategy]
+
+    @classmethod
+    def from_params(cls, params):
+        """Crea el evaluador a partir de la sección 'evaluacion' de parametros.json"""
+        return cls(
+            strategy=params.get('estrategia', 'silhouette_muestra'),
+            sample_size=params.get('tamano_muestra', 5000),
+            seed=params.get('semilla', 42),
+            block_size=params.get('tamano_bloque', 500),
+            extra_metrics=params.get('metricas_extra', [])
+        )
+
+    def evaluate(self, X, labels):
+        """Diccionario con la métrica principal, las extra, la estrategia y el tiempo"""
+        start = time.perf_counter()
+        results = {'silhouette_score': None}
+        for metric in [self.strategy] + self.extra_metrics:
+            try:
+                results.update(self._compute(metric, X, labels))
+            except Exception as e:
+                self.logger.warning(f"No se pudo calcular {metric}: {e}")
+        results['estrategia_evaluacion'] = self.strategy
+        results['tiempo_evaluacion_s'] = round(time.perf_counter() - start, 4)
+        return results
+
+    def _compute(self, metric, X, labels):
+        if metric == 'silhouette_muestra':
+            score, evaluated = sampled_silhouette(X, labels, self.sample_size, self.seed, self.block_size)
+            return {'silhouette_score': round(score, 4), 'muestra_silhouette': evaluated}
+        if metric == 'silhouette_exacta':
+            return {'silhouette_score': round(chunked_silhouette(X, labels, self.block_size), 4)}
+        if metric == 'davies_bouldin':
+            return {'davies_bouldin': round(davies_bouldin(X, labels), 4)}
+        if metric == 'calinski_harabasz':
+            return {'calinski_harabasz': round(calinski_harabasz(X, labels), 4)}
+        raise ValueError(f"Métrica desconocida: {metric}")
@@ -0,0 +1,116 @@
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+class HashingTfidfVectorizer:
+    """TF-IDF sin vocabulario: HashingVectorizer más un IDF acumulado por bloques.
+
+    El hashing no necesita ver el corpus antes de vectorizar, así que los
+    conteos de cada bloque se obtienen en la misma pasada en que se acumulan
+    las frecuencias de documento (`partial_fit`). Al terminar, `finalize`
+    calcula el IDF (misma fórmula suavizada que TfidfVectorizer) y anula las
+    columnas fuera de `min_df`/`max_df`. La memoria depende de `n_features`,
+    no del tamaño del corpus.
+
+    Para interpretar clusters y mostrar palabras se guarda el primer término
+    visto en cada columna; con colisiones, la columna muestra solo ese término.
+    """
+
+    def __init__(self, n_features=2 ** 16, ngram_range=(1, 2), min_df=2, max_df=0.9, sublinear_tf=True):
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.min_df = min_df
+        self.max_df = max_df
+        self.sublinear_tf = sublinear_tf
+
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            alternate_sign=False,
+            norm=None
+        )
+        self.document_counts = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self.idf_ = None
+        self._names = {}
+
+    def partial_fit(self, texts):
+        """Acumula frecuencias de documento de un bloque y devuelve sus conteos"""
+        counts = self.hasher.transform(texts)
+        # Cada fila cuenta una vez por columna no nula
+        self.document_counts += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        self._name_new_columns(texts, counts)
+        return counts
+
+    def finalize(self):
+        """Calcula el IDF con lo acumulado; después ya se puede transformar"""
+        if self.n_docs == 0:
+            raise ValueError("No hay documentos para calcular el IDF")
+        df = self.document_counts
+        idf = np.log((1 + self.n_docs) / (1 + df)) + 1.0
+
+        min_count = self.min_df if isinstance(self.min_df, int) else int(np.ceil(self.min_df * self.n_docs))
+        max_count = self.max_df if isinstance(self.max_df, int) else int(self.max_df * self.n_docs)
+        idf[(df < min_count) | (df > max_count)] = 0.0
+        self.idf_ = idf
+        return self
+
+    def fit(self, texts, chunk_size=10000):
+        """Ajusta el IDF recorriendo los textos (cualquier iterable) por bloques"""
+        chunk = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) >= chunk_size:
+                self.partial_fit(chunk)
+                chunk = []
+        if chunk:
+            self.partial_fit(chunk)
+        return self.finalize()
+
+    def fit_transform(self, texts):
+        counts = self.partial_fit(list(texts))
+        self.finalize()
+        return self.tfidf_from_counts(counts)
+
+    def transform(self, texts):
+        return self.tfidf_from_counts(self.hasher.transform(texts))
+
+    def tfidf_from_counts(self, counts):
+        """Convierte conteos del hasher en TF-IDF normalizado (L2)"""
+        if self.idf_ is None:
+            raise ValueError("El vectorizador no está ajustado: llama a finalize()")
+        tfidf = counts.astype(np.float64, copy=True).tocsr()
+        if self.sublinear_tf:
+            np.log(tfidf.data, out=tfidf.data)
+            tfidf.data += 1.0
+        tfidf.data *= self.idf_[tfidf.indices]
+        tfidf.eliminate_zeros()
+        return normalize(tfidf, norm='l2', copy=False)
+
+    def get_feature_names_out(self):
+        names = np.array([f"#{i}" for i in range(self.n_features)], dtype=object)
+        for column, term in self._names.items():
+            names[column] = term
+        return names
+
+    def _name_new_columns(self, texts, counts):
+        """Guarda un término por columna, analizando solo los textos con columnas nuevas"""
+        columns = np.unique(counts.indices)
+        new_columns = set(column for column in columns.tolist() if column not in self._names)
+        if not new_columns:
+            return
+
+        analyzer = self.hasher.build_analyzer()
+        for row in range(counts.shape[0]):
+            row_columns = counts.indices[counts.indptr[row]:counts.indptr[row + 1]]
+            if not new_columns.intersection(row_columns.tolist()):
+                continue
+            for term in analyzer(texts[row]):
+                column = abs(murmurhash3_32(term, seed=0)) % self.n_features
+                if column in new_columns:
+                    self._names[column] = term
+                    new_columns.discard(column)
+            if not new_columns:
+                break
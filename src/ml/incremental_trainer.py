@@ -0,0 +1,152 @@
+"""Reentrenamiento incremental a partir de las conversaciones registradas.
+
+Parte del modelo actual en lugar de entrenar desde cero: el vectorizador
+queda fijo (mismo vocabulario e IDF) y K-means arranca desde los centroides
+actuales con un número acotado de iteraciones. Como cada centroide empieza
+donde estaba, el cluster i sigue siendo el cluster i y `cluster_emotions`
+conserva su significado.
+
+Los mensajes de usuario nuevos se toman del historial (JSON Lines) desde la
+última marca de agua y se agregan a un CSV propio, para que el siguiente
+reentrenamiento los vuelva a incluir aunque el historial ya se haya compactado.
+"""
+import os
+import time
+import numpy as np
+from scipy.sparse import vstack
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from src.data.data_manager import RETRAIN_WATERMARK_PATH
+from .hashing_vectorizer import HashingTfidfVectorizer
+from .model_loader import ModelLoader
+from .unsupervised_trainer import TRAINING_DATA_PATH, UnsupervisedTrainer
+
+WATERMARK_PATH = RETRAIN_WATERMARK_PATH
+LEARNED_TEXTS_PATH = 'data/training/textos_conversaciones.csv'
+
+
+class IncrementalTrainer(UnsupervisedTrainer):
+    def __init__(self, model_dir=None, data_path=TRAINING_DATA_PATH,
+                 learned_texts_path=LEARNED_TEXTS_PATH, watermark_path=WATERMARK_PATH):
+        super().__init__(data_path=data_path)
+        params = self.data_manager.load_json('config/parametros.json').get('reentrenamiento', {})
+        self.max_iter = params.get('max_iteraciones', 20)
+        self.min_new_texts = params.get('min_textos_nuevos', 1)
+        self.max_conversations = params.get('max_conversaciones', 10000)
+        self.model_dir = model_dir
+        self.learned_texts_path = learned_texts_path
+        self.watermark_path = watermark_path
+
+    def load_watermark(self):
+        """Timestamp de la última conversación usada (None si nunca se reentrenó)"""
+        if not os.path.exists(self.watermark_path):
+            return None
+        return self.data_manager.load_json(self.watermark_path).get('ultimo_timestamp')
+
+    def load_new_conversations(self, watermark=None):
+        """Conversaciones del historial posteriores a la marca de agua, en orden"""
+        # Una más que el máximo: el historial conserva una entrada anterior a la marca
+        entries = self.data_manager.load_recent_conversations(self.max_conversations + 1)
+        if watermark is not None and entries and str(entries[0].get('timestamp', '')) > watermark:
+            self.logger.warning("El historial no llega hasta la marca de agua: se perdieron "
+                                "conversaciones sin reentrenar (aumentar 'max_conversaciones' "
+                                "o reentrenar más seguido)")
+        return [
+            entry for entry in entries
+            if entry.get('user_message') and entry.get('timestamp')
+            and (watermark is None or entry['timestamp'] > watermark)
+        ]
+
+    def train(self):
+        """Reentrena desde el modelo actual; devuelve la evaluación o None si no hay textos nuevos"""
+        start = time.perf_counter()
+        watermark = self.load_watermark()
+        new_entries = self.load_new_conversations(watermark)
+        if len(new_entries) < self.min_new_texts:
+            self.logger.info(f"Reentrenamiento incremental omitido: {len(new_entries)} textos nuevos "
+                             f"(mínimo {self.min_new_texts})")
+            return None
+
+        loader = ModelLoader()
+        model_dir = loader.resolve_model_dir(self.model_dir)
+        model_data = loader.load_trained_model(os.path.join(model_dir, 'modelo_entrenado.pkl'))
+        previous = model_data['kmeans']
+        cluster_emotions = model_data['cluster_emotions']
+        self.vectorizer = model_data['vectorizer']
+        self.vectorizer_type = 'hashing' if isinstance(self.vectorizer, HashingTfidfVectorizer) else 'tfidf'
+        self.n_clusters = previous.n_clusters
+        previous_centers = previous.cluster_centers_.copy()
+
+        new_texts = [entry['user_message'] for entry in new_entries]
+        X_new = self.vectorizer.transform(self.preprocessor.clean_many(new_texts, n_jobs=self.clean_jobs))
+        self.logger.info(f"Reentrenamiento incremental con {len(new_texts)} textos nuevos "
+                         f"(modelo de {self.n_clusters} clusters)")
+
+        if isinstance(previous, MiniBatchKMeans):
+            self.mode = 'minibatch'
+            cluster_emotions, evaluation = self._update_minibatch(previous, X_new, cluster_emotions)
+        else:
+            self.mode = 'completo'
+            cluster_emotions, evaluation = self._update_full(previous, X_new, cluster_emotions)
+
+        shift = np.linalg.norm(self.kmeans.cluster_centers_ - previous_centers)
+        evaluation['desplazamiento_centroides'] = round(float(shift / max(np.linalg.norm(previous_centers), 1e-12)), 6)
+        evaluation['modo'] = 'incremental'
+        evaluation['textos_nuevos'] = len(new_texts)
+        evaluation['tiempo_reentrenamiento_s'] = round(time.perf_counter() - start, 3)
+
+        self.save_model(cluster_emotions, evaluation)
+        self._append_learned_texts(new_texts)
+        # La marca es el timestamp más reciente, no el de la última línea: con
+        # varios procesos escribiendo, el historial no queda ordenado por tiempo
+        self.data_manager.save_json({'ultimo_timestamp': max(entry['timestamp'] for entry in new_entries),
+                                     'textos_nuevos': len(new_texts)}, self.watermark_path)
+        return evaluation
+
+    def _update_full(self, previous, X_new, cluster_emotions):
+        """K-means desde los centroides actuales sobre el corpus base más los textos nuevos"""
+        X_base = self._transform_base_corpus()
+        X = vstack([X_base, X_new], format='csr') if X_base is not None else X_new
+
+        # Un solo arranque (los centroides actuales) y pocas iteraciones de Lloyd
+        self.kmeans = KMeans(n_clusters=self.n_clusters, init=previous.cluster_centers_, n_init=1,
+                             max_iter=self.max_iter, random_state=42)
+        clusters = self.kmeans.fit_predict(X)
+
+        evaluation = self.evaluate_model(X, clusters)
+        evaluation['iteraciones'] = int(self.kmeans.n_iter_)
+        if X_base is not None:
+            # Textos del corpus base que cambiaron de cluster
+            changed = np.mean(previous.predict(X_base) != clusters[:X_base.shape[0]])
+            evaluation['reasignados'] = round(float(changed), 4)
+        return cluster_emotions, evaluation
+
+    def _update_minibatch(self, previous, X_new, cluster_emotions):
+        """MiniBatchKMeans sigue aprendiendo con partial_fit solo sobre los textos nuevos"""
+        self.kmeans = previous
+        batch_size = previous.batch_size
+        for start in range(0, X_new.shape[0], batch_size):
+            self.kmeans.partial_fit(X_new[start:start + batch_size])
+
+        # El corpus completo no se relee: la evaluación es sobre los textos nuevos
+        clusters = self.kmeans.predict(X_new)
+        inertia = -self.kmeans.score(X_new)
+        return cluster_emotions, self.evaluate_model(X_new, clusters, inertia=inertia)
+
+    def _transform_base_corpus(self):
+        """Corpus base y textos aprendidos antes, con el vectorizador ya ajustado"""
+        matrices = []
+        for path in (self.data_path, self.learned_texts_path):
+            if not os.path.exists(path):
+                continue
+            for chunk in self.iter_training_chunks(data_path=path):
+                matrices.append(self.vectorizer.transform(chunk))
+        if not matrices:
+            return None
+        return vstack(matrices, format='csr')
+
+    def _append_learned_texts(self, texts):
+        """Agrega los textos usados al CSV de conversaciones aprendidas"""
+        import pandas as pd
+        header = not os.path.exists(self.learned_texts_path)
+        os.makedirs(os.path.dirname(self.learned_texts_path), exist_ok=True)
+        pd.DataFrame({'texto': texts}).to_csv(self.learned_texts_path, mode='a', header=header, index=False)
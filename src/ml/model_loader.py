@@ -1,21 +1,89 @@
-import joblib
 import os
+from src.ml.compact_model import has_compact_model, load_compact_model
+from src.ml.model_store import ModelStore
 from src.utils.logger import get_logger
 
 class ModelLoader:
-    def __init__(self):
+    def __init__(self, store=None):
         self.logger = get_logger()
+        self.store = store
     
-    def load_trained_model(self, model_path='models/current/modelo_entrenado.pkl'):
+    def resolve_model_dir(self, model_dir=None):
+        """Directorio del modelo: el indicado o la versión actual del almacén"""
+        if model_dir is not None:
+            return model_dir
+        if self.store is None:
+            self.store = ModelStore()
+        return self.store.resolve()
+    
+    def load_trained_model(self, model_path=None):
         """Carga un modelo entrenado"""
         try:
+            if model_path is None:
+                model_path = os.path.join(self.resolve_model_dir(), 'modelo_entrenado.pkl')
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"Modelo no encontrado en {model_path}")
             
+            # joblib (y scikit-learn al deserializar) solo se importan para el pickle
+            import joblib
             model_data = joblib.load(model_path)
             self.logger.info("Modelo cargado exitosamente")
             return model_data
             
         except Exception as e:
             self.logger.error(f"Error cargando modelo: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def load_compact_model(self, model_dir=None):
+        """Carga el artefacto compacto (centroides e IDF mapeados en memoria, sin scikit-learn)"""
+        try:
+            if model_dir is None:
+                model_dir = os.path.join(self.resolve_model_dir(), 'compacto')
+            model_data = load_compact_model(model_dir)
+            self.logger.info(f"Artefacto compacto cargado desde {model_dir}")
+            return model_data
+            
+        except Exception as e:
+            self.logger.error(f"Error cargando artefacto compacto: {e}")
+            raise
+    
+    def load_inference_model(self, model_dir=None):
+        """Carga el modelo para inferencia: artefacto compacto si existe, si no el pickle
+        
+        El puntero de versión se resuelve una sola vez: todos los archivos salen
+        del mismo directorio aunque mientras tanto se publique otra versión.
+        """
+        model_dir = self.resolve_model_dir(model_dir)
+        compact_dir = os.path.join(model_dir, 'compacto')
+        if has_compact_model(compact_dir):
+            try:
+                signature = self.artifact_signature(os.path.join(compact_dir, 'manifiesto.json'))
+                model_data = self.load_compact_model(compact_dir)
+                model_data['signature'] = signature
+                return model_data
+            except Exception as e:
+                self.logger.warning(f"Artefacto compacto inválido ({e}), usando el pickle")
+        
+        model_path = os.path.join(model_dir, 'modelo_entrenado.pkl')
+        if not os.path.exists(model_path):
+            raise FileNotFoundError("Modelo no encontrado. Ejecuta train_model.py primero")
+        signature = self.artifact_signature(model_path)
+        model_data = self.load_trained_model(model_path)
+        model_data['signature'] = signature
+        return model_data
+    
+    def inference_signature(self, model_dir=None):
+        """Firma del artefacto que cargaría load_inference_model, sin cargarlo"""
+        model_dir = self.resolve_model_dir(model_dir)
+        compact_dir = os.path.join(model_dir, 'compacto')
+        if has_compact_model(compact_dir):
+            return self.artifact_signature(os.path.join(compact_dir, 'manifiesto.json'))
+        model_path = os.path.join(model_dir, 'modelo_entrenado.pkl')
+        if not os.path.exists(model_path):
+            raise FileNotFoundError("Modelo no encontrado. Ejecuta train_model.py primero")
+        return self.artifact_signature(model_path)
+    
+    def artifact_signature(self, path):
+        """Firma del archivo de un artefacto: cambia si se reescribe el modelo"""
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
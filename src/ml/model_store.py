@@ -0,0 +1,165 @@
+"""Almacén versionado de modelos.
+
+Cada entrenamiento escribe en un directorio temporal propio y al terminar lo
+publica como `models/versiones/<versión>/` con un rename. La versión en uso
+la indica `models/actual.txt`, que se reemplaza de forma atómica
+(`os.replace`), así que quien lee el puntero ve la versión anterior o la
+nueva, nunca archivos a medio escribir. Un directorio publicado no se
+modifica más: volver a una versión anterior es solo cambiar el puntero.
+
+Sin puntero (instalaciones anteriores) se usa `models/current`.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from src.data.data_manager import DataManager
+from src.utils.logger import get_logger
+
+MODELS_ROOT = 'models'
+LEGACY_DIR = 'current'
+VERSIONS_DIR = 'versiones'
+POINTER_FILE = 'actual.txt'
+VERSION_FILE = 'version_actual.txt'
+STAGING_PREFIX = '.tmp-'
+
+
+class ModelStore:
+    def __init__(self, root=MODELS_ROOT, retention=None):
+        self.logger = get_logger()
+        self.root = root
+        self.versions_dir = os.path.join(root, VERSIONS_DIR)
+        self.pointer_path = os.path.join(root, POINTER_FILE)
+        if retention is None:
+            params = DataManager().load_json('config/parametros.json').get('almacen_modelos', {})
+            retention = params.get('versiones_retenidas', 5)
+        # La versión actual siempre se conserva, aunque la retención sea menor
+        self.retention = max(1, retention)
+
+    def current_version(self):
+        """Versión a la que apunta el puntero (None si no hay puntero)"""
+        try:
+            with open(self.pointer_path, 'r', encoding='utf-8') as f:
+                version = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def resolve(self):
+        """Directorio del modelo en uso; leer el puntero una vez y cargar todo desde ahí"""
+        version = self.current_version()
+        if version is not None:
+            model_dir = os.path.join(self.versions_dir, version)
+            if os.path.isdir(model_dir):
+                return model_dir
+            self.logger.warning(f"El puntero indica la versión {version}, que no existe; usando el modelo anterior")
+        return os.path.join(self.root, LEGACY_DIR)
+
+    def list_versions(self):
+        """Versiones publicadas, de la más antigua a la más reciente"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith(STAGING_PREFIX) and os.path.isdir(os.path.join(self.versions_dir, name))
+        )
+
+    def create_staging(self):
+        """Directorio temporal donde el entrenamiento escribe la versión nueva"""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        # Mismo sistema de archivos que las versiones: publicar es un rename
+        return tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.versions_dir)
+
+    def discard_staging(self, staging_dir):
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def publish(self, staging_dir, version=None):
+        """Publica el directorio temporal como versión nueva y mueve el puntero a ella"""
+        version = version or self._new_version_name()
+        with open(os.path.join(staging_dir, VERSION_FILE), 'w', encoding='utf-8') as f:
+            f.write(version)
+        final_dir = os.path.join(self.versions_dir, version)
+        os.rename(staging_dir, final_dir)
+
+        self._write_pointer(version)
+        self.logger.info(f"Modelo publicado: versión {version}")
+        self.apply_retention()
+        return version
+
+    def rollback(self, version=None):
+        """Apunta a `version` o, sin argumento, a la versión publicada antes de la actual"""
+        versions = self.list_versions()
+        if version is None:
+            current = self.current_version()
+            if current not in versions:
+                raise ValueError("No hay una versión actual desde la cual volver atrás")
+            index = versions.index(current)
+            if index == 0:
+                raise ValueError(f"La versión {current} es la más antigua, no hay anterior")
+            version = versions[index - 1]
+        elif version not in versions:
+            raise ValueError(f"Versión inexistente: {version}")
+
+        self._write_pointer(version)
+        self.logger.info(f"Modelo revertido a la versión {version}")
+        return version
+
+    def apply_retention(self):
+        """Borra las versiones más antiguas fuera de la retención (nunca la actual)"""
+        current = self.current_version()
+        versions = self.list_versions()
+        keep = set(versions[-self.retention:])
+        keep.add(current)
+        for version in versions:
+            if version in keep:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.versions_dir, version))
+                self.logger.info(f"Versión de modelo eliminada por retención: {version}")
+            except OSError as e:
+                # En Windows un lector puede tener archivos abiertos; se reintenta en la próxima publicación
+                self.logger.warning(f"No se pudo eliminar la versión {version}: {e}")
+
+    def _write_pointer(self, version):
+        tmp_path = f"{self.pointer_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.pointer_path)
+
+    def _new_version_name(self):
+        # Ordenable por fecha; el sufijo evita choques dentro del mismo segundo
+        base = datetime.now().strftime('%Y%m%d-%H%M%S')
+        existing = set(self.list_versions())
+        version, suffix = base, 1
+        while version in existing:
+            suffix += 1
+            version = f"{base}-{suffix:02d}"
+        return version
+
+
+def main():
+    # Lista las versiones (la actual con *) o revierte:
+    #   python -m src.ml.model_store [--revertir [VERSION]]
+    parser = argparse.ArgumentParser(description="Versiones del modelo entrenado")
+    parser.add_argument('--revertir', nargs='?', const='', metavar='VERSION',
+                        help="Vuelve a VERSION o, sin valor, a la versión anterior")
+    args = parser.parse_args()
+
+    store = ModelStore()
+    if args.revertir is not None:
+        version = store.rollback(args.revertir or None)
+        print(f"Versión actual: {version}")
+        return
+
+    current = store.current_version()
+    for version in store.list_versions():
+        print(f"{'*' if version == current else ' '} {version}")
+    if current is None:
+        print(f"(sin versiones publicadas: se usa {store.resolve()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,101 @@
 import re
-import nltk
-from nltk.corpus import stopwords
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
 from src.utils.logger import get_logger
 
+# Patrón precompilado: eliminar caracteres especiales pero mantener letras y acentos
+NON_LETTER_PATTERN = re.compile(r'[^a-zA-Záéíóúñü\s]')
+
+# Lista de stopwords en español incluida con el proyecto (misma lista que nltk)
+STOPWORDS_FILE = Path(__file__).parent.parent.parent / 'config' / 'stopwords_es.txt'
+
+# Stopwords compartidas por todas las instancias, una entrada por fuente
+_stopwords_by_source = {}
+_stopwords_lock = threading.Lock()
+
+def _load_bundled_stopwords():
+    with open(STOPWORDS_FILE, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def _load_nltk_stopwords():
+    # nltk es opcional: solo se importa si se pide explícitamente su lista
+    import nltk
+    from nltk.corpus import stopwords
+    
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+    
+    return stopwords.words('spanish')
+
+def get_stopwords(source='incluidas'):
+    """Stopwords en español compartidas (se cargan una sola vez por proceso)"""
+    with _stopwords_lock:
+        if source not in _stopwords_by_source:
+            if source == 'nltk':
+                words = _load_nltk_stopwords()
+            elif source == 'incluidas':
+                words = _load_bundled_stopwords()
+            else:
+                raise ValueError(f"Fuente de stopwords desconocida: {source}")
+            _stopwords_by_source[source] = frozenset(words)
+        return _stopwords_by_source[source]
+
+# Stopwords de cada proceso del pool de limpieza en bloque
+_worker_stop_words = frozenset()
+
+def _clean(text, stop_words):
+    """Limpieza de un texto (sin caché), compartida por el modo normal y el pool"""
+    # Convertir a minúsculas y eliminar caracteres especiales
+    text = NON_LETTER_PATTERN.sub(' ', text.lower())
+    
+    # Eliminar stopwords (split también elimina los espacios extras)
+    return ' '.join(word for word in text.split() if word not in stop_words and len(word) > 2)
+
+def _init_clean_worker(stop_words):
+    global _worker_stop_words
+    _worker_stop_words = stop_words
+
+def _clean_chunk(texts):
+    return [_clean(text, _worker_stop_words) if isinstance(text, str) else "" for text in texts]
+
 class TextPreprocessor:
-    def __init__(self):
+    DEFAULT_CACHE_SIZE = 4096
+    # Por debajo de este tamaño el pool de procesos no compensa
+    PARALLEL_THRESHOLD = 20000
+    
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, stopwords_source='incluidas'):
         self.logger = get_logger()
+        self.stopwords_source = stopwords_source
         self.stop_words = self._setup_stopwords()
+        self.cache_size = cache_size
+        self._setup_cache()
+    
+    def _setup_cache(self):
+        """Caché LRU acotada de textos ya limpiados, indexada por el texto original"""
+        self._cached_clean = lru_cache(maxsize=self.cache_size)(self._clean_uncached)
+    
+    def __getstate__(self):
+        # La caché no se serializa junto con el modelo
+        state = self.__dict__.copy()
+        state.pop('_cached_clean', None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache_size = state.get('cache_size', self.DEFAULT_CACHE_SIZE)
+        self._setup_cache()
     
     def _setup_stopwords(self):
         """Configura las stopwords en español"""
         try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-        
-        return set(stopwords.words('spanish'))
+            return get_stopwords(self.stopwords_source)
+        except Exception as e:
+            self.logger.warning(f"Error cargando stopwords '{self.stopwords_source}': {e}, usando la lista incluida")
+            return get_stopwords('incluidas')
     
     def clean_text(self, text):
         """Limpia y preprocesa el texto para análisis"""
@@ -23,21 +103,36 @@ class TextPreprocessor:
             return ""
         
         try:
-            # Convertir a minúsculas
-            text = text.lower()
-            
-            # Eliminar caracteres especiales pero mantener letras y acentos
-            text = re.sub(r'[^a-zA-Záéíóúñü\s]', ' ', text)
-            
-            # Eliminar espacios extras
-            text = re.sub(r'\s+', ' ', text).strip()
-            
-            # Eliminar stopwords
-            words = text.split()
-            words = [word for word in words if word not in self.stop_words and len(word) > 2]
-            
-            return ' '.join(words)
+            return self._cached_clean(text)
             
         except Exception as e:
             self.logger.error(f"Error limpiando texto: {e}")
-            return text.lower() if isinstance(text, str) else ""
\ No newline at end of file
+            return text.lower() if isinstance(text, str) else ""
+    
+    def _clean_uncached(self, text):
+        return _clean(text, self.stop_words)
+    
+    def clean_many(self, texts, n_jobs=None, chunk_size=2000):
+        """Limpia una lista de textos; con n_jobs > 1 reparte corpus grandes en procesos"""
+        texts = list(texts)
+        
+        if not n_jobs or n_jobs <= 1 or len(texts) < self.PARALLEL_THRESHOLD:
+            return [self.clean_text(text) for text in texts]
+        
+        try:
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_clean_worker,
+                                     initargs=(self.stop_words,)) as executor:
+                cleaned = []
+                for chunk_result in executor.map(_clean_chunk, chunks):
+                    cleaned.extend(chunk_result)
+            self.logger.info(f"Limpieza en bloque: {len(texts)} textos en {n_jobs} procesos")
+            return cleaned
+            
+        except Exception as e:
+            self.logger.error(f"Error en limpieza paralela: {e}, limpiando en un solo proceso")
+            return [self.clean_text(text) for text in texts]
+    
+    def cache_info(self):
+        """Estadísticas de la caché de limpieza (hits, misses, tamaño)"""
+        return self._cached_clean.cache_info()
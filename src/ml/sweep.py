@@ -0,0 +1,199 @@
+"""Barrido de hiperparámetros: valores de k y configuraciones del vectorizador.
+
+El corpus se lee y limpia una sola vez y se construye una sola matriz TF-IDF
+por configuración de vectorizador. Cada combinación (vectorizador, k) se
+entrena en un pool de procesos; los procesos leen la matriz desde un .npz
+temporal en lugar de recibirla serializada en cada tarea.
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from sklearn.cluster import KMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+from .evaluation import ClusteringEvaluator
+from .unsupervised_trainer import UnsupervisedTrainer
+from src.data.data_manager import DataManager
+from src.utils.logger import get_logger
+
+REPORT_PATH = 'data/history/barrido_modelos.json'
+
+# Matrices ya leídas en cada proceso de trabajo (ruta -> matriz)
+_worker_matrices = {}
+
+
+def _init_worker(threads_per_worker):
+    # Evitar que cada proceso use todos los núcleos con OpenMP/BLAS
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=threads_per_worker)
+    except ImportError:
+        pass
+
+
+def _fit_candidate(matrix_path, vectorizer_index, n_clusters, n_init, max_iter, evaluation_params):
+    """Entrena y evalúa una combinación; se ejecuta en un proceso del pool"""
+    from scipy.sparse import load_npz
+
+    X = _worker_matrices.get(matrix_path)
+    if X is None:
+        X = _worker_matrices[matrix_path] = load_npz(matrix_path)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=n_init, max_iter=max_iter)
+    clusters = kmeans.fit_predict(X)
+    fit_time = time.perf_counter() - start
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    metrics = ClusteringEvaluator.from_params(evaluation_params).evaluate(X, clusters)
+    return {
+        'vectorizador': vectorizer_index,
+        'n_clusters': n_clusters,
+        'silhouette_score': metrics.pop('silhouette_score'),
+        'inertia': round(float(kmeans.inertia_), 2),
+        'tiempo_ajuste_s': round(fit_time, 3),
+        'memoria_pico_mb': round(peak_bytes / (1024 * 1024), 2),
+        **metrics
+    }
+
+
+def _rank_key(result):
+    # Mayor silhouette primero; sin silhouette al final; a igualdad, menor inercia
+    silhouette = result.get('silhouette_score')
+    return (silhouette is None, -(silhouette or 0.0), result['inertia'])
+
+
+class HyperparameterSweep:
+    def __init__(self, k_values=None, vectorizer_grid=None, n_jobs=None, data_path=None):
+        self.logger = get_logger()
+        self.data_manager = DataManager()
+
+        params = self.data_manager.load_json('config/parametros.json')
+        sweep_params = params.get('barrido', {})
+        self.evaluation_params = params.get('evaluacion', {})
+        self.k_values = sorted(set(k_values or sweep_params.get('k', [10, 20, 30])))
+        self.vectorizer_grid = vectorizer_grid or sweep_params.get('vectorizadores') or [{}]
+        self.n_jobs = n_jobs or sweep_params.get('procesos') or os.cpu_count() or 1
+        self.n_init = sweep_params.get('n_init', 10)
+        self.max_iter = sweep_params.get('max_iter', 300)
+
+        trainer_kwargs = {'mode': 'completo', 'vectorizer_type': 'tfidf'}
+        if data_path:
+            trainer_kwargs['data_path'] = data_path
+        self.trainer = UnsupervisedTrainer(**trainer_kwargs)
+
+    def run(self, promote=False):
+        """Ejecuta el barrido, guarda el reporte y opcionalmente promueve la mejor configuración"""
+        started = time.perf_counter()
+
+        # Leer y limpiar el corpus una sola vez para todas las configuraciones
+        self.logger.info("Barrido: preprocesando corpus...")
+        cleaned_texts = [text for chunk in self.trainer.iter_training_chunks() for text in chunk]
+
+        vectorizer_configs = [self.trainer.resolve_vectorizer_params(self.trainer.vectorizer_params, config)
+                              for config in self.vectorizer_grid]
+        max_k = min(max(self.k_values), len(cleaned_texts) - 1)
+        k_values = [k for k in self.k_values if 2 <= k <= max_k]
+        if not k_values:
+            raise ValueError(f"Ningún valor de k válido para {len(cleaned_texts)} textos")
+
+        with tempfile.TemporaryDirectory(prefix='barrido_') as tmp_dir:
+            from scipy.sparse import save_npz
+
+            # Una matriz TF-IDF por configuración del vectorizador
+            vectorizers, matrices, matrix_paths = [], [], []
+            for index, config in enumerate(vectorizer_configs):
+                vectorizer = TfidfVectorizer(**config)
+                X = vectorizer.fit_transform(cleaned_texts)
+                path = os.path.join(tmp_dir, f"tfidf_{index}.npz")
+                save_npz(path, X, compressed=False)
+                vectorizers.append(vectorizer)
+                matrices.append(X)
+                matrix_paths.append(path)
+                self.logger.info(f"Barrido: vectorizador {index} {config} -> {X.shape[1]} features")
+
+            tasks = [(index, k) for index in range(len(vectorizer_configs)) for k in k_values]
+            workers = max(1, min(self.n_jobs, len(tasks)))
+            threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+            self.logger.info(f"Barrido: {len(tasks)} combinaciones en {workers} procesos")
+
+            results = []
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(threads_per_worker,)) as executor:
+                futures = {
+                    executor.submit(_fit_candidate, matrix_paths[index], index, k,
+                                    self.n_init, self.max_iter, self.evaluation_params): (index, k)
+                    for index, k in tasks
+                }
+                for future in as_completed(futures):
+                    index, k = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Barrido: falló vectorizador {index}, k={k}: {e}")
+                        continue
+                    result['n_features'] = matrices[index].shape[1]
+                    results.append(result)
+                    self.logger.info(f"Barrido: vectorizador {index}, k={k} -> silhouette "
+                                     f"{result['silhouette_score']}, {result['tiempo_ajuste_s']}s")
+
+            if not results:
+                raise RuntimeError("Ninguna combinación del barrido terminó correctamente")
+
+            results.sort(key=_rank_key)
+            for rank, result in enumerate(results, start=1):
+                result['posicion'] = rank
+
+            report = {
+                'fecha': datetime.now().isoformat(),
+                'n_textos': len(cleaned_texts),
+                'procesos': workers,
+                'tiempo_total_s': round(time.perf_counter() - started, 2),
+                'vectorizadores': [self._serializable(config) for config in vectorizer_configs],
+                'resultados': results,
+                'promovido': None
+            }
+
+            if promote:
+                best = results[0]
+                report['promovido'] = {'vectorizador': best['vectorizador'], 'n_clusters': best['n_clusters']}
+                self._promote(best, vectorizer_configs[best['vectorizador']],
+                              vectorizers[best['vectorizador']], matrices[best['vectorizador']])
+
+        self.data_manager.save_json(report, REPORT_PATH)
+        return report
+
+    def _promote(self, best, vectorizer_config, vectorizer, X):
+        """Entrena la mejor configuración con el flujo normal y la publica como versión actual"""
+        self.logger.info(f"Barrido: promoviendo k={best['n_clusters']} con {vectorizer_config}")
+        trainer = UnsupervisedTrainer(n_clusters=best['n_clusters'], mode='completo', vectorizer_type='tfidf',
+                                      vectorizer_params=vectorizer_config, data_path=self.trainer.data_path)
+        # Reutilizar el vectorizador y la matriz del barrido
+        trainer.vectorizer = vectorizer
+        cluster_emotions, evaluation = trainer.fit_matrix(X)
+        trainer.save_model(cluster_emotions, evaluation)
+
+    @staticmethod
+    def _serializable(config):
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in config.items()}
+
+
+def format_report(report, top=None):
+    """Tabla de texto con los resultados ordenados"""
+    lines = [
+        f"{'#':>3} {'Vect':>5} {'k':>4} {'Silhouette':>11} {'Inercia':>11} {'Ajuste (s)':>11} {'Memoria (MB)':>13}"
+    ]
+    for result in report['resultados'][:top]:
+        silhouette = f"{result['silhouette_score']:.4f}" if result['silhouette_score'] is not None else 'n/d'
+        lines.append(
+            f"{result['posicion']:>3} {result['vectorizador']:>5} {result['n_clusters']:>4} {silhouette:>11} "
+            f"{result['inertia']:>11.2f} {result['tiempo_ajuste_s']:>11.3f} {result['memoria_pico_mb']:>13.2f}"
+        )
+    lines.append("Vectorizadores:")
+    for index, config in enumerate(report['vectorizadores']):
+        lines.append(f"  {index}: {config}")
+    return "\n".join(lines)
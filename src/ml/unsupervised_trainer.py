@@ -1,34 +1,105 @@
-import pandas as pd
+import os
+import shutil
 import joblib
 import numpy as np
-from sklearn.cluster import KMeans
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics import silhouette_score
 from sklearn.decomposition import PCA
+from .compact_model import export_compact_model
+from .evaluation import ClusteringEvaluator
+from .hashing_vectorizer import HashingTfidfVectorizer
+from .model_store import ModelStore
 from .preprocessor import TextPreprocessor
 from src.data.data_manager import DataManager
 from src.utils.logger import get_logger
 
+TRAINING_DATA_PATH = 'data/training/textos_sin_etiquetar.csv'
+TRAINING_MODES = ('completo', 'minibatch')
+VECTORIZER_TYPES = ('tfidf', 'hashing')
+
+# CSV a partir del cual se avisa que el modo completo carga todo el corpus en memoria
+LARGE_CORPUS_BYTES = 100 * 1024 * 1024
+
+# Parámetros del vectorizador; se pueden sobrescribir en parametros.json -> "vectorizador"
+DEFAULT_VECTORIZER_PARAMS = {
+    'max_features': 2000,
+    'ngram_range': (1, 2),
+    'min_df': 2,
+    'max_df': 0.9,
+    'sublinear_tf': True
+}
+
+# Datos de ejemplo si no hay archivo de entrenamiento
+SAMPLE_TEXTS = [
+    "Estoy muy feliz y contento hoy",
+    "Me siento terrible y mal",
+    "Es un día normal y regular",
+    "Qué enojo tengo ahora mismo",
+    "Increíble maravilloso día",
+    "Horrible situación deprimente",
+    "Todo bien sin problemas",
+    "Furioso indignado molesto"
+]
+
 class UnsupervisedTrainer:
-    def __init__(self, n_clusters=None):
+    def __init__(self, n_clusters=None, mode=None, data_path=TRAINING_DATA_PATH, vectorizer_type=None,
+                 vectorizer_params=None):
         self.logger = get_logger()
         self.data_manager = DataManager()
         
         # Cargar número de clusters desde parámetros si no se especifica
+        params = self.data_manager.load_json('config/parametros.json')
         if n_clusters is None:
-            params = self.data_manager.load_json('config/parametros.json')
             n_clusters = params.get('modelo', {}).get('n_clusters', 30)
         
+        # 'completo': KMeans sobre toda la matriz; 'minibatch': MiniBatchKMeans por bloques
+        if mode is None:
+            mode = params.get('modelo', {}).get('modo_entrenamiento', 'completo')
+        if mode not in TRAINING_MODES:
+            raise ValueError(f"Modo de entrenamiento inválido: {mode}")
+        
         self.n_clusters = n_clusters
+        self.mode = mode
+        self.data_path = data_path
+        self.clean_jobs = params.get('preprocesamiento', {}).get('procesos_limpieza', 1)
+        self.chunk_size = params.get('preprocesamiento', {}).get('tamano_bloque_lectura', 10000)
+        self.minibatch_params = params.get('minibatch', {})
         self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10, max_iter=300)
-        self.vectorizer = TfidfVectorizer(max_features=2000, ngram_range=(1, 2), min_df=2, max_df=0.9, sublinear_tf=True)
+        
+        # 'tfidf': vocabulario ajustado al corpus; 'hashing': sin vocabulario, una sola pasada
+        vectorizer_config = params.get('vectorizador', {})
+        self.vectorizer_type = vectorizer_type or vectorizer_config.get('tipo', 'tfidf')
+        if self.vectorizer_type not in VECTORIZER_TYPES:
+            raise ValueError(f"Tipo de vectorizador inválido: {self.vectorizer_type}")
+        self.vectorizer_params = self.resolve_vectorizer_params(vectorizer_config, vectorizer_params)
+        if self.vectorizer_type == 'hashing':
+            # Con hashing la dimensión la fija n_features, no max_features
+            hashing_params = {key: value for key, value in self.vectorizer_params.items() if key != 'max_features'}
+            self.vectorizer = HashingTfidfVectorizer(
+                n_features=vectorizer_config.get('n_features_hashing', 2 ** 16),
+                **hashing_params
+            )
+        else:
+            self.vectorizer = TfidfVectorizer(**self.vectorizer_params)
         self.preprocessor = TextPreprocessor()
+        self.evaluator = ClusteringEvaluator.from_params(params.get('evaluacion', {}))
         
+    @staticmethod
+    def resolve_vectorizer_params(config=None, overrides=None):
+        """Parámetros del vectorizador: por defecto, luego parametros.json y luego `overrides`"""
+        resolved = dict(DEFAULT_VECTORIZER_PARAMS)
+        for source in (config or {}, overrides or {}):
+            for key in DEFAULT_VECTORIZER_PARAMS:
+                if key in source:
+                    resolved[key] = source[key]
+        resolved['ngram_range'] = tuple(resolved['ngram_range'])
+        return resolved
+    
     def load_training_data(self):
         """Carga datos sin etiquetas para aprendizaje no supervisado"""
         try:
             # Cargar textos sin etiquetar
-            base_data = self.data_manager.load_csv('data/training/textos_sin_etiquetar.csv')
+            base_data = self.data_manager.load_csv(self.data_path)
             if base_data.empty:
                 raise ValueError("No se encontraron datos de entrenamiento")
             
@@ -38,32 +109,56 @@ class UnsupervisedTrainer:
         except Exception as e:
             self.logger.error(f"Error cargando datos: {e}")
             # Datos de ejemplo si no hay archivo
-            return [
-                "Estoy muy feliz y contento hoy",
-                "Me siento terrible y mal",
-                "Es un día normal y regular",
-                "Qué enojo tengo ahora mismo",
-                "Increíble maravilloso día",
-                "Horrible situación deprimente",
-                "Todo bien sin problemas",
-                "Furioso indignado molesto"
-            ]
+            return list(SAMPLE_TEXTS)
+    
+    def iter_training_chunks(self, chunk_size=None, data_path=None):
+        """Lee el CSV por bloques y devuelve cada bloque ya preprocesado (generador)
+
+        Solo un bloque de textos crudos y limpios está en memoria a la vez.
+        """
+        import pandas as pd
+        chunk_size = chunk_size or self.chunk_size
+        try:
+            reader = pd.read_csv(data_path or self.data_path, usecols=['texto'], chunksize=chunk_size)
+        except Exception as e:
+            self.logger.error(f"Error cargando datos: {e}")
+            yield self.preprocessor.clean_many(SAMPLE_TEXTS, n_jobs=self.clean_jobs)
+            return
+        
+        n_texts = 0
+        with reader:
+            for chunk in reader:
+                texts = chunk['texto'].dropna().astype(str).tolist()
+                if texts:
+                    n_texts += len(texts)
+                    yield self.preprocessor.clean_many(texts, n_jobs=self.clean_jobs)
+        self.logger.info(f"Leídos {n_texts} textos para entrenamiento")
     
     def train(self):
         """Entrena el modelo K-means no supervisado"""
-        self.logger.info("Iniciando entrenamiento NO SUPERVISADO con K-means")
+        cluster_emotions, evaluation = self.fit()
         
-        # Cargar datos
-        texts = self.load_training_data()
+        # Guardar modelo
+        self.save_model(cluster_emotions, evaluation)
         
-        # Preprocesar
-        self.logger.info("Preprocesando textos...")
-        cleaned_texts = [self.preprocessor.clean_text(text) for text in texts]
+        return evaluation
+    
+    def fit(self):
+        """Ajusta vectorizador y clusters sin guardar nada; devuelve (cluster_emotions, evaluación)"""
+        if self.mode == 'minibatch':
+            return self._fit_minibatch()
         
-        # Vectorizar con TF-IDF
-        self.logger.info("Vectorizando con TF-IDF...")
-        X = self.vectorizer.fit_transform(cleaned_texts)
+        self.logger.info("Iniciando entrenamiento NO SUPERVISADO con K-means")
+        self._warn_if_large_corpus()
         
+        # Cargar, preprocesar y vectorizar por bloques
+        self.logger.info("Preprocesando y vectorizando textos...")
+        X = self._vectorize_corpus()
+        
+        return self.fit_matrix(X)
+    
+    def fit_matrix(self, X):
+        """Ajusta K-means sobre una matriz ya vectorizada (con self.vectorizer ya ajustado)"""
         # Entrenar K-means
         self.logger.info(f"Entrenando K-means con {self.n_clusters} clusters...")
         self.kmeans.fit(X)
@@ -75,11 +170,177 @@ class UnsupervisedTrainer:
         
         # Evaluar modelo
         evaluation = self.evaluate_model(X, clusters)
+        evaluation['modo'] = self.mode
+        evaluation['vectorizador'] = self.vectorizer_type
         
-        # Guardar modelo
-        self.save_model(cluster_emotions, evaluation)
+        return cluster_emotions, evaluation
+    
+    def _warn_if_large_corpus(self):
+        try:
+            size = os.path.getsize(self.data_path)
+        except OSError:
+            return
+        if size >= LARGE_CORPUS_BYTES:
+            self.logger.warning(
+                f"Modo 'completo' con un CSV de {size / (1024 * 1024):.0f} MB: la matriz de todo el "
+                "corpus queda en memoria. Para memoria acotada por bloque usar "
+                "modo_entrenamiento 'minibatch'"
+            )
+
+    def _vectorize_corpus(self):
+        """Matriz TF-IDF de todo el corpus sin cargar antes los textos crudos completos
+
+        Solo evita tener a la vez los textos crudos y los limpios: la matriz (y,
+        con TF-IDF, la lista de textos limpios) sigue siendo del corpus completo.
+        La memoria acotada por bloque es solo del modo 'minibatch'.
+        """
+        if self.vectorizer_type == 'hashing':
+            # Una sola pasada: conteos e IDF se acumulan bloque a bloque
+            from scipy.sparse import vstack
+            counts = vstack([self.vectorizer.partial_fit(chunk) for chunk in self.iter_training_chunks()], format='csr')
+            self.vectorizer.finalize()
+            return self.vectorizer.tfidf_from_counts(counts)
         
-        return evaluation
+        # El vocabulario necesita todos los textos limpios; los crudos no se guardan
+        cleaned_texts = [text for chunk in self.iter_training_chunks() for text in chunk]
+        return self.vectorizer.fit_transform(cleaned_texts)
+    
+    def _spill_chunks(self, spill_dir):
+        """Vectoriza cada bloque y lo guarda en disco; devuelve (rutas, número de textos)
+        
+        Con TF-IDF hace falta una pasada previa para el vocabulario. Con hashing
+        los conteos se guardan en la misma pasada que acumula el IDF, y se
+        convierten a TF-IDF al leerlos (`_load_chunk`).
+        """
+        from scipy.sparse import save_npz
+        
+        if self.vectorizer_type == 'tfidf':
+            self.logger.info("Construyendo vocabulario TF-IDF...")
+            self.vectorizer.fit(text for chunk in self.iter_training_chunks() for text in chunk)
+        
+        self.logger.info("Vectorizando bloques...")
+        chunk_paths = []
+        n_samples = 0
+        for cleaned_chunk in self.iter_training_chunks():
+            if self.vectorizer_type == 'hashing':
+                matrix = self.vectorizer.partial_fit(cleaned_chunk)
+            else:
+                matrix = self.vectorizer.transform(cleaned_chunk)
+            path = os.path.join(spill_dir, f"bloque_{len(chunk_paths):06d}.npz")
+            save_npz(path, matrix, compressed=False)
+            chunk_paths.append(path)
+            n_samples += len(cleaned_chunk)
+        
+        if self.vectorizer_type == 'hashing' and n_samples:
+            self.vectorizer.finalize()
+        return chunk_paths, n_samples
+    
+    def _load_chunk(self, path):
+        from scipy.sparse import load_npz
+        matrix = load_npz(path)
+        if self.vectorizer_type == 'hashing':
+            return self.vectorizer.tfidf_from_counts(matrix)
+        return matrix
+    
+    def _fit_minibatch(self):
+        """Entrenamiento por bloques con MiniBatchKMeans.partial_fit.
+        
+        El corpus nunca se carga completo: cada bloque se vectoriza una vez y
+        queda en disco (matriz sparse .npz), y luego cada época recorre esos
+        bloques en minilotes hasta que los centroides dejan de moverse. La
+        última pasada asigna los clusters y toma la muestra para evaluar.
+        """
+        import tempfile
+        from scipy.sparse import vstack
+        
+        params = self.minibatch_params
+        batch_size = params.get('tamano_lote', 1024)
+        max_epochs = params.get('max_epocas', 10)
+        tolerance = params.get('tolerancia', 1e-3)
+        eval_sample_size = params.get('muestra_evaluacion', 5000)
+        
+        # El primer minilote inicializa los centroides: necesita al menos n_clusters textos
+        batch_size = max(batch_size, self.n_clusters)
+        
+        self.logger.info(f"Iniciando entrenamiento NO SUPERVISADO con MiniBatchKMeans (bloques de {self.chunk_size})")
+        
+        with tempfile.TemporaryDirectory(prefix='bloques_tfidf_') as spill_dir:
+            chunk_paths, n_samples = self._spill_chunks(spill_dir)
+            
+            if n_samples < self.n_clusters:
+                raise ValueError(f"Se necesitan al menos {self.n_clusters} textos, hay {n_samples}")
+            
+            self.kmeans = MiniBatchKMeans(
+                n_clusters=self.n_clusters,
+                random_state=42,
+                batch_size=batch_size,
+                n_init=3
+            )
+            
+            # Épocas de partial_fit hasta que el desplazamiento relativo de los centroides sea pequeño
+            epochs = 0
+            for epoch in range(1, max_epochs + 1):
+                previous_centers = self.kmeans.cluster_centers_.copy() if epoch > 1 else None
+                pending = None
+                for path in chunk_paths:
+                    X_chunk = self._load_chunk(path)
+                    if pending is not None:
+                        X_chunk = vstack([pending, X_chunk], format='csr')
+                        pending = None
+                    start = 0
+                    while X_chunk.shape[0] - start >= batch_size:
+                        self.kmeans.partial_fit(X_chunk[start:start + batch_size])
+                        start += batch_size
+                    if start < X_chunk.shape[0]:
+                        pending = X_chunk[start:]
+                # Resto de la época que no completó un minilote
+                if pending is not None and (hasattr(self.kmeans, 'cluster_centers_')
+                                            or pending.shape[0] >= self.n_clusters):
+                    self.kmeans.partial_fit(pending)
+                epochs = epoch
+                
+                if previous_centers is not None:
+                    shift = np.linalg.norm(self.kmeans.cluster_centers_ - previous_centers)
+                    relative_shift = shift / max(np.linalg.norm(previous_centers), 1e-12)
+                    self.logger.info(f"Época {epoch}: desplazamiento relativo de centroides {relative_shift:.6f}")
+                    if relative_shift < tolerance:
+                        self.logger.info(f"Convergencia alcanzada en la época {epoch}")
+                        break
+            
+            # Pasada final: clusters, inercia total y muestra uniforme para la evaluación
+            self.logger.info("Asignando clusters...")
+            rng = np.random.default_rng(42)
+            sample_probability = min(1.0, eval_sample_size / n_samples)
+            labels, sample_rows, sample_labels = [], [], []
+            inertia = 0.0
+            for path in chunk_paths:
+                X_chunk = self._load_chunk(path)
+                distances = self.kmeans.transform(X_chunk)
+                chunk_labels = distances.argmin(axis=1)
+                inertia += float((distances[np.arange(len(chunk_labels)), chunk_labels] ** 2).sum())
+                labels.append(chunk_labels.astype(np.int32))
+                
+                keep = rng.random(X_chunk.shape[0]) < sample_probability
+                if keep.any():
+                    sample_rows.append(X_chunk[keep])
+                    sample_labels.append(chunk_labels[keep])
+        
+        clusters = np.concatenate(labels)
+        
+        self.logger.info("Interpretando clusters...")
+        cluster_emotions = self.interpret_clusters(None, clusters)
+        
+        evaluation = self.evaluate_model(
+            vstack(sample_rows, format='csr'),
+            np.concatenate(sample_labels),
+            inertia=inertia,
+            n_samples=n_samples
+        )
+        evaluation['modo'] = self.mode
+        evaluation['vectorizador'] = self.vectorizer_type
+        evaluation['epocas'] = epochs
+        
+        return cluster_emotions, evaluation
     
     def interpret_clusters(self, X, clusters):
         """Asigna nombres automáticos a los clusters (completamente no supervisado)"""
@@ -87,9 +348,8 @@ class UnsupervisedTrainer:
             cluster_emotions = {}
             features = self.vectorizer.get_feature_names_out()
             
-            # Obtener textos originales para análisis
-            texts = self.load_training_data()
-            cleaned_texts = [self.preprocessor.clean_text(text) for text in texts]
+            # Tamaño de cada cluster a partir de las etiquetas (no hace falta releer los textos)
+            cluster_sizes = np.bincount(np.asarray(clusters, dtype=np.int64), minlength=self.n_clusters)
             
             for cluster_id in range(self.n_clusters):
                 # Obtener palabras más importantes del centroide
@@ -97,9 +357,6 @@ class UnsupervisedTrainer:
                 top_indices = center.argsort()[-10:][::-1]
                 top_words = [features[i] for i in top_indices]
                 
-                # Obtener textos que pertenecen a este cluster
-                cluster_texts = [cleaned_texts[i] for i, c in enumerate(clusters) if c == cluster_id]
-                
                 # Asignar nombre automático: "emoción_{cluster_id}"
                 # Esto es completamente no supervisado - no usa palabras clave
                 assigned_emotion = f"emoción_{cluster_id}"
@@ -107,7 +364,7 @@ class UnsupervisedTrainer:
                 
                 self.logger.info(f"Cluster {cluster_id}: {assigned_emotion}")
                 self.logger.info(f"  Palabras características: {', '.join(top_words[:5])}")
-                self.logger.info(f"  Textos en cluster: {len(cluster_texts)}")
+                self.logger.info(f"  Textos en cluster: {cluster_sizes[cluster_id]}")
             
             return cluster_emotions
             
@@ -118,21 +375,30 @@ class UnsupervisedTrainer:
             # Asignación automática por defecto
             return {i: f"emoción_{i}" for i in range(self.n_clusters)}
     
-    def evaluate_model(self, X, clusters):
-        """Evalúa la calidad del clustering"""
+    def evaluate_model(self, X, clusters, inertia=None, n_samples=None):
+        """Evalúa la calidad del clustering con la estrategia de parametros.json
+        
+        En el modo por bloques `X` es solo una muestra; la inercia y el número
+        de muestras del corpus completo llegan aparte.
+        """
         try:
-            silhouette_avg = silhouette_score(X, clusters)
-            inertia = self.kmeans.inertia_
+            if inertia is None:
+                inertia = self.kmeans.inertia_
+            metrics = self.evaluator.evaluate(X, clusters)
+            silhouette_avg = metrics.pop('silhouette_score')
             
             evaluation = {
-                'silhouette_score': round(silhouette_avg, 4),
+                'silhouette_score': silhouette_avg,
                 'inertia': round(inertia, 2),
                 'n_clusters': self.n_clusters,
-                'n_samples': X.shape[0],
+                'n_samples': n_samples if n_samples is not None else X.shape[0],
                 'n_features': X.shape[1]
             }
+            evaluation.update(metrics)
             
-            self.logger.info(f"Evaluación - Silhouette: {silhouette_avg:.4f}, Inercia: {inertia:.2f}")
+            silhouette_text = f"{silhouette_avg:.4f}" if silhouette_avg is not None else "no calculada"
+            self.logger.info(f"Evaluación ({metrics['estrategia_evaluacion']}, {metrics['tiempo_evaluacion_s']:.2f}s) - "
+                             f"Silhouette: {silhouette_text}, Inercia: {inertia:.2f}")
             return evaluation
             
         except Exception as e:
@@ -140,7 +406,14 @@ class UnsupervisedTrainer:
             return {'silhouette_score': 0.0, 'inertia': 0.0}
     
     def save_model(self, cluster_emotions, evaluation):
-        """Guarda el modelo entrenado y metadatos"""
+        """Guarda el modelo como una versión nueva y la publica; devuelve la versión
+        
+        Todo se escribe en un directorio temporal del almacén y se publica al
+        final, así que quien carga el modelo mientras tanto sigue viendo la
+        versión anterior completa.
+        """
+        store = ModelStore()
+        staging_dir = store.create_staging()
         try:
             model_data = {
                 'kmeans': self.kmeans,
@@ -151,11 +424,20 @@ class UnsupervisedTrainer:
             }
             
             # Guardar modelo
-            joblib.dump(model_data, 'models/current/modelo_entrenado.pkl')
+            joblib.dump(model_data, os.path.join(staging_dir, 'modelo_entrenado.pkl'))
+            
+            # Exportar artefacto compacto para inferencia rápida (sin pickle)
+            compact_dir = os.path.join(staging_dir, 'compacto')
+            try:
+                export_compact_model(model_data, compact_dir)
+            except Exception as e:
+                self.logger.warning(f"No se pudo exportar el artefacto compacto: {e}")
+                # Sin artefacto compacto el chatbot carga el pickle
+                shutil.rmtree(compact_dir, ignore_errors=True)
             
             # Guardar metadatos
             metadata = {
-                'model_type': 'KMeans_Unsupervised',
+                'model_type': 'MiniBatchKMeans_Unsupervised' if self.mode == 'minibatch' else 'KMeans_Unsupervised',
                 'n_clusters': self.n_clusters,
                 'cluster_emotions': cluster_emotions,
                 'evaluation': evaluation,
@@ -163,11 +445,17 @@ class UnsupervisedTrainer:
                 'version': '1.0'
             }
             
-            self.data_manager.save_json(metadata, 'models/current/info_modelo.json')
-            self.data_manager.save_json(evaluation, 'data/history/metricas_entrenamiento.json')
-            
-            self.logger.info("Modelo K-means guardado exitosamente")
+            self.data_manager.save_json(metadata, os.path.join(staging_dir, 'info_modelo.json'))
+            # Cada versión lleva sus propias métricas (siguen valiendo al revertir)
+            self.data_manager.save_json(evaluation, os.path.join(staging_dir, 'metricas_entrenamiento.json'))
+            version = store.publish(staging_dir)
             
         except Exception as e:
+            store.discard_staging(staging_dir)
             self.logger.error(f"Error guardando modelo: {e}")
-            raise
\ No newline at end of file
+            raise
+        
+        # Copia de las métricas del último entrenamiento en la ruta de siempre
+        self.data_manager.save_json(evaluation, 'data/history/metricas_entrenamiento.json')
+        self.logger.info(f"Modelo K-means guardado exitosamente (versión {version})")
+        return version
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""Servidor HTTP/JSON de inferencia alrededor de EmotionChatbot.
+
+Uso: python -m src.server [--host 127.0.0.1] [--puerto 8000] [--procesos 2]
+
+El modelo se carga una sola vez en el proceso principal y luego se crean los
+procesos de trabajo con fork, así todos comparten el modelo en modo lectura
+(los centroides del artefacto compacto además están mapeados en memoria).
+Cada proceso atiende conexiones keep-alive (HTTP/1.1) con un hilo por
+conexión y agrupa en lotes los mensajes que llegan al mismo tiempo.
+
+Rutas:
+    GET  /salud      estado del proceso
+    POST /mensaje    {"mensaje": "...", "sesion": "..."}   -> respuesta de process_message
+    POST /mensajes   {"mensajes": [...], "sesion": "..."}  -> {"resultados": [...]}
+    POST /predecir   {"textos": [...]}                     -> {"predicciones": [...]} (sin respuesta ni historial)
+
+"sesion" es opcional; cada sesión tiene su propio historial en memoria dentro
+de cada proceso de trabajo.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.chat.batcher import PredictionBatcher
+from src.chat.core import EmotionChatbot
+from src.chat.model_registry import ModelRegistry
+from src.chat.predictor import EmotionPredictor
+from src.data.data_manager import DataManager
+from src.utils.logger import get_logger, setup_logger
+
+# Tamaño máximo aceptado para el cuerpo de una solicitud
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantiene la conexión abierta entre solicitudes (keep-alive)
+    protocol_version = 'HTTP/1.1'
+    server_version = 'EmotionChatbot/1.0'
+    # Cabeceras y cuerpo salen en dos escrituras: con Nagle, en una conexión
+    # keep-alive la segunda espera el ACK retrasado del cliente (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/salud':
+            self._send_json(200, {
+                'estado': 'ok',
+                'pid': os.getpid(),
+                'lotes': self.server.batcher.stats(),
+                'sesiones': self.server.chatbot.sessions.stats(),
+                'cache_predicciones': self.server.chatbot.predictor.get_cache_stats(),
+                'modelo': self.server.model_registry.stats()
+            })
+        else:
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+
+    def do_POST(self):
+        routes = {
+            '/mensaje': self._handle_message,
+            '/mensajes': self._handle_messages,
+            '/predecir': self._handle_predict
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send_json(404, {'error': f"Ruta no encontrada: {self.path}"})
+            return
+
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        try:
+            handler(payload)
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            self.server.logger.error(f"Error atendiendo {self.path}: {e}")
+            self._send_json(500, {'error': "Error interno procesando la solicitud"})
+
+    def _handle_message(self, payload):
+        message = payload.get('mensaje')
+        if not isinstance(message, str):
+            raise ValueError("Se esperaba {'mensaje': str}")
+        session_id = self._read_session(payload)
+        try:
+            result = self.server.batcher.predict((message, session_id))
+        except Exception:
+            # El error ya quedó registrado por el batcher
+            result = self.server.chatbot.error_response()
+        self._send_json(200, result)
+
+    def _handle_messages(self, payload):
+        messages = payload.get('mensajes')
+        if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+            raise ValueError("Se esperaba {'mensajes': [str, ...]}")
+        session_id = self._read_session(payload)
+        self._send_json(200, {'resultados': self.server.chatbot.process_messages(messages, session_id)})
+
+    def _handle_predict(self, payload):
+        texts = payload.get('textos')
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise ValueError("Se esperaba {'textos': [str, ...]}")
+        predictions = [
+            {
+                'emotion': emotion,
+                'confidence': confidence,
+                'cluster': cluster_info.get('cluster_id', -1),
+                'top_words': cluster_info.get('top_words', [])
+            }
+            for emotion, confidence, cluster_info in self.server.chatbot.predictor.predict_many(texts)
+        ]
+        self._send_json(200, {'predicciones': predictions})
+
+    def _read_session(self, payload):
+        session_id = payload.get('sesion')
+        if session_id is not None and (not isinstance(session_id, str) or not session_id):
+            raise ValueError("'sesion' debe ser un texto no vacío")
+        return session_id
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0:
+            raise ValueError("Cuerpo vacío")
+        if length > MAX_BODY_BYTES:
+            raise ValueError("Cuerpo demasiado grande")
+        try:
+            payload = json.loads(self.rfile.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError("JSON inválido")
+        if not isinstance(payload, dict):
+            raise ValueError("Se esperaba un objeto JSON")
+        return payload
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Sin una línea por solicitud en stderr
+        pass
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address):
+        super().__init__(address, InferenceHandler)
+        self.logger = get_logger()
+        self.chatbot = None
+        self.batcher = None
+        self.model_registry = None
+
+    def setup_worker(self, predictor, window_ms, max_batch_size):
+        """Crea el estado propio del proceso: chatbot (historial, respuestas) y agrupador"""
+        self.chatbot = EmotionChatbot(predictor=predictor)
+        self.batcher = PredictionBatcher(self._process_batch, window_ms, max_batch_size)
+        # Cada proceso revisa la versión actual del modelo y cambia su predictor sin reiniciar
+        self.model_registry = ModelRegistry.from_config(self.chatbot)
+
+    def _process_batch(self, items):
+        """Procesa en un solo lote pares (mensaje, sesión) de distintas conexiones"""
+        return self.chatbot.process_messages(
+            [message for message, _ in items],
+            [session_id for _, session_id in items]
+        )
+
+
+def _serve_worker(server, predictor, window_ms, max_batch_size):
+    """Bucle de un proceso de trabajo; al terminar escribe el historial pendiente"""
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    server.setup_worker(predictor, window_ms, max_batch_size)
+    server.logger.info(f"Proceso de trabajo {os.getpid()} atendiendo solicitudes")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.model_registry.close()
+        server.batcher.close()
+        server.chatbot.close()
+
+
+def run_server(host, port, workers, window_ms, max_batch_size):
+    logger = get_logger()
+
+    # El modelo se carga una vez, antes de crear los procesos
+    predictor = EmotionPredictor()
+    server = InferenceServer((host, port))
+    logger.info(f"Servidor escuchando en http://{host}:{port} ({workers} procesos)")
+
+    if workers <= 1 or not hasattr(os, 'fork'):
+        if workers > 1:
+            logger.warning("fork no disponible en esta plataforma, se usa un solo proceso")
+        _serve_worker(server, predictor, window_ms, max_batch_size)
+        server.server_close()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _serve_worker(server, predictor, window_ms, max_batch_size)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop_children(signum=None, frame=None):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: (stop_children(), sys.exit(0)))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        stop_children()
+        for pid in children:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+    finally:
+        server.server_close()
+        logger.info("Servidor detenido")
+
+
+def main():
+    params = DataManager().load_json('config/parametros.json').get('servidor', {})
+
+    parser = argparse.ArgumentParser(description="Servidor HTTP de inferencia del Chatbot de Emociones")
+    parser.add_argument('--host', default=params.get('host', '127.0.0.1'))
+    parser.add_argument('--puerto', type=int, default=params.get('puerto', 8000))
+    parser.add_argument('--procesos', type=int, default=params.get('procesos', 2),
+                        help="Número de procesos de trabajo que comparten el modelo")
+    parser.add_argument('--ventana-lote-ms', type=float, default=params.get('ventana_lote_ms', 2),
+                        help="Tiempo máximo de espera para juntar mensajes en un lote")
+    parser.add_argument('--tamano-max-lote', type=int, default=params.get('tamano_max_lote', 32))
+    args = parser.parse_args()
+
+    setup_logger()
+    run_server(args.host, args.puerto, args.procesos, args.ventana_lote_ms, args.tamano_max_lote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import sys
+import time
+from contextlib import contextmanager
+
+class StartupProfiler:
+    """Mide el tiempo de importación y de inicialización en el arranque.
+
+    Con enabled=False las fases no se registran, así el código de arranque
+    puede instrumentarse siempre sin costo.
+    """
+
+    # Módulos pesados que interesa saber si se cargaron en el arranque
+    HEAVY_MODULES = ('numpy', 'scipy', 'pandas', 'nltk', 'sklearn', 'joblib',
+                     'speech_recognition', 'pyaudio')
+
+    def __init__(self, enabled=True, start_time=None):
+        self.enabled = enabled
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.phases = []  # (nombre, tipo, ms)
+
+    def record(self, name, kind, ms):
+        """Registra una fase medida por fuera del perfilador"""
+        if self.enabled:
+            self.phases.append((name, kind, ms))
+
+    @contextmanager
+    def phase(self, name, kind='init'):
+        """Registra la duración del bloque como una fase ('import', 'init' o 'respuesta')"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, kind, (time.perf_counter() - start) * 1000))
+
+    def total_ms(self, kind=None):
+        return sum(ms for _, phase_kind, ms in self.phases if kind is None or phase_kind == kind)
+
+    def report(self):
+        """Resumen en texto de las fases medidas"""
+        elapsed_ms = (time.perf_counter() - self.start_time) * 1000
+        lines = ["=" * 50, "PERFIL DE ARRANQUE", "=" * 50]
+        for name, kind, ms in self.phases:
+            lines.append(f"  [{kind:9}] {name:<32} {ms:9.1f} ms")
+        lines.append("-" * 50)
+        lines.append(f"  Importaciones:       {self.total_ms('import'):9.1f} ms")
+        lines.append(f"  Inicialización:      {self.total_ms('init'):9.1f} ms")
+        lines.append(f"  Primera respuesta:   {self.total_ms('respuesta'):9.1f} ms")
+        lines.append(f"  Total desde inicio:  {elapsed_ms:9.1f} ms")
+        loaded = [name for name in self.HEAVY_MODULES if name in sys.modules]
+        lines.append(f"  Módulos pesados cargados: {', '.join(loaded) if loaded else 'ninguno'}")
+        lines.append("=" * 50)
+        return "\n".join(lines)
@@ -0,0 +1,95 @@
+import threading
+import time
+import pytest
+from src.chat.batcher import PredictionBatcher
+
+
+def upper_many(texts):
+    return [text.upper() for text in texts]
+
+
+def test_groups_concurrent_submits_in_one_batch():
+    batcher = PredictionBatcher(upper_many, max_latency_ms=200, max_batch_size=32)
+    try:
+        futures = [batcher.submit(f"t{i}") for i in range(10)]
+        assert [f.result(timeout=5) for f in futures] == [f"T{i}" for i in range(10)]
+        stats = batcher.stats()
+        assert stats['items'] == 10
+        assert stats['batches'] == 1
+    finally:
+        batcher.close()
+
+
+def test_respects_max_batch_size():
+    sizes = []
+    batcher = PredictionBatcher(upper_many, max_latency_ms=200, max_batch_size=4,
+                                metrics_hook=lambda size, wait_ms, predict_ms: sizes.append(size))
+    futures = [batcher.submit(str(i)) for i in range(10)]
+    batcher.close()
+    assert all(f.done() for f in futures)
+    assert max(sizes) <= 4
+    assert sum(sizes) == 10
+
+
+def test_close_flushes_pending_without_waiting_for_the_window():
+    batcher = PredictionBatcher(upper_many, max_latency_ms=10000, max_batch_size=100)
+    futures = [batcher.submit(f"t{i}") for i in range(5)]
+    start = time.perf_counter()
+    batcher.close()
+    assert time.perf_counter() - start < 5
+    assert [f.result(timeout=0) for f in futures] == [f"T{i}" for i in range(5)]
+
+
+def test_errors_reach_every_future_in_the_batch():
+    def failing(texts):
+        raise ValueError("modelo roto")
+
+    batcher = PredictionBatcher(failing, max_latency_ms=50)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    batcher.close()
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result(timeout=0)
+    assert batcher.stats()['errors'] >= 1
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = PredictionBatcher(lambda texts: texts[:1], max_latency_ms=100)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        futures[1].result(timeout=0)
+
+
+def test_submit_after_close_raises():
+    batcher = PredictionBatcher(upper_many)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit("tarde")
+
+
+def test_predict_fn_can_be_swapped_between_batches():
+    batcher = PredictionBatcher(upper_many, max_latency_ms=0)
+    try:
+        assert batcher.predict("a", timeout=5) == "A"
+        batcher.predict_fn = lambda texts: [text * 2 for text in texts]
+        assert batcher.predict("a", timeout=5) == "aa"
+    finally:
+        batcher.close()
+
+
+def test_concurrent_producers_get_their_own_results():
+    batcher = PredictionBatcher(upper_many, max_latency_ms=5, max_batch_size=8)
+    results = {}
+
+    def produce(worker):
+        results[worker] = [batcher.predict(f"w{worker}-{i}", timeout=5) for i in range(20)]
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.close()
+    for worker in range(4):
+        assert results[worker] == [f"W{worker}-{i}" for i in range(20)]
@@ -0,0 +1,110 @@
+import json
+import multiprocessing
+import os
+from src.data.conversation_store import ConversationStore
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_compacts_to_retention_window(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    store = ConversationStore(path, retention=10, legacy_path=None)
+    for i in range(35):
+        store.append({'i': i})
+    entries = read_lines(path)
+    assert len(entries) < 20
+    assert entries[-1] == {'i': 34}
+    assert store.load_recent(3) == [{'i': 32}, {'i': 33}, {'i': 34}]
+
+
+def _append_from_process(path, worker):
+    store = ConversationStore(path, retention=50, legacy_path=None)
+    for i in range(300):
+        store.append({'worker': worker, 'i': i})
+
+
+def test_compaction_is_bounded_with_several_processes(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    workers = [multiprocessing.Process(target=_append_from_process, args=(path, w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    # Contando líneas reales el archivo no llega a N procesos x umbral
+    entries = read_lines(path)
+    assert 50 <= len(entries) < 100
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def _open_store(path, legacy_path):
+    ConversationStore(path, retention=20, legacy_path=legacy_path)
+
+
+def test_legacy_history_is_migrated_once(tmp_path):
+    legacy_path = str(tmp_path / 'historial.json')
+    with open(legacy_path, 'w', encoding='utf-8') as f:
+        json.dump({'conversations': [{'i': i} for i in range(50)]}, f)
+    path = str(tmp_path / 'historial.jsonl')
+
+    workers = [multiprocessing.Process(target=_open_store, args=(path, legacy_path)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+
+    assert read_lines(path) == [{'i': i} for i in range(30, 50)]
+
+
+def write_watermark(path, timestamp):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'ultimo_timestamp': timestamp}, f)
+
+
+def stamp(i):
+    return f"2026-01-01T00:00:00.{i:06d}"
+
+
+def test_entries_newer_than_watermark_survive_compaction(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    watermark = str(tmp_path / 'marca.json')
+    store = ConversationStore(path, retention=10, legacy_path=None,
+                              watermark_path=watermark, max_pending=1000)
+    write_watermark(watermark, stamp(4))
+    for i in range(200):
+        store.append({'timestamp': stamp(i)})
+    store.compact()
+
+    entries = read_lines(path)
+    # Todo lo posterior a la marca, más una entrada anterior para detectar huecos
+    assert entries[0]['timestamp'] == stamp(4)
+    assert len(entries) == 196
+
+
+def test_without_watermark_only_retention_is_kept(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    store = ConversationStore(path, retention=10, legacy_path=None,
+                              watermark_path=str(tmp_path / 'marca.json'), max_pending=1000)
+    for i in range(50):
+        store.append({'timestamp': stamp(i)})
+    store.compact()
+    assert len(read_lines(path)) == 10
+
+
+def test_pending_entries_are_capped_by_max_pending(tmp_path):
+    path = str(tmp_path / 'historial.jsonl')
+    watermark = str(tmp_path / 'marca.json')
+    store = ConversationStore(path, retention=10, legacy_path=None,
+                              watermark_path=watermark, max_pending=50)
+    write_watermark(watermark, stamp(0))
+    for i in range(1, 201):
+        store.append({'timestamp': stamp(i)})
+    store.compact()
+
+    entries = read_lines(path)
+    assert len(entries) == 51
+    # La primera ya es posterior a la marca: el reentrenamiento detecta la pérdida
+    assert entries[0]['timestamp'] > stamp(0)
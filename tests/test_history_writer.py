@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from src.data.history_writer import HistoryWriter
+
+
+class RecordingStore:
+    """Store en memoria; con `gate` la escritura espera hasta que se abra"""
+
+    def __init__(self, gated=False):
+        self.entries = []
+        self.writing = threading.Event()
+        self.gate = threading.Event()
+        if not gated:
+            self.gate.set()
+
+    def append_many(self, batch):
+        self.writing.set()
+        self.gate.wait(5)
+        self.entries.extend(batch)
+
+
+def test_close_writes_everything_still_queued():
+    store = RecordingStore()
+    writer = HistoryWriter(store, batch_size=1000, flush_interval_ms=60000)
+    for i in range(50):
+        writer.submit({'i': i})
+    writer.close()
+    assert [entry['i'] for entry in store.entries] == list(range(50))
+    assert writer.stats()['written'] == 50
+
+
+def test_flush_waits_until_written():
+    store = RecordingStore()
+    writer = HistoryWriter(store, batch_size=1000, flush_interval_ms=60000)
+    try:
+        for i in range(10):
+            writer.submit({'i': i})
+        writer.flush()
+        assert len(store.entries) == 10
+    finally:
+        writer.close()
+
+
+def test_submit_after_close_writes_synchronously():
+    store = RecordingStore()
+    writer = HistoryWriter(store)
+    writer.close()
+    writer.submit({'i': 'tarde'})
+    assert store.entries == [{'i': 'tarde'}]
+
+
+def test_drop_oldest_discards_and_counts_when_full():
+    store = RecordingStore(gated=True)
+    writer = HistoryWriter(store, max_queue_size=5, batch_size=1, overflow_policy='drop_oldest')
+    writer.submit({'i': 0})
+    # El hilo quedó bloqueado escribiendo la primera entrada: la cola se llena
+    assert store.writing.wait(5)
+    for i in range(1, 11):
+        writer.submit({'i': i})
+    assert writer.stats()['dropped'] == 5
+
+    store.gate.set()
+    writer.close()
+    assert [entry['i'] for entry in store.entries] == [0, 6, 7, 8, 9, 10]
+
+
+def test_block_policy_applies_backpressure_without_losing_entries():
+    store = RecordingStore(gated=True)
+    writer = HistoryWriter(store, max_queue_size=2, batch_size=1, overflow_policy='block')
+    writer.submit({'i': 0})
+    assert store.writing.wait(5)
+    writer.submit({'i': 1})
+    writer.submit({'i': 2})
+
+    producer = threading.Thread(target=writer.submit, args=({'i': 3},))
+    producer.start()
+    time.sleep(0.1)
+    # La cola está llena: el productor espera al disco
+    assert producer.is_alive()
+
+    store.gate.set()
+    producer.join(5)
+    assert not producer.is_alive()
+    writer.close()
+    assert [entry['i'] for entry in store.entries] == [0, 1, 2, 3]
+    assert writer.stats()['dropped'] == 0
+
+
+def test_write_errors_are_counted_and_do_not_stop_the_writer():
+    class FlakyStore(RecordingStore):
+        def append_many(self, batch):
+            if batch[0]['i'] == 0:
+                raise OSError("disco lleno")
+            super().append_many(batch)
+
+    store = FlakyStore()
+    writer = HistoryWriter(store, batch_size=1)
+    writer.submit({'i': 0})
+    writer.flush()
+    writer.submit({'i': 1})
+    writer.close()
+    assert store.entries == [{'i': 1}]
+    assert writer.stats()['errors'] == 1
+
+
+def test_invalid_overflow_policy():
+    with pytest.raises(ValueError):
+        HistoryWriter(RecordingStore(), overflow_policy='ignorar')
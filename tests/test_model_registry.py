@@ -0,0 +1,139 @@
+import threading
+import pytest
+from src.chat import model_registry as registry_module
+from src.chat.model_registry import ModelRegistry
+
+
+class FakeLoader:
+    """Simula el almacén: `signature` y `model` son lo que hay publicado"""
+
+    def __init__(self):
+        self.signature = 'v1'
+        self.model = 'modelo-1'
+
+    def resolve_model_dir(self, model_dir=None):
+        return model_dir or 'models/versiones/actual'
+
+    def inference_signature(self, model_dir=None):
+        if self.signature is None:
+            raise FileNotFoundError("sin modelo")
+        return self.signature
+
+    def load_inference_model(self, model_dir=None):
+        return self.model
+
+
+class FakePredictor:
+    def __init__(self, model, model_signature=None):
+        self.model = model
+        self.model_signature = model_signature
+        self.centers = [0, 1, 2]
+
+    def with_model(self, model_data):
+        return FakePredictor(model_data)
+
+    def validate(self, sample_text):
+        if self.model == 'roto':
+            raise ValueError("la predicción de prueba falló")
+        return 0
+
+
+class FakeChatbot:
+    def __init__(self):
+        self.predictor = FakePredictor('modelo-1', 'v1')
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = FakeLoader()
+    monkeypatch.setattr(registry_module, 'ModelLoader', lambda: loader)
+    return loader
+
+
+def test_reload_without_changes_keeps_predictor(loader):
+    chatbot = FakeChatbot()
+    registry = ModelRegistry(chatbot)
+    assert not registry.has_new_model()
+    assert registry.reload() is False
+    assert chatbot.predictor.model == 'modelo-1'
+
+
+def test_model_published_before_registry_is_detected(loader):
+    # Se publica v2 después de cargar el predictor (v1) y antes de crear el registro
+    chatbot = FakeChatbot()
+    loader.signature, loader.model = 'v2', 'modelo-2'
+    registry = ModelRegistry(chatbot)
+
+    assert registry.has_new_model()
+    assert registry.reload() is True
+    assert chatbot.predictor.model == 'modelo-2'
+
+
+def test_new_signature_swaps_predictor(loader):
+    chatbot = FakeChatbot()
+    swaps = []
+    registry = ModelRegistry(chatbot, on_swap=lambda new, old: swaps.append((new.model, old.model)))
+    loader.signature, loader.model = 'v2', 'modelo-2'
+
+    assert registry.has_new_model()
+    assert registry.reload() is True
+    assert chatbot.predictor.model == 'modelo-2'
+    assert swaps == [('modelo-2', 'modelo-1')]
+    assert registry.stats()['swaps'] == 1
+    assert not registry.has_new_model()
+
+
+def test_failed_validation_keeps_old_predictor(loader):
+    chatbot = FakeChatbot()
+    previous = chatbot.predictor
+    registry = ModelRegistry(chatbot)
+    loader.signature, loader.model = 'v2', 'roto'
+
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert chatbot.predictor is previous
+    assert registry.stats()['last_error']
+    # La firma rechazada no se vuelve a intentar hasta que se publique otra
+    assert not registry.has_new_model()
+
+    loader.signature, loader.model = 'v3', 'modelo-3'
+    assert registry.reload() is True
+    assert chatbot.predictor.model == 'modelo-3'
+    assert registry.stats()['last_error'] is None
+
+
+def test_reload_async_reports_error_to_callback(loader):
+    chatbot = FakeChatbot()
+    registry = ModelRegistry(chatbot)
+    loader.signature, loader.model = 'v2', 'roto'
+    done = threading.Event()
+    outcome = {}
+
+    def callback(swapped, error):
+        outcome.update(swapped=swapped, error=error)
+        done.set()
+
+    registry.reload_async(callback)
+    assert done.wait(5)
+    assert outcome['swapped'] is False
+    assert isinstance(outcome['error'], ValueError)
+    assert chatbot.predictor.model == 'modelo-1'
+
+
+def test_watcher_picks_up_new_model(loader):
+    chatbot = FakeChatbot()
+    swapped = threading.Event()
+    registry = ModelRegistry(chatbot, poll_interval_s=0.01, on_swap=lambda new, old: swapped.set())
+    try:
+        loader.signature, loader.model = 'v2', 'modelo-2'
+        assert swapped.wait(5)
+        assert chatbot.predictor.model == 'modelo-2'
+    finally:
+        registry.close()
+
+
+def test_missing_model_is_not_a_new_model(loader):
+    loader.signature = None
+    registry = ModelRegistry(FakeChatbot())
+    assert not registry.has_new_model()
+    assert registry.reload() is False
@@ -0,0 +1,104 @@
+import os
+import sys
+import pytest
+from src.ml import model_store
+from src.ml.model_store import ModelStore
+
+
+def publish(store, version, content='modelo'):
+    staging = store.create_staging()
+    with open(os.path.join(staging, 'modelo_entrenado.pkl'), 'w', encoding='utf-8') as f:
+        f.write(content)
+    return store.publish(staging, version)
+
+
+def read_model(model_dir):
+    with open(os.path.join(model_dir, 'modelo_entrenado.pkl'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_without_pointer_resolves_legacy_dir(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=5)
+    assert store.current_version() is None
+    assert store.resolve() == os.path.join(str(tmp_path), 'current')
+
+
+def test_publish_moves_pointer_and_leaves_no_staging(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=5)
+    publish(store, 'v1', 'uno')
+    publish(store, 'v2', 'dos')
+    assert store.current_version() == 'v2'
+    assert read_model(store.resolve()) == 'dos'
+    assert store.list_versions() == ['v1', 'v2']
+    assert not [name for name in os.listdir(store.versions_dir) if name.startswith('.tmp-')]
+
+
+def test_generated_version_names_are_unique_and_ordered(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=5)
+    first = publish(store, None)
+    second = publish(store, None)
+    assert first != second
+    assert store.list_versions() == [first, second]
+
+
+def test_rollback_restores_previous_version(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=5)
+    publish(store, 'v1', 'uno')
+    publish(store, 'v2', 'dos')
+    assert store.rollback() == 'v1'
+    assert read_model(store.resolve()) == 'uno'
+    with pytest.raises(ValueError):
+        store.rollback()
+    with pytest.raises(ValueError):
+        store.rollback('v9')
+
+
+def test_retention_keeps_latest_versions(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=2)
+    for version in ('v1', 'v2', 'v3'):
+        publish(store, version)
+    assert store.list_versions() == ['v2', 'v3']
+
+
+def test_retention_never_deletes_current_version(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=3)
+    for version in ('v1', 'v2', 'v3'):
+        publish(store, version)
+    store.rollback('v1')
+
+    # La actual (v1) queda fuera de la ventana de 1, pero se conserva
+    ModelStore(root=str(tmp_path), retention=1).apply_retention()
+    assert store.list_versions() == ['v1', 'v3']
+    assert store.current_version() == 'v1'
+
+
+def test_dangling_pointer_falls_back_to_legacy_dir(tmp_path):
+    store = ModelStore(root=str(tmp_path), retention=5)
+    publish(store, 'v1')
+    with open(store.pointer_path, 'w', encoding='utf-8') as f:
+        f.write('borrada')
+    assert store.resolve() == os.path.join(str(tmp_path), 'current')
+
+
+def run_cli(monkeypatch, capsys, *args):
+    monkeypatch.setattr(sys, 'argv', ['model_store', *args])
+    model_store.main()
+    return capsys.readouterr().out
+
+
+def test_cli_revertir_restores_previous_version(tmp_path, monkeypatch, capsys):
+    # La CLI usa las rutas relativas por defecto (models/, config/)
+    monkeypatch.chdir(tmp_path)
+    store = ModelStore(retention=5)
+    publish(store, 'v1', 'uno')
+    publish(store, 'v2', 'dos')
+
+    out = run_cli(monkeypatch, capsys)
+    assert '* v2' in out and '  v1' in out
+
+    assert 'v1' in run_cli(monkeypatch, capsys, '--revertir')
+    assert ModelStore(retention=5).current_version() == 'v1'
+    assert read_model(ModelStore(retention=5).resolve()) == 'uno'
+
+    run_cli(monkeypatch, capsys, '--revertir', 'v2')
+    assert ModelStore(retention=5).current_version() == 'v2'
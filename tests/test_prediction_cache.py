@@ -0,0 +1,68 @@
+import pytest
+from src.chat import prediction_cache as cache_module
+from src.chat.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_after_put_with_same_signature():
+    cache = PredictionCache()
+    cache.bind('v1')
+    cache.put('hola', 'v1', 3, 0.8, ['hola'])
+    assert cache.get('hola', 'v1') == (3, 0.8, ('hola',))
+    assert cache.stats()['hits'] == 1
+
+
+def test_new_signature_invalidates_entries():
+    cache = PredictionCache()
+    cache.bind('v1')
+    cache.put('hola', 'v1', 3, 0.8, [])
+    cache.bind('v2')
+    assert len(cache) == 0
+    assert cache.get('hola', 'v2') is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_results_from_a_previous_model_are_not_stored_or_served():
+    cache = PredictionCache()
+    cache.bind('v2')
+    cache.put('hola', 'v1', 3, 0.8, [])
+    assert len(cache) == 0
+    cache.put('hola', 'v2', 4, 0.5, [])
+    assert cache.get('hola', 'v1') is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, 'monotonic', clock)
+    cache = PredictionCache(ttl_s=10)
+    cache.bind('v1')
+    cache.put('hola', 'v1', 3, 0.8, [])
+    clock.now += 9
+    assert cache.get('hola', 'v1') is not None
+    clock.now += 2
+    assert cache.get('hola', 'v1') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_size=2)
+    cache.bind('v1')
+    cache.put('a', 'v1', 1, 0.1, [])
+    cache.put('b', 'v1', 2, 0.2, [])
+    cache.get('a', 'v1')
+    cache.put('c', 'v1', 3, 0.3, [])
+    assert cache.get('b', 'v1') is None
+    assert cache.get('a', 'v1') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+@pytest.mark.parametrize('ttl', [None, 0, -5])
+def test_non_positive_ttl_disables_expiry(ttl):
+    assert PredictionCache(ttl_s=ttl).ttl is None
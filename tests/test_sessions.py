@@ -0,0 +1,94 @@
+import pytest
+from src.chat import sessions as sessions_module
+from src.chat.sessions import DEFAULT_SESSION_ID, SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sessions_module.time, 'monotonic', clock)
+    return clock
+
+
+def entry(i, text='hola'):
+    return {'user_message': f"{text} {i}", 'detected_emotion': 'alegría',
+            'bot_response': 'respuesta', 'cluster_id': 1, 'cluster_words': ['hola'],
+            'timestamp': f"2026-01-01T00:00:{i:02d}"}
+
+
+def test_idle_sessions_expire_after_ttl(clock):
+    manager = SessionManager(idle_ttl_s=60)
+    manager.add('a', entry(1))
+    clock.now += 30
+    manager.add('b', entry(2))
+
+    clock.now += 31
+    assert manager.evict_expired() == 1
+    assert 'a' not in manager
+    assert 'b' in manager
+    assert manager.stats()['evicted_ttl'] == 1
+
+
+def test_reading_a_session_keeps_it_alive(clock):
+    manager = SessionManager(idle_ttl_s=60)
+    manager.add('a', entry(1))
+    clock.now += 50
+    assert len(manager.get_history('a')) == 1
+    clock.now += 50
+    manager.add('b', entry(2))
+    assert 'a' in manager
+
+
+def test_lru_session_is_evicted_over_max_sessions(clock):
+    manager = SessionManager(max_sessions=2, idle_ttl_s=0)
+    manager.add('a', entry(1))
+    manager.add('b', entry(2))
+    manager.get_history('a')
+    manager.add('c', entry(3))
+    assert 'b' not in manager
+    assert 'a' in manager and 'c' in manager
+    assert manager.stats()['evicted_lru'] == 1
+
+
+def test_history_per_session_is_bounded():
+    manager = SessionManager(max_entries_per_session=3)
+    for i in range(10):
+        manager.add('a', entry(i))
+    history = manager.get_history('a')
+    assert [item['user_message'] for item in history] == ['hola 7', 'hola 8', 'hola 9']
+    assert manager.get_history('a', n=1)[0]['user_message'] == 'hola 9'
+
+
+def test_memory_limit_trims_and_accounts_bytes():
+    manager = SessionManager(max_memory_bytes=2000, idle_ttl_s=0)
+    for i in range(20):
+        manager.add('a', entry(i, text='x' * 100))
+    stats = manager.stats()
+    assert stats['memory_bytes'] <= 2000
+    assert stats['trimmed_entries'] > 0
+    assert manager.end_session('a')
+    assert manager.stats()['memory_bytes'] == 0
+
+
+def test_missing_session_id_uses_default():
+    manager = SessionManager()
+    manager.add(None, entry(1))
+    assert DEFAULT_SESSION_ID in manager
+    assert manager.get_history()[0]['user_message'] == 'hola 1'
+
+
+def test_history_keeps_session_id():
+    manager = SessionManager()
+    manager.add('a', dict(entry(1), session_id='a'))
+    manager.add('b', entry(2))
+    assert manager.get_history('a')[0]['session_id'] == 'a'
+    # Sin 'session_id' en la entrada se usa la sesión donde se guardó
+    assert manager.get_history('b')[0]['session_id'] == 'b'
@@ -1,28 +1,50 @@
-from src.ml.unsupervised_trainer import UnsupervisedTrainer
+import argparse
+from src.ml.unsupervised_trainer import TRAINING_MODES, UnsupervisedTrainer
 from src.utils.logger import setup_logger
 from src.data.data_manager import DataManager
 
 def main():
+    parser = argparse.ArgumentParser(description="Entrenamiento no supervisado del Chatbot de Emociones")
+    parser.add_argument('--modo', choices=TRAINING_MODES, default=None,
+                        help="'completo' (KMeans en memoria) o 'minibatch' (por bloques); por defecto parametros.json")
+    parser.add_argument('--barrido', action='store_true',
+                        help="Entrena la grilla de k y vectorizadores de parametros.json (sección 'barrido') en paralelo")
+    parser.add_argument('--k', type=int, nargs='+', default=None, help="Valores de k para el barrido")
+    parser.add_argument('--procesos', type=int, default=None, help="Procesos para el barrido")
+    parser.add_argument('--promover', action='store_true',
+                        help="Con --barrido, publica la mejor configuración como versión actual")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reentrena desde el modelo actual con las conversaciones nuevas del historial")
+    args = parser.parse_args()
+    
     logger = setup_logger()
     data_manager = DataManager()
     
+    if args.barrido:
+        run_sweep(args, logger)
+        return
+    if args.incremental:
+        run_incremental(logger)
+        return
+    
     try:
         # Cargar parámetros
         params = data_manager.load_json('config/parametros.json')
         n_clusters = params.get('modelo', {}).get('n_clusters', 30)
         
         logger.info("INICIANDO ENTRENAMIENTO NO SUPERVISADO")
-        logger.info("Algoritmo: K-means con TF-IDF")
+        logger.info(f"Algoritmo: K-means con TF-IDF (modo {args.modo or params.get('modelo', {}).get('modo_entrenamiento', 'completo')})")
         logger.info(f"Clusters: {n_clusters} (completamente no supervisado - sin palabras clave)")
         logger.info("El modelo detectará emociones automáticamente sin etiquetas")
         
         # Entrenar modelo (sin especificar n_clusters, lo carga de parámetros)
-        trainer = UnsupervisedTrainer(n_clusters=n_clusters)
+        trainer = UnsupervisedTrainer(n_clusters=n_clusters, mode=args.modo)
         evaluation = trainer.train()
         
         logger.info("ENTRENAMIENTO COMPLETADO")
         logger.info(f"Resultados:")
         logger.info(f"   - Silhouette Score: {evaluation['silhouette_score']}")
+        logger.info(f"   - Evaluación: {evaluation.get('estrategia_evaluacion')} ({evaluation.get('tiempo_evaluacion_s')} s)")
         logger.info(f"   - Inercia: {evaluation['inertia']}")
         logger.info(f"   - Muestras: {evaluation['n_samples']}")
         logger.info(f"   - Clusters detectados: {evaluation['n_clusters']}")
@@ -46,5 +68,57 @@ def main():
         logger.error(traceback.format_exc())
         print(f"Error entrenando modelo: {e}")
 
+def run_incremental(logger):
+    """Reentrenamiento incremental con los mensajes registrados desde la última marca"""
+    from src.ml.incremental_trainer import IncrementalTrainer
+    
+    try:
+        logger.info("INICIANDO REENTRENAMIENTO INCREMENTAL")
+        evaluation = IncrementalTrainer().train()
+        
+        print("\n" + "="*50)
+        if evaluation is None:
+            print("SIN CONVERSACIONES NUEVAS: el modelo no cambió")
+        else:
+            print("MODELO REENTRENADO EXITOSAMENTE (incremental)")
+            print("="*50)
+            print(f"Textos nuevos: {evaluation['textos_nuevos']}")
+            print(f"Silhouette Score: {evaluation['silhouette_score']}")
+            print(f"Desplazamiento de centroides: {evaluation['desplazamiento_centroides']}")
+            if 'reasignados' in evaluation:
+                print(f"Textos reasignados: {evaluation['reasignados']:.2%}")
+            print(f"Tiempo: {evaluation['tiempo_reentrenamiento_s']} s")
+        print("="*50)
+        
+    except Exception as e:
+        logger.error(f"Error en reentrenamiento incremental: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        print(f"Error en reentrenamiento incremental: {e}")
+
+def run_sweep(args, logger):
+    """Barrido de hiperparámetros con reporte ordenado"""
+    from src.ml.sweep import REPORT_PATH, HyperparameterSweep, format_report
+    
+    try:
+        logger.info("INICIANDO BARRIDO DE HIPERPARÁMETROS")
+        report = HyperparameterSweep(k_values=args.k, n_jobs=args.procesos).run(promote=args.promover)
+        
+        print("\n" + "="*80)
+        print(f"BARRIDO COMPLETADO: {len(report['resultados'])} combinaciones en {report['tiempo_total_s']} s")
+        print("="*80)
+        print(format_report(report))
+        print("="*80)
+        print(f"Reporte guardado en {REPORT_PATH}")
+        if report['promovido']:
+            print(f"Modelo promovido como versión actual: vectorizador {report['promovido']['vectorizador']}, "
+                  f"k={report['promovido']['n_clusters']}")
+        
+    except Exception as e:
+        logger.error(f"Error en barrido: {e}")
+        import traceback
+        logger.error(traceback.format_exc())
+        print(f"Error en barrido: {e}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,13 +1,29 @@
 import tkinter as tk
+from collections import deque, namedtuple
 from tkinter import ttk
 from ..theme import COLORS
 
+# Widgets realizados como máximo, mensajes por página al desplazarse y
+# mensajes que se recuerdan en total
+MAX_REALIZED_MESSAGES = 60
+PAGE_SIZE = 20
+MAX_TRANSCRIPT_MESSAGES = 5000
+
+_MessageRow = namedtuple('_MessageRow', ['container', 'bubble', 'label'])
+
 class ChatArea(tk.Frame):
     def __init__(self, parent, send_command, record_command):
         super().__init__(parent, bg=COLORS['bg_chat'], relief=tk.FLAT)
         self.send_command = send_command
         self.record_command = record_command
         
+        self._messages = []      # [texto, remitente] de toda la conversación
+        self._base_id = 0        # id del primer mensaje que sigue en memoria
+        self._first = 0          # índice del primer mensaje con widgets
+        self._rows = deque()     # filas realizadas, en orden
+        self._pool = []          # filas fuera de pantalla para reutilizar
+        self._stick_to_end = True
+        
         self._setup_widgets()
 
     def _setup_widgets(self):
@@ -32,7 +48,7 @@ class ChatArea(tk.Frame):
 
         # Canvas y scrollbar para mensajes
         self.chat_canvas = tk.Canvas(messages_container, bg=COLORS['bg_chat'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(messages_container, orient="vertical", command=self.chat_canvas.yview)
+        scrollbar = ttk.Scrollbar(messages_container, orient="vertical", command=self._yview)
         self.messages_frame = tk.Frame(self.chat_canvas, bg=COLORS['bg_chat'])
 
         self.chat_canvas.configure(yscrollcommand=scrollbar.set)
@@ -42,7 +58,10 @@ class ChatArea(tk.Frame):
         canvas_window = self.chat_canvas.create_window((0, 0), window=self.messages_frame, anchor="nw")
         
         def configure_scroll_region(event):
-            self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
+            # El frame de mensajes es el único elemento: su tamaño es la región (sin bbox("all"))
+            self.chat_canvas.configure(scrollregion=(0, 0, event.width, event.height))
+            if self._stick_to_end:
+                self.chat_canvas.yview_moveto(1.0)
         
         def configure_canvas_width(event):
             canvas_width = event.width
@@ -50,7 +69,7 @@ class ChatArea(tk.Frame):
         
         self.messages_frame.bind("<Configure>", configure_scroll_region)
         self.chat_canvas.bind("<Configure>", configure_canvas_width)
-        self.chat_canvas.bind_all("<MouseWheel>", lambda e: self.chat_canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
+        self.chat_canvas.bind_all("<MouseWheel>", self._on_mousewheel)
 
         # Área de entrada
         input_frame = tk.Frame(self, bg=COLORS['bg_chat'], height=70)
@@ -106,37 +125,51 @@ class ChatArea(tk.Frame):
         )
         self.record_btn.pack(side="right", padx=(0, 5), pady=10)
 
+    # TRANSCRIPCIÓN VIRTUALIZADA
+    # Todos los mensajes se guardan como texto; solo una ventana de hasta
+    # MAX_REALIZED_MESSAGES tiene widgets. Al llegar al borde superior o inferior
+    # del scroll se cargan PAGE_SIZE mensajes más y los del otro extremo se
+    # reciclan para los siguientes.
+
     def add_message(self, text, sender="user"):
-        # Colores neon según el remitente
-        if sender == "user":
-            bubble_color = COLORS['neon_pink']
-            text_color = "white"
-            anchor_pos = "e"
+        """Agrega un mensaje y devuelve su id (para `update_message`)"""
+        message_id = self._base_id + len(self._messages)
+        self._messages.append([text, sender])
+        if len(self._messages) > MAX_TRANSCRIPT_MESSAGES:
+            self._drop_oldest(len(self._messages) - MAX_TRANSCRIPT_MESSAGES)
+
+        if self._window_end() == len(self._messages) - 1:
+            # La ventana ya muestra el final: solo se agrega una fila
+            self._realize(len(self._messages) - 1, at_end=True)
+            while len(self._rows) > MAX_REALIZED_MESSAGES:
+                self._recycle(self._rows.popleft())
+                self._first += 1
         else:
-            bubble_color = COLORS['neon_purple']
-            text_color = "white"
-            anchor_pos = "w"
+            # Se estaba leyendo el historial: volver al final como antes
+            self._show_tail()
 
-        # Frame contenedor del mensaje
-        msg_container = tk.Frame(self.messages_frame, bg=COLORS['bg_chat'])
-        msg_container.pack(anchor=anchor_pos, pady=8, padx=10, fill="x")
+        self._scroll_to_end()
+        return message_id
 
-        # Burbuja del mensaje con estilo neon
-        bubble_frame = tk.Frame(
-            msg_container,
-            bg=bubble_color,
-            relief=tk.FLAT,
-            bd=2,
-            highlightbackground=bubble_color,
-            highlightthickness=1
-        )
-        bubble_frame.pack(anchor=anchor_pos, padx=(20, 0) if sender == "user" else (0, 20))
+    def update_message(self, message_id, text):
+        """Cambia el texto de un mensaje (p. ej. el indicador de espera)"""
+        index = message_id - self._base_id
+        if not 0 <= index < len(self._messages):
+            return
+        self._messages[index][0] = text
+        if self._first <= index < self._window_end():
+            self._rows[index - self._first].label.config(text=text)
 
-        msg_label = tk.Label(
-            bubble_frame,
-            text=text,
-            bg=bubble_color,
-            fg=text_color,
+    def _window_end(self):
+        return self._first + len(self._rows)
+
+    def _new_row(self):
+        if self._pool:
+            return self._pool.pop()
+        container = tk.Frame(self.messages_frame, bg=COLORS['bg_chat'])
+        bubble = tk.Frame(container, relief=tk.FLAT, bd=2, highlightthickness=1)
+        label = tk.Label(
+            bubble,
             wraplength=450,
             justify="left",
             font=("Segoe UI", 10),
@@ -145,15 +178,112 @@ class ChatArea(tk.Frame):
             relief=tk.FLAT,
             bd=0
         )
-        msg_label.pack(anchor=anchor_pos)
+        return _MessageRow(container, bubble, label)
 
-        # Auto-scroll al final
+    def _realize(self, index, at_end):
+        """Muestra el mensaje `index` en una fila nueva o reciclada"""
+        text, sender = self._messages[index]
+        # Colores neon según el remitente
+        if sender == "user":
+            bubble_color = COLORS['neon_pink']
+            anchor_pos = "e"
+        else:
+            bubble_color = COLORS['neon_purple']
+            anchor_pos = "w"
+
+        row = self._new_row()
+        row.bubble.config(bg=bubble_color, highlightbackground=bubble_color)
+        row.label.config(text=text, bg=bubble_color, fg="white")
+
+        if at_end or not self._rows:
+            row.container.pack(anchor=anchor_pos, pady=8, padx=10, fill="x")
+            self._rows.append(row)
+        else:
+            row.container.pack(anchor=anchor_pos, pady=8, padx=10, fill="x", before=self._rows[0].container)
+            self._rows.appendleft(row)
+        row.bubble.pack(anchor=anchor_pos, padx=(20, 0) if sender == "user" else (0, 20))
+        row.label.pack(anchor=anchor_pos)
+
+    def _recycle(self, row):
+        row.container.pack_forget()
+        if len(self._pool) < PAGE_SIZE:
+            self._pool.append(row)
+        else:
+            row.container.destroy()
+
+    def _show_tail(self):
+        """Vuelve a crear la ventana con los últimos mensajes"""
+        while self._rows:
+            self._recycle(self._rows.pop())
+        self._first = max(0, len(self._messages) - MAX_REALIZED_MESSAGES)
+        for index in range(self._first, len(self._messages)):
+            self._realize(index, at_end=True)
+
+    def _drop_oldest(self, count):
+        """Olvida los mensajes más antiguos para acotar la memoria de la transcripción"""
+        del self._messages[:count]
+        self._base_id += count
+        overlap = min(count - self._first, len(self._rows)) if count > self._first else 0
+        for _ in range(max(0, overlap)):
+            self._recycle(self._rows.popleft())
+        self._first = max(0, self._first - count)
+
+    def _yview(self, *args):
+        """Comando del scrollbar: desplaza y carga otra página si se llegó a un borde"""
+        self.chat_canvas.yview(*args)
+        self._check_paging()
+
+    def _on_mousewheel(self, event):
+        self.chat_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        self._check_paging()
+
+    def _check_paging(self):
+        top, bottom = self.chat_canvas.yview()
+        # El usuario se movió: solo se sigue el final si sigue abajo del todo
+        self._stick_to_end = bottom >= 1.0 and self._window_end() == len(self._messages)
+        if top <= 0.0 and self._first > 0:
+            self._page_older()
+        elif bottom >= 1.0 and self._window_end() < len(self._messages):
+            self._page_newer()
+
+    def _page_older(self):
+        anchor = self._rows[0]
+        count = min(PAGE_SIZE, self._first)
+        for index in range(self._first - 1, self._first - count - 1, -1):
+            self._realize(index, at_end=False)
+        self._first -= count
+        while len(self._rows) > MAX_REALIZED_MESSAGES:
+            self._recycle(self._rows.pop())
+        self._keep_in_view(anchor, align_top=True)
+
+    def _page_newer(self):
+        anchor = self._rows[-1]
+        count = min(PAGE_SIZE, len(self._messages) - self._window_end())
+        for index in range(self._window_end(), self._window_end() + count):
+            self._realize(index, at_end=True)
+        while len(self._rows) > MAX_REALIZED_MESSAGES:
+            self._recycle(self._rows.popleft())
+            self._first += 1
+        self._keep_in_view(anchor, align_top=False)
+
+    def _keep_in_view(self, anchor, align_top):
+        """Tras cargar una página, deja `anchor` donde estaba (arriba o abajo de la vista)"""
+        # Una sola medición por página, no por mensaje
         self.messages_frame.update_idletasks()
-        if hasattr(self, 'chat_canvas'):
-            self.chat_canvas.update_idletasks()
-            self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all"))
-            self.chat_canvas.yview_moveto(1.0)
-    
+        height = max(1, self.messages_frame.winfo_reqheight())
+        self.chat_canvas.configure(scrollregion=(0, 0, self.messages_frame.winfo_reqwidth(), height))
+        if align_top:
+            offset = anchor.container.winfo_y()
+        else:
+            bottom = anchor.container.winfo_y() + anchor.container.winfo_height()
+            offset = bottom - self.chat_canvas.winfo_height()
+        self.chat_canvas.yview_moveto(max(0.0, offset / height))
+
+    def _scroll_to_end(self):
+        """Auto-scroll al final; se mantiene mientras el tamaño del contenido cambia"""
+        self._stick_to_end = True
+        self.chat_canvas.yview_moveto(1.0)
+
     def get_text(self):
         return self.entry.get().strip()
 
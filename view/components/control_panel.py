@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import scrolledtext
 from ..theme import COLORS
+from .log_sink import LogSink
 
 class ControlPanel(tk.Frame):
     def __init__(self, parent, train_command):
@@ -45,6 +46,23 @@ class ControlPanel(tk.Frame):
         )
         self.train_btn.pack(fill="x")
 
+        # Reentrenar solo con las conversaciones nuevas (train_model.py --incremental)
+        self.incremental_var = tk.BooleanVar(value=False)
+        self.incremental_check = tk.Checkbutton(
+            button_frame,
+            text="Solo conversaciones nuevas (incremental)",
+            variable=self.incremental_var,
+            bg=COLORS['bg_panel'],
+            fg=COLORS['text_light'],
+            selectcolor=COLORS['log_bg'],
+            activebackground=COLORS['bg_panel'],
+            activeforeground=COLORS['neon_cyan'],
+            font=("Segoe UI", 9),
+            anchor="w",
+            cursor="hand2"
+        )
+        self.incremental_check.pack(fill="x", pady=(8, 0))
+
         # Área de logs con scrollbar
         log_label = tk.Label(
             self,
@@ -76,31 +94,22 @@ class ControlPanel(tk.Frame):
         )
         self.log_box.pack(fill="both", expand=True)
 
+        # Colores neon según el nivel; el widget solo se actualiza desde el sink
+        self.log_sink = LogSink(
+            self.log_box,
+            tags={
+                "bullet": {"foreground": COLORS['neon_pink'], "font": ("Consolas", 9, "bold")},
+                "INFO": {"foreground": COLORS['neon_cyan'], "font": ("Consolas", 9, "bold")},
+                "WARNING": {"foreground": COLORS['warning'], "font": ("Consolas", 9, "bold")},
+                "ERROR": {"foreground": COLORS['error'], "font": ("Consolas", 9, "bold")},
+                "SUCCESS": {"foreground": COLORS['success'], "font": ("Consolas", 9, "bold")},
+                "message": {"foreground": COLORS['text_light'], "font": ("Consolas", 9)}
+            },
+            default_tag="INFO"
+        )
+
     def log(self, msg, level="INFO"):
-        """Agrega un mensaje al log con formato similar a la terminal"""
-        if not hasattr(self, 'log_box') or self.log_box is None:
+        """Agrega un mensaje al log con formato similar a la terminal (desde cualquier hilo)"""
+        if getattr(self, 'log_sink', None) is None:
             return
-        
-        # Colores neon según el nivel
-        color_map = {
-            "INFO": COLORS['neon_cyan'],
-            "WARNING": COLORS['warning'],
-            "ERROR": COLORS['error'],
-            "SUCCESS": COLORS['success']
-        }
-        color = color_map.get(level, COLORS['neon_cyan'])
-        
-        self.log_box.config(state="normal")
-        
-        # Insertar con formato de color neon
-        self.log_box.insert("end", "✨ ", "bullet")
-        self.log_box.insert("end", f"{level} - ", level)
-        self.log_box.insert("end", f"{msg}\n", "message")
-        
-        # Configurar tags de color neon
-        self.log_box.tag_config("bullet", foreground=COLORS['neon_pink'], font=("Consolas", 9, "bold"))
-        self.log_box.tag_config(level, foreground=color, font=("Consolas", 9, "bold"))
-        self.log_box.tag_config("message", foreground=COLORS['text_light'], font=("Consolas", 9))
-        
-        self.log_box.config(state="disabled")
-        self.log_box.see("end")
+        self.log_sink.write(msg, level)
@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+
+class FrameMonitor:
+    """Detecta bloqueos del bucle de eventos de Tk.
+
+    Programa un tick con `after` cada `interval_ms`; si entre dos ticks pasa
+    más de `interval_ms + threshold_ms`, el hilo de la interfaz estuvo ocupado
+    y se llama a `on_stall(duración_ms, nombre)`. `measure` cronometra un
+    bloque concreto del hilo de la interfaz y lo reporta con su nombre.
+    """
+
+    def __init__(self, root, threshold_ms=16, interval_ms=5, on_stall=None):
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.on_stall = on_stall
+
+        self.ticks = 0
+        self.stalls = 0
+        self.max_stall_ms = 0.0
+        self._last_tick = None
+        self._after_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._last_tick = time.perf_counter()
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+        return self
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        # Lo que el tick llegó tarde es el tiempo que el bucle estuvo bloqueado
+        stall_ms = (now - self._last_tick) * 1000 - self.interval_ms
+        self._last_tick = now
+        self.ticks += 1
+        if stall_ms > self.threshold_ms:
+            self._report(stall_ms, 'bucle de eventos')
+        self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    @contextmanager
+    def measure(self, name):
+        """Cronometra un bloque ejecutado en el hilo de la interfaz (solo con el monitor activo)"""
+        if self._after_id is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            elapsed_ms = (now - start) * 1000
+            if elapsed_ms > self.threshold_ms:
+                self._report(elapsed_ms, name)
+                # El tick siguiente no vuelve a contar el mismo bloqueo
+                if self._last_tick is not None:
+                    self._last_tick = max(self._last_tick, now)
+
+    def _report(self, stall_ms, name):
+        self.stalls += 1
+        self.max_stall_ms = max(self.max_stall_ms, stall_ms)
+        if self.on_stall is not None:
+            self.on_stall(stall_ms, name)
+
+    def stats(self):
+        return {
+            'ticks': self.ticks,
+            'stalls': self.stalls,
+            'max_stall_ms': round(self.max_stall_ms, 1)
+        }
@@ -0,0 +1,108 @@
+import queue
+import threading
+
+# Líneas que conserva el panel, registros en espera como máximo y cada cuánto
+# se vuelcan al widget
+MAX_LOG_LINES = 1000
+MAX_PENDING_RECORDS = 500
+LOG_POLL_MS = 100
+
+class LogSink:
+    """Destino de logs para un ScrolledText que se puede usar desde cualquier hilo.
+
+    `write` solo encola el registro; un tick de `after` en el hilo de Tk vacía
+    la cola y lo inserta todo con una sola llamada a `insert`, recorta el
+    widget a `max_lines` líneas y hace un único `see("end")`. Si los
+    productores escriben más rápido de lo que la interfaz vuelca, los
+    registros que no caben en la cola se descartan y se cuentan, y el panel
+    muestra cuántos se perdieron.
+    """
+
+    def __init__(self, widget, tags, default_tag, max_lines=MAX_LOG_LINES,
+                 max_pending=MAX_PENDING_RECORDS, interval_ms=LOG_POLL_MS):
+        self.widget = widget
+        self.default_tag = default_tag
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+
+        self.written = 0
+        self.dropped = 0
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._dropped_lock = threading.Lock()
+        self._dropped_unreported = 0
+        self._tags = set(tags)
+
+        # Los tags se configuran una sola vez
+        for tag, options in tags.items():
+            self.widget.tag_config(tag, **options)
+
+        self._after_id = self.widget.after(self.interval_ms, self._drain)
+
+    def write(self, msg, level="INFO"):
+        """Encola un registro; no toca el widget (seguro desde hilos en segundo plano)"""
+        try:
+            self._pending.put_nowait((msg, level))
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+                self._dropped_unreported += 1
+
+    def _drain(self):
+        self._after_id = None
+        try:
+            self.flush()
+        finally:
+            self._after_id = self.widget.after(self.interval_ms, self._drain)
+
+    def flush(self):
+        """Vuelca los registros pendientes al widget (solo desde el hilo de Tk)"""
+        segments = []
+        while True:
+            try:
+                msg, level = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            segments.extend(self._format(msg, level))
+            self.written += 1
+
+        with self._dropped_lock:
+            dropped, self._dropped_unreported = self._dropped_unreported, 0
+        if dropped:
+            segments.extend(self._format(f"{dropped} mensajes de log descartados (demasiados a la vez)", "WARNING"))
+
+        if not segments:
+            return
+
+        self.widget.config(state="normal")
+        # Una sola inserción para todo el lote: pares (texto, tags)
+        self.widget.insert("end", *segments)
+        self._trim()
+        self.widget.config(state="disabled")
+        self.widget.see("end")
+
+    def _format(self, msg, level):
+        level_tag = level if level in self._tags else self.default_tag
+        return ("✨ ", "bullet", f"{level} - ", level_tag, f"{msg}\n", "message")
+
+    def _trim(self):
+        # 'end-1c' está en la línea vacía que sigue al último salto de línea
+        lines = int(self.widget.index("end-1c").split(".")[0]) - 1
+        excess = lines - self.max_lines
+        if excess > 0:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+
+    def stats(self):
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'queue_depth': self._pending.qsize()
+        }
+
+    def close(self):
+        """Detiene el volcado periódico"""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
@@ -1,15 +1,17 @@
 import logging
 
 class TkinterHandler(logging.Handler):
-    def __init__(self, widget):
+    """Envía los registros del logger al panel; emit se llama también desde otros hilos"""
+
+    def __init__(self, sink):
         super().__init__()
-        self.widget = widget
+        self.sink = sink
 
     def emit(self, record):
-        if self.widget is None:
+        if self.sink is None:
             return
-        self.widget.config(state="normal")
-        log_msg = f"{record.levelname} - {record.getMessage()}"
-        self.widget.insert("end", f"• {log_msg}\n")
-        self.widget.config(state="disabled")
-        self.widget.see("end")
+        try:
+            # Solo encola: el widget lo actualiza el sink en el hilo de Tk
+            self.sink.write(record.getMessage(), record.levelname)
+        except Exception:
+            self.handleError(record)
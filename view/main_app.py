@@ -1,13 +1,18 @@
 # view/main_app.py
+import time
+_module_start = time.perf_counter()
+
 import sys
 import os
+import argparse
 import subprocess
 import threading
 import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import tkinter as tk
 from tkinter import messagebox
-import speech_recognition as sr
 
 # Cambiar al directorio raíz del proyecto
 project_root = Path(__file__).parent.parent
@@ -15,21 +20,37 @@ os.chdir(project_root)
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-# Importa la lógica ya existente
-from src.chat.core import EmotionChatbot
+# Importa la lógica ya existente (EmotionChatbot se importa en el hilo de inicialización)
 from src.utils.logger import setup_logger
+from src.utils.startup_profiler import StartupProfiler
 
 from .theme import COLORS
 from .components.tkinter_handler import TkinterHandler
 from .components.chat_area import ChatArea
 from .components.control_panel import ControlPanel
+from .components.frame_monitor import FrameMonitor
+
+PENDING_TEXT = "Bot: ✍️ pensando..."
+UI_POLL_MS = 15
 
 class ChatUI:
-    def __init__(self, root):
+    def __init__(self, root, profiler=None, monitor_frames=False):
         self.root = root
         self.logger = setup_logger()
+        self.profiler = profiler or StartupProfiler(enabled=False)
         self.chatbot = None
+        self.model_registry = None
         self.is_training = False
+        # Procesamiento de mensajes fuera del hilo de Tk (uno a la vez, en orden)
+        self._message_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ChatUI')
+        # Los hilos en segundo plano no tocan Tk: dejan aquí lo que hay que
+        # ejecutar en la interfaz y un tick de `after` lo corre en el hilo de Tk
+        self._ui_calls = queue.SimpleQueue()
+        self._ui_poll = root.after(UI_POLL_MS, self._drain_ui_calls)
+        # Mide bloqueos de la interfaz; solo programa ticks si se pidió monitorear
+        self.frame_monitor = FrameMonitor(root, threshold_ms=16, on_stall=self._report_stall)
+        if monitor_frames:
+            self.frame_monitor.start()
         
         self.project_root = Path(__file__).parent.parent
 
@@ -52,26 +73,79 @@ class ChatUI:
         self.control_panel.grid(row=0, column=1, sticky="nsew", padx=(5, 10), pady=10)
         
         # Configurar handler para logs en la interfaz
-        tk_handler = TkinterHandler(self.control_panel.log_box)
+        tk_handler = TkinterHandler(self.control_panel.log_sink)
         formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
         tk_handler.setFormatter(formatter)
 
         self.logger.handlers = []
         self.logger.addHandler(tk_handler)
 
+        # Cerrar el historial pendiente antes de destruir la ventana
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Inicializar chatbot después de crear log_box
         self._initialize_chatbot()
 
     def log(self, msg, level="INFO"):
+        # Seguro desde cualquier hilo: el panel encola y vuelca en lotes
         self.control_panel.log(msg, level)
+
+    def call_in_ui(self, func, *args):
+        """Ejecuta `func(*args)` en el hilo de Tk (se puede llamar desde cualquier hilo)"""
+        self._ui_calls.put((func, args))
+
+    def _drain_ui_calls(self):
+        """Corre las llamadas encoladas por otros hilos; Tk solo se toca desde su propio hilo"""
+        while True:
+            try:
+                func, args = self._ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.error(f"Error actualizando la interfaz: {e}")
+        self._ui_poll = self.root.after(UI_POLL_MS, self._drain_ui_calls)
+
+    def on_close(self):
+        """Escribe el historial pendiente y cierra la aplicación"""
+        try:
+            self.frame_monitor.stop()
+            self.root.after_cancel(self._ui_poll)
+            # No se espera a una predicción en curso (congelaría la ventana); lo que
+            # llegue a encolarse en el historial lo escribe su close()
+            self._message_executor.shutdown(wait=False, cancel_futures=True)
+            if self.model_registry is not None:
+                self.model_registry.close()
+            if self.chatbot is not None:
+                self.chatbot.close()
+            self.control_panel.log_sink.close()
+        except Exception as e:
+            self.logger.error(f"Error cerrando chatbot: {e}")
+        finally:
+            self.root.destroy()
     
     def _initialize_chatbot(self):
         """Inicializa el chatbot en un hilo separado para no bloquear la UI"""
         def init():
             try:
                 self.log("Iniciando Chatbot de Emociones...", "INFO")
-                self.chatbot = EmotionChatbot()
-                self.chatbot.logger = self.logger
+                with self.profiler.phase('src.chat.core', 'import'):
+                    from src.chat.core import EmotionChatbot
+                chatbot = EmotionChatbot(profiler=self.profiler)
+                chatbot.logger = self.logger
+                
+                if self.profiler.enabled:
+                    # Tiempo hasta la primera respuesta (sin escribir en el historial)
+                    with self.profiler.phase('predicción + respuesta', 'respuesta'):
+                        emotion, _, _ = chatbot.predictor.predict("Hola, hoy me siento bien")
+                        chatbot.response_gen.get_response(emotion, "Hola, hoy me siento bien")
+                    print(self.profiler.report())
+                
+                # Recarga del modelo tras entrenar sin reconstruir el chatbot
+                from src.chat.model_registry import ModelRegistry
+                self.model_registry = ModelRegistry.from_config(chatbot, poll_interval_s=None)
+                self.chatbot = chatbot
                 self.log("Chatbot de Emociones inicializado (K-means No Supervisado)", "INFO")
             except Exception as e:
                 self.log(f"Error inicializando chatbot: {e}", "ERROR")
@@ -81,6 +155,7 @@ class ChatUI:
 
     # CHAT
     def send_message(self, text=None):
+        """Muestra el mensaje y lo procesa en segundo plano sin bloquear la interfaz"""
         if text is None:
             text = self.chat_area.get_text()
         
@@ -91,28 +166,41 @@ class ChatUI:
             self.log("Chatbot aún no está listo. Por favor espera...", "WARNING")
             return
 
-        self.chat_area.add_message("Tú: " + text, sender="user")
-        self.chat_area.clear_input()
+        with self.frame_monitor.measure('mostrar mensaje'):
+            self.chat_area.add_message("Tú: " + text, sender="user")
+            self.chat_area.clear_input()
+            # Indicador de espera que se reemplaza por la respuesta
+            pending = self.chat_area.add_message(PENDING_TEXT, sender="bot")
 
-        try:
-            output = self.chatbot.process_message(text)
-            response = output.get("response", "Sin respuesta")
-            emotion = output.get("emotion", "neutral")
-            cluster = output.get("cluster", -1)
-            confidence = output.get("confidence", 0.0)
-            top_words = output.get("top_words", [])
-            
-            self.chat_area.add_message(f"Bot: {response}", sender="bot")
-            
-            self.log(f"Emoción detectada: {emotion} (Cluster: {cluster})", "INFO")
-            self.log(f"Confianza: {confidence:.2f}", "INFO")
-            if top_words:
-                words_str = ", ".join(top_words[:3])
-                self.log(f"Palabras clave: {words_str}", "INFO")
+        # Un solo hilo de trabajo: los mensajes se procesan y responden en orden
+        future = self._message_executor.submit(self.chatbot.process_message, text)
+        future.add_done_callback(lambda f: self.call_in_ui(self._show_response, f, pending))
 
-        except Exception as e:
-            self.log(f"Error procesando mensaje: {e}", "ERROR")
-            self.chat_area.add_message("Bot: Lo siento, hubo un error procesando tu mensaje.", sender="bot")
+    def _show_response(self, future, pending):
+        """Reemplaza el indicador de espera por la respuesta (hilo de la interfaz)"""
+        with self.frame_monitor.measure('mostrar respuesta'):
+            try:
+                output = future.result()
+                response = output.get("response", "Sin respuesta")
+                emotion = output.get("emotion", "neutral")
+                cluster = output.get("cluster", -1)
+                confidence = output.get("confidence", 0.0)
+                top_words = output.get("top_words", [])
+                
+                self.chat_area.update_message(pending, f"Bot: {response}")
+                
+                self.log(f"Emoción detectada: {emotion} (Cluster: {cluster})", "INFO")
+                self.log(f"Confianza: {confidence:.2f}", "INFO")
+                if top_words:
+                    words_str = ", ".join(top_words[:3])
+                    self.log(f"Palabras clave: {words_str}", "INFO")
+
+            except Exception as e:
+                self.log(f"Error procesando mensaje: {e}", "ERROR")
+                self.chat_area.update_message(pending, "Bot: Lo siento, hubo un error procesando tu mensaje.")
+
+    def _report_stall(self, stall_ms, name):
+        self.logger.warning(f"Interfaz bloqueada {stall_ms:.0f} ms ({name})")
 
     def record_message(self):
         """Inicia la grabación de audio en un hilo separado"""
@@ -121,38 +209,46 @@ class ChatUI:
 
     def _record_thread(self):
         """Graba audio del micrófono, lo transcribe y lo envía al chat"""
+        # speech_recognition (y PyAudio) solo se cargan al usar el micrófono
+        try:
+            import speech_recognition as sr
+        except ImportError as e:
+            self.log(f"Reconocimiento de voz no disponible: {e}", "ERROR")
+            self.call_in_ui(messagebox.showerror, "Error", "Instala SpeechRecognition y PyAudio para grabar voz.")
+            return
+        
         r = sr.Recognizer()
         with sr.Microphone() as source:
-            self.root.after(0, lambda: self.log("🎤 Di algo...", "INFO"))
-            self.root.after(0, lambda: self.chat_area.record_btn.config(state="disabled", text="🎤 Escuchando..."))
+            self.log("🎤 Di algo...", "INFO")
+            self.call_in_ui(lambda: self.chat_area.record_btn.config(state="disabled", text="🎤 Escuchando..."))
             
             try:
                 r.adjust_for_ambient_noise(source, duration=0.5)
                 audio = r.listen(source, timeout=5, phrase_time_limit=10)
                 
-                self.root.after(0, lambda: self.log("🔄 Procesando audio...", "INFO"))
+                self.log("🔄 Procesando audio...", "INFO")
                 
                 text = r.recognize_google(audio, language='es-ES')
-                self.root.after(0, lambda: self.log(f"Texto reconocido: '{text}'", "SUCCESS"))
+                self.log(f"Texto reconocido: '{text}'", "SUCCESS")
                 
                 # Enviar al hilo principal para actualizar la UI
-                self.root.after(0, lambda: self.send_message(text))
+                self.call_in_ui(self.send_message, text)
                 
             except sr.WaitTimeoutError:
-                self.root.after(0, lambda: self.log("No se detectó audio. Inténtalo de nuevo.", "WARNING"))
-                self.root.after(0, lambda: messagebox.showwarning("Sin audio", "No se detectó audio. Asegúrate de hablar claro."))
+                self.log("No se detectó audio. Inténtalo de nuevo.", "WARNING")
+                self.call_in_ui(messagebox.showwarning, "Sin audio", "No se detectó audio. Asegúrate de hablar claro.")
             except sr.UnknownValueError:
-                self.root.after(0, lambda: self.log("No se pudo entender el audio.", "ERROR"))
-                self.root.after(0, lambda: messagebox.showerror("Error de Reconocimiento", "No se pudo entender lo que dijiste. Intenta de nuevo."))
+                self.log("No se pudo entender el audio.", "ERROR")
+                self.call_in_ui(messagebox.showerror, "Error de Reconocimiento", "No se pudo entender lo que dijiste. Intenta de nuevo.")
             except sr.RequestError as e:
-                self.root.after(0, lambda: self.log(f"Error con el servicio de Google: {e}", "ERROR"))
-                self.root.after(0, lambda: messagebox.showerror("Error de API", f"No se pudo conectar con el servicio de reconocimiento de voz: {e}"))
+                self.log(f"Error con el servicio de Google: {e}", "ERROR")
+                self.call_in_ui(messagebox.showerror, "Error de API", f"No se pudo conectar con el servicio de reconocimiento de voz: {e}")
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error inesperado al grabar: {e}", "ERROR"))
-                self.root.after(0, lambda: messagebox.showerror("Error", f"Ocurrió un error inesperado: {e}"))
+                self.log(f"Error inesperado al grabar: {e}", "ERROR")
+                self.call_in_ui(messagebox.showerror, "Error", f"Ocurrió un error inesperado: {e}")
             finally:
                 # Restaurar botón en el hilo principal
-                self.root.after(0, lambda: self.chat_area.record_btn.config(state="normal", text="🎤 Grabar Voz"))
+                self.call_in_ui(lambda: self.chat_area.record_btn.config(state="normal", text="🎤 Grabar Voz"))
 
 
     # ENTRENAMIENTO
@@ -163,15 +259,21 @@ class ChatUI:
             return
         
         self.is_training = True
+        # La opción se lee aquí, en el hilo de Tk, antes de lanzar el subproceso
+        incremental = self.control_panel.incremental_var.get()
+        command = [sys.executable, "train_model.py"] + (["--incremental"] if incremental else [])
         self.control_panel.train_btn.config(state="disabled", text="⏳ Entrenando...")
         self.log("═══════════════════════════════════════", "INFO")
-        self.log("INICIANDO ENTRENAMIENTO NO SUPERVISADO", "INFO")
+        if incremental:
+            self.log("INICIANDO REENTRENAMIENTO INCREMENTAL", "INFO")
+        else:
+            self.log("INICIANDO ENTRENAMIENTO NO SUPERVISADO", "INFO")
         self.log("═══════════════════════════════════════", "INFO")
         
         def run_training():
             try:
                 process = subprocess.Popen(
-                    [sys.executable, "train_model.py"],
+                    command,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.STDOUT,
                     text=True,
@@ -180,46 +282,35 @@ class ChatUI:
                     cwd=self.project_root
                 )
                 
+                # El sink encola cada línea; no hace falta un `after` por línea
                 for line in process.stdout:
                     line = line.strip()
                     if line:
                         if "INFO" in line or "ERROR" in line or "WARNING" in line:
-                            if " - " in line:
-                                parts = line.split(" - ", 2)
-                                if len(parts) >= 3:
-                                    level = parts[1]
-                                    message = parts[2]
-                                    def log_message(m=message, l=level):
-                                        self.log(m, l)
-                                    self.root.after(0, log_message)
-                                else:
-                                    def log_line(m=line):
-                                        self.log(m, "INFO")
-                                    self.root.after(0, log_line)
+                            parts = line.split(" - ", 2)
+                            if len(parts) >= 3:
+                                self.log(parts[2], parts[1])
                             else:
-                                def log_line2(m=line):
-                                    self.log(m, "INFO")
-                                self.root.after(0, log_line2)
-                        elif "MODELO ENTRENADO" in line or "=" in line:
-                            def log_important(m=line):
-                                self.log(m, "INFO")
-                            self.root.after(0, log_important)
+                                self.log(line, "INFO")
+                        elif "MODELO ENTRENADO" in line or "MODELO REENTRENADO" in line \
+                                or "SIN CONVERSACIONES NUEVAS" in line or "=" in line:
+                            self.log(line, "INFO")
                 
                 process.wait()
                 
                 if process.returncode == 0:
-                    self.root.after(0, lambda: self.log("═══════════════════════════════════════", "INFO"))
-                    self.root.after(0, lambda: self.log("ENTRENAMIENTO COMPLETADO EXITOSAMENTE", "SUCCESS"))
-                    self.root.after(0, lambda: self.log("═══════════════════════════════════════", "INFO"))
-                    self.root.after(0, self._reload_chatbot)
-                    self.root.after(0, lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
+                    self.log("═══════════════════════════════════════", "INFO")
+                    self.log("ENTRENAMIENTO COMPLETADO EXITOSAMENTE", "SUCCESS")
+                    self.log("═══════════════════════════════════════", "INFO")
+                    self.call_in_ui(self._reload_chatbot)
+                    self.call_in_ui(lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
                 else:
-                    self.root.after(0, lambda: self.log(f"Error en entrenamiento (código: {process.returncode})", "ERROR"))
-                    self.root.after(0, lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
+                    self.log(f"Error en entrenamiento (código: {process.returncode})", "ERROR")
+                    self.call_in_ui(lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
                     
             except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error ejecutando entrenamiento: {e}", "ERROR"))
-                self.root.after(0, lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
+                self.log(f"Error ejecutando entrenamiento: {e}", "ERROR")
+                self.call_in_ui(lambda: self.control_panel.train_btn.config(state="normal", text="Entrenar Modelo"))
             finally:
                 self.is_training = False
         
@@ -227,18 +318,37 @@ class ChatUI:
         thread.start()
     
     def _reload_chatbot(self):
-        """Recarga el chatbot después del entrenamiento"""
-        try:
-            self.log("Recargando chatbot con nuevo modelo...", "INFO")
-            self.chatbot = EmotionChatbot()
-            self.chatbot.logger = self.logger
-            self.log("Chatbot recargado exitosamente", "INFO")
-        except Exception as e:
-            self.log(f"Error recargando chatbot: {e}", "ERROR")
+        """Carga el modelo nuevo en segundo plano y lo intercambia al estar validado"""
+        if self.model_registry is None:
+            self.log("Chatbot aún no está listo; el modelo nuevo se usará al iniciar", "WARNING")
+            return
+        
+        def on_reloaded(swapped, error):
+            if error is not None:
+                self.log(f"Error recargando modelo: {error}", "ERROR")
+            elif swapped:
+                self.log("Modelo recargado exitosamente", "INFO")
+            else:
+                self.log("El modelo no cambió, no hay nada que recargar", "INFO")
+        
+        self.log("Recargando modelo en segundo plano...", "INFO")
+        self.model_registry.reload_async(on_reloaded)
 
 def main():
-    root = tk.Tk()
-    ChatUI(root)
+    parser = argparse.ArgumentParser(description="Chatbot de Emociones (interfaz gráfica)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Muestra el tiempo de importación, inicialización y primera respuesta")
+    parser.add_argument('--monitor-frames', action='store_true',
+                        help="Registra los bloqueos de la interfaz de más de 16 ms")
+    args = parser.parse_args()
+    
+    profiler = StartupProfiler(enabled=args.profile_startup, start_time=_module_start)
+    profiler.record('view.main_app', 'import', (time.perf_counter() - _module_start) * 1000)
+    
+    with profiler.phase('ventana Tk'):
+        root = tk.Tk()
+    with profiler.phase('componentes ChatUI'):
+        ChatUI(root, profiler=profiler, monitor_frames=args.monitor_frames)
     root.mainloop()
 
 if __name__ == "__main__":